@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Embedder Benchmark and Retrieval Quality Harness
+
+Builds the documentation index into a temporary directory (the real
+chatbot/vector_db is never touched) and measures:
+
+- Cost per stage, timed separately: load, chunk, encode (after a separate
+  model load) and insert into ChromaDB, with chunks/sec.
+- The full incremental pipeline (DocumentEmbedder.embed_documents,
+  including the BM25 index) and a no-op re-index.
+- Peak RSS after each stage and the on-disk size of the built index (and
+  of chatbot/vector_db, if present).
+- Retrieval quality on a labelled query set (benchmark_queries.json:
+  question -> expected source paths): recall@k and MRR, for hybrid and
+  vector-only search.
+
+Results are written as JSON. With --baseline, the run is compared against
+an earlier result file and exits 1 on a quality or throughput regression.
+
+Usage:
+    python chatbot/rag/benchmark_embedder.py --output bench.json
+    python chatbot/rag/benchmark_embedder.py --baseline bench.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from embedder import DocumentEmbedder
+from retriever import Retriever
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_QUERIES = Path(__file__).parent / 'benchmark_queries.json'
+K_VALUES = (1, 3, 5)
+
+# Regressions that fail a --baseline comparison
+MAX_QUALITY_DROP = 0.02  # Absolute, recall@k / MRR
+MAX_THROUGHPUT_DROP = 0.25  # Relative, chunks/sec
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if platform.system() == 'Darwin' else 1024), 1)
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+
+class EmbedderBenchmark:
+    """Time the embedding pipeline stage by stage and score retrieval on labelled queries"""
+
+    def __init__(self, docs_dir: Path, queries_file: Path, device: str = None,
+                 precision: str = 'float32', backend: str = 'torch'):
+        self.docs_dir = Path(docs_dir)
+        self.queries = json.loads(Path(queries_file).read_text(encoding='utf-8'))
+        self.encoder_options = {'device': device, 'precision': precision, 'backend': backend}
+        self.results = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'settings': dict(self.encoder_options, docs_dir=str(self.docs_dir),
+                             queries=len(self.queries)),
+            'stages': {},
+        }
+
+    def stage(self, name: str, seconds: float, **metrics):
+        self.results['stages'][name] = dict(seconds=round(seconds, 4), peak_rss_mb=peak_rss_mb(),
+                                            **metrics)
+        extra = ', '.join(f"{k} {v}" for k, v in metrics.items())
+        print(f"  {name:<12} {seconds:8.3f}s  {extra}")
+
+    def run_stages(self, vector_db: Path):
+        """Load, chunk, encode and insert one after another, each timed on its own"""
+        embedder = DocumentEmbedder(str(self.docs_dir), str(vector_db), **self.encoder_options)
+
+        start = time.perf_counter()
+        docs = [doc for doc in embedder.load_documents(skip_unchanged=False) if doc['content']]
+        self.stage('load', time.perf_counter() - start, files=len(docs),
+                   bytes=sum(doc['size'] for doc in docs))
+
+        start = time.perf_counter()
+        chunks = [(doc, i, chunk) for doc in docs
+                  for i, chunk in enumerate(embedder.chunk_document(doc['content']))]
+        seconds = time.perf_counter() - start
+        self.stage('chunk', seconds, chunks=len(chunks),
+                   chunks_per_sec=round(len(chunks) / seconds, 1) if seconds else None)
+
+        start = time.perf_counter()
+        embedder.encoder.model
+        self.stage('model_load', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        embeddings = embedder.encoder.encode([c.embedding_text() for _, _, c in chunks],
+                                             lengths=[c.tokens for _, _, c in chunks])
+        seconds = time.perf_counter() - start
+        self.stage('encode', seconds, chunks_per_sec=round(len(chunks) / seconds, 1))
+
+        start = time.perf_counter()
+        collection = embedder.collection
+        for i in range(0, len(chunks), 1000):
+            batch = chunks[i:i + 1000]
+            collection.upsert(
+                ids=[f"{doc['path']}#{index}" for doc, index, _ in batch],
+                documents=[chunk.text for _, _, chunk in batch],
+                metadatas=[{'path': doc['path'], 'chunk_index': index} for doc, index, _ in batch],
+                embeddings=embeddings[i:i + 1000]
+            )
+        seconds = time.perf_counter() - start
+        self.stage('insert', seconds, chunks_per_sec=round(len(chunks) / seconds, 1))
+        return embedder.encoder
+
+    def run_pipeline(self, vector_db: Path, encoder) -> DocumentEmbedder:
+        """Full incremental pipeline into an empty index, then a no-op re-index"""
+        embedder = DocumentEmbedder(str(self.docs_dir), str(vector_db), **self.encoder_options)
+        embedder.encoder = encoder  # Already loaded
+        encoder.chunks_encoded, encoder.seconds = 0, 0.0
+
+        start = time.perf_counter()
+        stats = embedder.embed_documents(embedder.load_documents())
+        seconds = time.perf_counter() - start
+        self.stage('pipeline', seconds, chunks=stats['embedded'],
+                   chunks_per_sec=round(stats['embedded'] / seconds, 1))
+
+        embedder = DocumentEmbedder(str(self.docs_dir), str(vector_db), **self.encoder_options)
+        start = time.perf_counter()
+        embedder.embed_documents(embedder.load_documents())
+        self.stage('reindex_noop', time.perf_counter() - start)
+
+        self.results['disk_bytes'] = {'index': dir_size(vector_db)}
+        real_db = PROJECT_ROOT / 'chatbot' / 'vector_db'
+        if real_db.exists():
+            self.results['disk_bytes']['chatbot/vector_db'] = dir_size(real_db)
+        return embedder
+
+    def evaluate(self, retriever: Retriever) -> Dict:
+        """recall@k and MRR: a query is answered by any chunk from one of its expected paths"""
+        max_k = max(K_VALUES)
+        hits = {k: 0 for k in K_VALUES}
+        reciprocal_ranks = []
+        per_query = []
+        for item in self.queries:
+            results = retriever.search(item['query'], top_k=max_k)
+            paths = [r['metadata']['path'] for r in results]
+            rank = next((i + 1 for i, path in enumerate(paths) if path in item['paths']), None)
+            for k in K_VALUES:
+                hits[k] += rank is not None and rank <= k
+            reciprocal_ranks.append(1 / rank if rank else 0.0)
+            per_query.append({'query': item['query'], 'rank': rank, 'top_paths': paths[:3]})
+
+        n = len(self.queries)
+        metrics = {f'recall@{k}': round(hits[k] / n, 4) for k in K_VALUES}
+        metrics['mrr'] = round(sum(reciprocal_ranks) / n, 4)
+        metrics['queries'] = per_query
+        return metrics
+
+    def run_retrieval(self, vector_db: Path, encoder):
+        retriever = Retriever(str(vector_db), cache_size=0, **self.encoder_options)
+        retriever.encoder = encoder
+
+        self.results['retrieval'] = {}
+        for mode, hybrid in (('hybrid', True), ('dense', False)):
+            retriever.hybrid = hybrid
+            start = time.perf_counter()
+            metrics = self.evaluate(retriever)
+            metrics['ms_per_query'] = round((time.perf_counter() - start) * 1000 / len(self.queries), 2)
+            self.results['retrieval'][mode] = metrics
+            print(f"  {mode:<12} " + ', '.join(f"{k} {v}" for k, v in metrics.items()
+                                                if k != 'queries'))
+
+    def run(self) -> Dict:
+        print("\n" + "="*70)
+        print(f"EMBEDDER BENCHMARK ({self.docs_dir})")
+        print("="*70)
+
+        tmp = Path(tempfile.mkdtemp(prefix='scholarag_bench_'))
+        try:
+            print("\nStages:")
+            encoder = self.run_stages(tmp / 'stages')
+            print("\nPipeline:")
+            self.run_pipeline(tmp / 'pipeline', encoder)
+            print("\nRetrieval quality:")
+            self.run_retrieval(tmp / 'pipeline', encoder)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.results['peak_rss_mb'] = peak_rss_mb()
+        print(f"\nPeak RSS: {self.results['peak_rss_mb']} MB, "
+              f"index size: {self.results['disk_bytes']['index'] / 1e6:.1f} MB")
+        return self.results
+
+
+def compare(results: Dict, baseline: Dict) -> List[str]:
+    """Regressions of results against a baseline run"""
+    regressions = []
+    for mode, metrics in baseline.get('retrieval', {}).items():
+        for name, value in metrics.items():
+            if name.startswith('recall@') or name == 'mrr':
+                current = results['retrieval'].get(mode, {}).get(name, 0.0)
+                if current < value - MAX_QUALITY_DROP:
+                    regressions.append(f"{mode} {name}: {value} -> {current}")
+
+    for name in ('chunk', 'encode', 'insert', 'pipeline'):
+        before = baseline.get('stages', {}).get(name, {}).get('chunks_per_sec')
+        after = results['stages'].get(name, {}).get('chunks_per_sec')
+        if before and after and after < before * (1 - MAX_THROUGHPUT_DROP):
+            regressions.append(f"{name} chunks/sec: {before} -> {after}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedder benchmark and retrieval quality harness")
+    parser.add_argument('--docs', default=str(PROJECT_ROOT / 'docs'))
+    parser.add_argument('--queries', default=str(DEFAULT_QUERIES),
+                        help='Labelled queries: [{"query": str, "paths": [str]}]')
+    parser.add_argument('--device', default=None)
+    parser.add_argument('--precision', default='float32', choices=['float32', 'float16', 'int8'])
+    parser.add_argument('--backend', default='torch', choices=['torch', 'onnx'])
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Earlier --output file; exit 1 on regressions')
+    args = parser.parse_args()
+
+    benchmark = EmbedderBenchmark(args.docs, args.queries, args.device, args.precision, args.backend)
+    results = benchmark.run()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results: {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text(encoding='utf-8')))
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
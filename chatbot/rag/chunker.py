@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Token-aware, heading-aware markdown chunker
+
+all-MiniLM-L6-v2 truncates its input at 256 tokens, so chunks are budgeted
+in tokens of the model's own tokenizer rather than characters. Each
+document is tokenized once (offsets map tokens back to characters), split
+into blocks at markdown headings and blank lines (fenced code stays
+intact), and blocks are packed greedily into chunks:
+
+- Chunks never straddle a heading, so they follow the document structure;
+  chunks under `min_tokens` (short sections) are merged into the next one.
+- Blocks larger than the budget are split at sentence / line boundaries
+  and, failing that, at token boundaries.
+- Overlap re-uses whole trailing blocks (up to `overlap_tokens`), and every
+  chunk starts at least one block after the previous one, so the loop
+  always makes progress. Total work is linear in the document length.
+
+Chunks are exact slices of the document (with character offsets) and carry
+their heading path, which is prepended to the text that gets embedded.
+
+Usage:
+    python chatbot/rag/chunker.py --benchmark [--docs docs] [--repeat 20]
+"""
+
+import argparse
+import bisect
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2 truncation limit, including [CLS] and [SEP]
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+SENTENCE_END = re.compile(r'(?<=[.!?:;])\s+|\n')
+# Conservative WordPiece stand-in: words are split into <=6-char pieces
+APPROX_TOKEN_PATTERN = re.compile(r'[^\W\d_]{1,6}|\d{1,3}|[^\w\s]')
+
+
+@dataclass
+class Chunk:
+    """One chunk of a document"""
+    text: str
+    start: int  # Character offsets into the original document
+    end: int
+    tokens: int
+    section: str  # Heading path, e.g. "Quick Start > Installation"
+
+    def embedding_text(self) -> str:
+        """Text sent to the encoder: heading path + chunk"""
+        return f"{self.section}\n{self.text}" if self.section else self.text
+
+
+def load_token_spans(model_name: str = EMBEDDING_MODEL) -> Callable[[str], List[Tuple[int, int]]]:
+    """
+    Return a function mapping text to (start, end) character spans of its tokens
+
+    Uses the model's fast tokenizer when transformers and the tokenizer files
+    are available, otherwise a regex approximation that slightly
+    over-counts (so chunks stay within the model limit).
+    """
+    try:
+        from transformers import AutoTokenizer
+        from transformers.utils import logging as hf_logging
+
+        hf_logging.set_verbosity_error()  # Whole documents exceed 512 tokens on purpose
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        def token_spans(text: str) -> List[Tuple[int, int]]:
+            encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                                 truncation=False)
+            return encoding['offset_mapping']
+
+        return token_spans
+    except Exception as e:
+        print(f"  ⚠️  Tokenizer for {model_name} unavailable ({type(e).__name__}); "
+              f"using approximate token counts")
+
+        def approx_token_spans(text: str) -> List[Tuple[int, int]]:
+            return [m.span() for m in APPROX_TOKEN_PATTERN.finditer(text)]
+
+        return approx_token_spans
+
+
+class MarkdownChunker:
+    """Token-budgeted markdown chunker with guaranteed forward progress"""
+
+    def __init__(self, max_tokens: int = MAX_SEQ_LENGTH, overlap_tokens: int = 32,
+                 min_tokens: int = 64, token_spans: Callable = None):
+        """
+        Args:
+            max_tokens: Model input limit including special tokens and heading path
+            overlap_tokens: Trailing tokens (whole blocks) repeated in the next chunk
+            min_tokens: Chunks smaller than this are merged into the next chunk if it fits
+            token_spans: Tokenizer returning character spans (default: model tokenizer)
+        """
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = min_tokens
+        self._token_spans = token_spans
+
+    @property
+    def token_spans(self) -> Callable:
+        """Tokenizer, loaded on first use"""
+        if self._token_spans is None:
+            self._token_spans = load_token_spans()
+        return self._token_spans
+
+    def chunk(self, content: str) -> List[Chunk]:
+        """
+        Chunk a markdown document
+
+        Args:
+            content: Document content
+
+        Returns:
+            Chunks in document order
+        """
+        token_starts = [start for start, _ in self.token_spans(content)]
+
+        def count(start: int, end: int) -> int:
+            return bisect.bisect_left(token_starts, end) - bisect.bisect_left(token_starts, start)
+
+        chunks = []
+        for section, blocks in self.sections(content):
+            section, heading_tokens = self.fit_section(section)
+            budget = self.max_tokens - 2 - heading_tokens  # [CLS] + [SEP]
+
+            units = []
+            for start, end in blocks:
+                units.extend(self.split_block(content, start, end, budget, token_starts, count))
+            chunks.extend(self.pack(content, units, budget, section))
+
+        return self.merge_small(chunks, content, count)
+
+    def fit_section(self, section: str) -> Tuple[str, int]:
+        """
+        Shorten a heading path to at most a quarter of the token budget
+
+        Drops outer headings first, then truncates the innermost one.
+
+        Returns:
+            (heading path, tokens it adds to the embedding text)
+        """
+        limit = self.max_tokens // 4
+        headings = section.split(' > ') if section else []
+        while headings:
+            path = ' > '.join(headings)
+            spans = self.token_spans(path)
+            if len(spans) + 1 <= limit:
+                return path, len(spans) + 1
+            if len(headings) == 1:
+                return path[:spans[limit - 2][1]], limit
+            headings = headings[1:]
+        return '', 0
+
+    def sections(self, content: str):
+        """
+        Yield (heading path, blocks) per section; blocks are (start, end) spans
+
+        Blocks end at blank lines and headings; fenced code blocks are never split here.
+        """
+        headings = []
+        blocks = []
+        block_start = None
+        in_fence = False
+        section = ''
+        offset = 0
+
+        for line in content.splitlines(keepends=True):
+            line_start, offset = offset, offset + len(line)
+            stripped = line.strip()
+
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            elif not in_fence:
+                heading = HEADING_PATTERN.match(stripped)
+                if heading:
+                    if block_start is not None:
+                        blocks.append((block_start, line_start))
+                        block_start = None
+                    if blocks:
+                        yield section, blocks
+                        blocks = []
+
+                    level = len(heading.group(1))
+                    headings = headings[:level - 1] + [heading.group(2)]
+                    section = ' > '.join(headings)
+                    blocks.append((line_start, offset))
+                    continue
+
+                if not stripped:
+                    if block_start is not None:
+                        blocks.append((block_start, line_start))
+                        block_start = None
+                    continue
+
+            if block_start is None:
+                block_start = line_start
+
+        if block_start is not None:
+            blocks.append((block_start, len(content)))
+        if blocks:
+            yield section, blocks
+
+    def split_block(self, content: str, start: int, end: int, budget: int,
+                    token_starts: List[int], count: Callable) -> List[Tuple[int, int, int]]:
+        """Split a block into (start, end, tokens) units of at most `budget` tokens"""
+        end = start + len(content[start:end].rstrip())
+        tokens = count(start, end)
+        if tokens <= budget:
+            return [(start, end, tokens)] if end > start else []
+
+        # Sentence / line boundaries first
+        pieces = []
+        piece_start = start
+        for match in SENTENCE_END.finditer(content, start, end):
+            pieces.append((piece_start, match.start()))
+            piece_start = match.end()
+        pieces.append((piece_start, end))
+
+        units = []
+        for piece_start, piece_end in pieces:
+            tokens = count(piece_start, piece_end)
+            if tokens == 0:
+                continue
+            if tokens <= budget:
+                units.append((piece_start, piece_end, tokens))
+                continue
+
+            # Hard split at token boundaries
+            first = bisect.bisect_left(token_starts, piece_start)
+            last = bisect.bisect_left(token_starts, piece_end)
+            for i in range(first, last, budget):
+                window_end = token_starts[i + budget] if i + budget < last else piece_end
+                units.append((token_starts[i], window_end, min(budget, last - i)))
+
+        # Re-merge adjacent small pieces so sentences aren't embedded one by one
+        merged = [units[0]]
+        for unit in units[1:]:
+            if merged[-1][2] + unit[2] <= budget // 2:
+                merged[-1] = (merged[-1][0], unit[1], merged[-1][2] + unit[2])
+            else:
+                merged.append(unit)
+        return merged
+
+    def pack(self, content: str, units: List[Tuple[int, int, int]], budget: int,
+             section: str) -> List[Chunk]:
+        """Greedily pack units into chunks with whole-unit overlap"""
+        chunks = []
+        i = 0
+        while i < len(units):
+            j, tokens = i, 0
+            while j < len(units) and tokens + units[j][2] <= budget:
+                tokens += units[j][2]
+                j += 1
+            # Every unit fits the budget, so j > i: forward progress is guaranteed
+
+            start, end = units[i][0], units[j - 1][1]
+            chunks.append(Chunk(content[start:end], start, end, tokens, section))
+            if j == len(units):
+                break
+
+            # Overlap: back off over whole trailing units, but never to i
+            k, overlap = j, 0
+            while k - 1 > i and overlap + units[k - 1][2] <= self.overlap_tokens:
+                k -= 1
+                overlap += units[k][2]
+            i = k
+
+        return chunks
+
+    def merge_small(self, chunks: List[Chunk], content: str, count: Callable) -> List[Chunk]:
+        """Merge chunks below min_tokens (short sections) into the following chunk if it fits"""
+        merged = []
+        for chunk in chunks:
+            previous = merged[-1] if merged else None
+            if (previous is not None and previous.tokens < self.min_tokens
+                    and previous.end <= chunk.start):
+                tokens = count(previous.start, chunk.end)
+                section = previous.section if previous.tokens >= chunk.tokens else chunk.section
+                section_tokens = len(self.token_spans(section)) + 1 if section else 0
+                if tokens + section_tokens + 2 <= self.max_tokens:
+                    merged[-1] = Chunk(content[previous.start:chunk.end], previous.start,
+                                       chunk.end, tokens, section)
+                    continue
+            merged.append(chunk)
+        return merged
+
+
+def legacy_chunk(content: str, chunk_size: int = 1000, overlap: int = 200,
+                 max_iterations: int = 100000) -> Optional[List[str]]:
+    """Previous character-based chunker (kept for benchmarking); None if it stalls"""
+    chunks = []
+    start = 0
+    iterations = 0
+
+    while start < len(content):
+        iterations += 1
+        if iterations > max_iterations:
+            return None
+
+        end = start + chunk_size
+        if end < len(content):
+            newline_pos = content.rfind('\n\n', start, end)
+            if newline_pos != -1:
+                end = newline_pos
+
+        chunk = content[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        next_start = end - overlap if end < len(content) else end
+        if next_start <= start:
+            return None  # No forward progress: the original loop never terminates here
+        start = next_start
+
+    return chunks
+
+
+def benchmark(docs_dir: Path, repeat: int):
+    """Compare chunk counts, token fit and throughput of legacy vs token-aware chunking"""
+    documents = [p.read_text(encoding='utf-8') for p in sorted(docs_dir.rglob('*'))
+                 if p.suffix in ('.md', '.mdx') and p.is_file()]
+    total_chars = sum(len(d) for d in documents) * repeat
+    chunker = MarkdownChunker()
+    token_spans = chunker.token_spans
+
+    start = time.perf_counter()
+    legacy = [legacy_chunk(d) for d in documents for _ in range(repeat)]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunked = [chunker.chunk(d) for d in documents for _ in range(repeat)]
+    new_time = time.perf_counter() - start
+
+    stalled = sum(result is None for result in legacy) // repeat
+    legacy_chunks = [c for result in legacy[::repeat] if result for c in result]
+    new_chunks = [c for result in chunked[::repeat] for c in result]
+    legacy_tokens = [len(token_spans(c)) + 2 for c in legacy_chunks]
+    new_tokens = [len(token_spans(c.embedding_text())) + 2 for c in new_chunks]
+
+    def over_limit(tokens):
+        return sum(t > MAX_SEQ_LENGTH for t in tokens)
+
+    print(f"Documents: {len(documents)} ({total_chars / repeat / 1024:.0f} KB), repeated {repeat}x")
+    print(f"Legacy (1000 chars, 200 overlap): {len(legacy_chunks)} chunks from "
+          f"{len(documents) - stalled} documents, {stalled} documents stall (no forward progress)")
+    if legacy_tokens:
+        print(f"   mean {sum(legacy_tokens) / len(legacy_tokens):.0f} tokens, "
+              f"{over_limit(legacy_tokens)} chunks truncated at {MAX_SEQ_LENGTH} tokens, "
+              f"{total_chars / legacy_time / 1e6:.1f} MB/s (stalled documents abort early)")
+    print(f"Token-aware ({MAX_SEQ_LENGTH} tokens, 32 overlap): {len(new_chunks)} chunks from "
+          f"{len(documents)} documents")
+    print(f"   mean {sum(new_tokens) / len(new_tokens):.0f} tokens, "
+          f"{over_limit(new_tokens)} chunks truncated at {MAX_SEQ_LENGTH} tokens, "
+          f"{total_chars / new_time / 1e6:.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the markdown chunker")
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare against the legacy character chunker')
+    parser.add_argument('--docs', default=str(Path(__file__).parent.parent.parent / 'docs'),
+                        help='Markdown directory (default: docs/)')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Times to chunk each document for timing (default: 20)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(Path(args.docs), args.repeat)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
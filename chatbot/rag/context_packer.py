@@ -0,0 +1,143 @@
+"""
+Context packing for RAG prompts
+
+Retrieved chunks overlap (the chunker repeats trailing blocks in the next
+chunk) and often come from neighbouring parts of the same file. Sending
+them as is repeats text in every chat turn. pack_context():
+
+1. Groups results by `path` and orders them by `start_char`.
+2. Merges chunks that overlap or are adjacent (consecutive `chunk_index`)
+   into one passage. Overlap is cut exactly using the character offsets,
+   since chunks are exact slices of the document.
+3. Drops passages whose text duplicates a more relevant one (e.g. the same
+   section copied into two files).
+4. Fills the token budget greedily by relevance (search rank): chunks are taken best
+   first, and each costs only the tokens it adds once merged (nothing if
+   its text is already in), so overlap never eats into the budget. A chunk
+   that doesn't fit is skipped in favour of smaller, less relevant ones.
+
+Passages keep the search-result shape ({content, metadata, similarity}) so
+callers don't change.
+"""
+
+import hashlib
+from typing import Callable, Dict, List, Optional
+
+from chunker import APPROX_TOKEN_PATTERN
+
+
+def approx_tokens(text: str) -> int:
+    """Conservative token estimate (same stand-in the chunker uses without a tokenizer)"""
+    return len(APPROX_TOKEN_PATTERN.findall(text))
+
+
+def merge_passages(results: List[Dict]) -> List[Dict]:
+    """
+    Merge overlapping or adjacent chunks of the same file
+
+    Args:
+        results: Search results, best first, with path, chunk_index, start_char and
+            end_char metadata
+
+    Returns:
+        Passages: content with overlap removed, chunk_indices, sections, best rank
+        and similarity
+    """
+    by_path = {}
+    for rank, result in enumerate(results):
+        chunks = by_path.setdefault(result['metadata']['path'], {})
+        chunks.setdefault(result['metadata']['chunk_index'], (rank, result))  # Same chunk twice
+
+    passages = []
+    for path, chunks in by_path.items():
+        current = None
+        for rank, result in sorted(chunks.values(),
+                                   key=lambda item: (item[1]['metadata'].get('start_char', 0),
+                                                     item[1]['metadata']['chunk_index'])):
+            metadata = result['metadata']
+            start, end = metadata.get('start_char'), metadata.get('end_char')
+            if current is not None and start is not None and start <= current['end_char']:
+                # Overlap: keep only what extends past the current passage
+                tail = result['content'][current['end_char'] - start:]
+            elif current is not None and metadata['chunk_index'] == current['chunk_indices'][-1] + 1:
+                tail = '\n\n' + result['content']  # Neighbours separated by blank lines / a heading
+            else:
+                current = None
+
+            if current is None:
+                current = {
+                    'path': path,
+                    'filename': metadata['filename'],
+                    'content': result['content'],
+                    'start_char': start,
+                    'end_char': end,
+                    'chunk_indices': [metadata['chunk_index']],
+                    'sections': [metadata.get('section', '')],
+                    'rank': rank,
+                    'similarity': result['similarity']
+                }
+                passages.append(current)
+                continue
+
+            current['content'] += tail
+            if end is not None:
+                current['end_char'] = max(current['end_char'] or 0, end)
+            current['chunk_indices'].append(metadata['chunk_index'])
+            if metadata.get('section', '') not in current['sections']:
+                current['sections'].append(metadata.get('section', ''))
+            current['rank'] = min(current['rank'], rank)
+            current['similarity'] = max(current['similarity'], result['similarity'])
+
+    return passages
+
+
+def assemble(results: List[Dict], count_tokens: Callable[[str], int]) -> List[Dict]:
+    """Merged, deduplicated passages in relevance order, each with its token count"""
+    passages = sorted(merge_passages(results), key=lambda p: p['rank'])
+    unique = []
+    seen = set()
+    for passage in passages:
+        digest = hashlib.sha1(' '.join(passage['content'].split()).encode('utf-8')).hexdigest()
+        if digest not in seen:
+            seen.add(digest)
+            passage['tokens'] = count_tokens(passage['content'])
+            unique.append(passage)
+    return unique
+
+
+def pack_context(results: List[Dict], max_tokens: int = 1500,
+                 count_tokens: Optional[Callable[[str], int]] = None) -> List[Dict]:
+    """
+    Merge, deduplicate and budget retrieved chunks
+
+    Args:
+        results: Search results ({content, metadata, similarity}), best first
+        max_tokens: Token budget for all passages together
+        count_tokens: Token counter (default: approx_tokens)
+
+    Returns:
+        Passages in relevance order, within the budget
+    """
+    count_tokens = count_tokens or approx_tokens
+
+    selected, passages = [], []
+    for result in results:
+        candidate = assemble(selected + [result], count_tokens)
+        if sum(p['tokens'] for p in candidate) <= max_tokens:
+            selected.append(result)
+            passages = candidate
+
+    return [{
+        'content': passage['content'],
+        'metadata': {
+            'path': passage['path'],
+            'filename': passage['filename'],
+            'chunk_index': passage['chunk_indices'][0],
+            'chunk_indices': passage['chunk_indices'],
+            'section': ' | '.join(s for s in passage['sections'] if s),
+            'start_char': passage['start_char'],
+            'end_char': passage['end_char'],
+            'tokens': passage['tokens']
+        },
+        'similarity': passage['similarity']
+    } for passage in passages]
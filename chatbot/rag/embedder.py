@@ -1,181 +1,408 @@
 """
 Document Embedding Pipeline for ScholarRAG Helper Chatbot
 
-Embeds all documentation files into ChromaDB for RAG retrieval.
+Embeds all documentation files into ChromaDB for RAG retrieval. Documents
+are split by chunker.MarkdownChunker into heading-aware chunks that fit the
+embedding model's 256-token window.
+
+Re-indexing is incremental: index_manifest.json records a content hash and
+the chunk IDs of every file, so a re-run only re-chunks changed files,
+encodes chunks it has not seen before, upserts them and deletes orphaned
+chunks. The embedding model and ChromaDB are loaded lazily, so a no-op
+re-index never pays for them.
+
+Loading is a streaming pipeline: files are found in one walk, read on a
+thread pool through a bounded window, and files whose mtime and size match
+the manifest are not read at all. Chunks flow into the encoder batch by
+batch, so peak memory depends on the batch size, not the corpus size.
+
+Encoding goes through encoder.ChunkEncoder, which sorts each buffer by
+token length and sizes batches by a token budget to minimise padding.
+--device, --precision (float32 / float16 / int8) and --backend (torch /
+onnx) select where and how the model runs; onnx needs
+sentence-transformers[onnx]>=3.2.
+
+A BM25 index (sparse_index.SparseIndex, bm25_index.json) is maintained
+in the same pass under the same chunk IDs, for hybrid retrieval.
 """
 
-import os
-import glob
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from chunker import Chunk, MarkdownChunker, MAX_SEQ_LENGTH
+from encoder import ChunkEncoder
+from index_manifest import MANIFEST_NAME, IndexManifest, chunk_ids, content_hash
+from sparse_index import SPARSE_INDEX_NAME, SparseIndex
+
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+COLLECTION_NAME = 'scholarag_docs'
+MARKDOWN_SUFFIXES = {'.md', '.mdx'}
 
 
 class DocumentEmbedder:
     """Embed markdown documents into ChromaDB"""
 
-    def __init__(self, docs_dir: str, vector_db_path: str):
+    def __init__(self, docs_dir: str, vector_db_path: str,
+                 max_tokens: int = MAX_SEQ_LENGTH, overlap_tokens: int = 32,
+                 device: str = None, precision: str = 'float32', backend: str = 'torch',
+                 batch_tokens: int = 16384):
         """
         Initialize embedder
 
         Args:
             docs_dir: Path to docs directory
             vector_db_path: Path to ChromaDB storage
+            max_tokens: Token budget per chunk, including heading path and special tokens
+            overlap_tokens: Trailing tokens (whole blocks) repeated in the next chunk
+            device: Encoding device, cpu / cuda / mps (default: auto-detect)
+            precision: float32, float16 (GPU) or int8 (CPU)
+            backend: torch or onnx
+            batch_tokens: Padded tokens per encode batch
         """
         self.docs_dir = Path(docs_dir)
         self.vector_db_path = Path(vector_db_path)
+        self.chunker = MarkdownChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+        self.encoder = ChunkEncoder(EMBEDDING_MODEL, device=device, precision=precision,
+                                    backend=backend, batch_tokens=batch_tokens)
 
-        # Initialize embedding model
-        print("Loading embedding model...")
-        self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-
-        # Initialize ChromaDB
-        print("Initializing ChromaDB...")
         self.vector_db_path.mkdir(parents=True, exist_ok=True)
-        self.client = chromadb.PersistentClient(
-            path=str(self.vector_db_path),
-            settings=Settings(anonymized_telemetry=False)
+        self.manifest = IndexManifest(
+            self.vector_db_path / MANIFEST_NAME,
+            settings={'model': EMBEDDING_MODEL, 'chunker': 'markdown-tokens-v1',
+                      'max_tokens': max_tokens, 'overlap_tokens': overlap_tokens,
+                      'quantized': precision == 'int8'}
         )
 
-        # Create or get collection
-        self.collection = self.client.get_or_create_collection(
-            name="scholarag_docs",
-            metadata={"description": "ScholarRAG documentation for chatbot RAG"}
-        )
-
-    def load_documents(self) -> List[Dict[str, str]]:
-        """Load all markdown documents"""
-        documents = []
-
-        # Find all markdown files
-        md_files = list(self.docs_dir.rglob("*.md")) + list(self.docs_dir.rglob("*.mdx"))
+        self._client = None
+        self._collection = None
+        self._sparse_index = None
+
+    @property
+    def embedding_model(self):
+        """SentenceTransformer, loaded on first use"""
+        return self.encoder.model
+
+    @property
+    def collection(self):
+        """ChromaDB collection, opened on first use"""
+        if self._collection is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            print("Initializing ChromaDB...")
+            self._client = chromadb.PersistentClient(
+                path=str(self.vector_db_path),
+                settings=Settings(anonymized_telemetry=False)
+            )
 
-        print(f"Found {len(md_files)} markdown files")
+            # Create or get collection
+            self._collection = self._client.get_or_create_collection(
+                name=COLLECTION_NAME,
+                metadata={"description": "ScholarRAG documentation for chatbot RAG"}
+            )
+        return self._collection
+
+    @property
+    def sparse_index(self) -> SparseIndex:
+        """BM25 index kept alongside the collection, loaded on first use"""
+        if self._sparse_index is None:
+            self._sparse_index = SparseIndex(self.vector_db_path / SPARSE_INDEX_NAME)
+        return self._sparse_index
+
+    def iter_markdown_files(self) -> Iterator[Path]:
+        """Find markdown files in a single walk of docs_dir"""
+        for path in self.docs_dir.rglob('*'):
+            if path.suffix in MARKDOWN_SUFFIXES and path.is_file():
+                yield path
+
+    def load_documents(self, workers: int = 8, skip_unchanged: bool = True) -> Iterator[Dict]:
+        """
+        Stream markdown documents, read on a thread pool
 
-        for file_path in md_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+        At most 2 x workers files are held in memory at a time. Files whose
+        mtime and size match the manifest are yielded with `content` None and
+        never read; so are files that fail to read, so their indexed chunks
+        are kept.
 
-                # Skip empty files
-                if not content.strip():
-                    continue
+        Args:
+            workers: Reader threads
+            skip_unchanged: Skip reading files unchanged since the last index
 
-                # Get relative path for metadata
-                rel_path = file_path.relative_to(self.docs_dir)
+        Yields:
+            Document dicts (path, filename, type, content, sha256, mtime_ns, size)
+        """
+        stats = Counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            window = deque()
+            for path in self.iter_markdown_files():
+                window.append(pool.submit(self.read_document, path, skip_unchanged))
+                if len(window) >= workers * 2:
+                    doc = window.popleft().result()
+                    if doc is not None:
+                        stats['skipped' if doc['content'] is None else 'read'] += 1
+                        yield doc
+
+            while window:
+                doc = window.popleft().result()
+                if doc is not None:
+                    stats['skipped' if doc['content'] is None else 'read'] += 1
+                    yield doc
+
+        print(f"Loaded {stats['read'] + stats['skipped']} markdown files "
+              f"({stats['read']} read, {stats['skipped']} unchanged by mtime/size)")
+
+    def read_document(self, file_path: Path, skip_unchanged: bool = True) -> Optional[Dict]:
+        """Read one file unless its mtime and size match the manifest; None if empty"""
+        rel_path = str(file_path.relative_to(self.docs_dir))
+        doc = {
+            'path': rel_path,
+            'filename': file_path.name,
+            'type': 'documentation',
+            'content': None
+        }
 
-                documents.append({
-                    'content': content,
-                    'path': str(rel_path),
-                    'filename': file_path.name,
-                    'type': 'documentation'
-                })
+        try:
+            stat = file_path.stat()
+            doc['mtime_ns'], doc['size'] = stat.st_mtime_ns, stat.st_size
+            if skip_unchanged and self.manifest.is_unchanged_file(rel_path, stat.st_mtime_ns, stat.st_size):
+                return doc
 
-                print(f"  ✓ Loaded: {rel_path}")
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"  ✗ Error loading {file_path}: {e}")
+            return doc
 
-            except Exception as e:
-                print(f"  ✗ Error loading {file_path}: {e}")
+        # Skip empty files
+        if not content.strip():
+            return None
 
-        return documents
+        doc['content'] = content
+        doc['sha256'] = content_hash(content)
+        return doc
 
-    def chunk_document(self, content: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    def chunk_document(self, content: str) -> List[Chunk]:
         """
-        Chunk document into smaller pieces
+        Chunk document into token-budgeted, heading-aware pieces
 
         Args:
             content: Document content
-            chunk_size: Maximum chunk size in characters
-            overlap: Overlap between chunks
 
         Returns:
-            List of text chunks
+            Chunks with text, character offsets, token count and heading path
         """
-        chunks = []
-        start = 0
-
-        while start < len(content):
-            end = start + chunk_size
+        return self.chunker.chunk(content)
 
-            # Try to break at paragraph boundary
-            if end < len(content):
-                # Look for double newline (paragraph break)
-                newline_pos = content.rfind('\n\n', start, end)
-                if newline_pos != -1:
-                    end = newline_pos
-
-            chunk = content[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+    def embed_documents(self, documents: Iterable[Dict], batch_size: int = 1024) -> Dict:
+        """
+        Incrementally index a stream of documents into ChromaDB
 
-            start = end - overlap if end < len(content) else end
+        Unchanged files are skipped by mtime/size or content hash. For
+        changed files only chunks with new content-derived IDs are encoded,
+        in batches as they arrive; chunks that kept their text only get their
+        position metadata refreshed. Chunks of edited or removed files that
+        no longer exist are deleted.
 
-        return chunks
+        Args:
+            documents: Full current document set, e.g. load_documents() (files
+                missing from it are removed from the index)
+            batch_size: Chunks buffered per encode/upsert; the encoder re-batches
+                them by length
 
-    def embed_documents(self, documents: List[Dict[str, str]]):
-        """Embed documents into ChromaDB"""
-        print(f"\nEmbedding {len(documents)} documents...")
+        Returns:
+            Counts of documents, unchanged documents, embedded/moved/deleted chunks
+        """
+        print("\nIndexing documents...")
 
-        all_chunks = []
-        all_metadatas = []
-        all_ids = []
+        rebuilt = not self.manifest.compatible
+        if rebuilt:
+            self.reset_collection()
 
-        chunk_id = 0
+        stats = Counter()
+        pending_chunks, pending_metadatas, pending_ids = [], [], []
+        moved_ids, moved_metadatas = [], []
+        orphan_ids = []
+        manifest_changed = not self.manifest.exists
 
+        def flush():
+            if not pending_ids:
+                return
+            # Generate embeddings
+            embeddings = self.encoder.encode([c.embedding_text() for c in pending_chunks],
+                                             lengths=[c.tokens for c in pending_chunks])
+
+            # Upsert so re-runs after a crash never collide with existing IDs
+            self.collection.upsert(
+                documents=[c.text for c in pending_chunks],
+                metadatas=pending_metadatas,
+                ids=pending_ids,
+                embeddings=embeddings
+            )
+            for chunk, chunk_id in zip(pending_chunks, pending_ids):
+                self.sparse_index.add(chunk_id, chunk.embedding_text())
+            stats['embedded'] += len(pending_ids)
+            print(f"  Embedded {stats['embedded']} chunks")
+            pending_chunks.clear()
+            pending_metadatas.clear()
+            pending_ids.clear()
+
+        current_paths = set()
         for doc in documents:
+            current_paths.add(doc['path'])
+            stats['documents'] += 1
+
+            entry = self.manifest.files.get(doc['path'])
+            if doc['content'] is not None and not doc.get('sha256'):
+                doc['sha256'] = content_hash(doc['content'])
+            if doc['content'] is None or self.manifest.is_current(doc['path'], doc['sha256']):
+                stats['unchanged'] += 1
+                if entry is not None and doc.get('mtime_ns') and entry.get('mtime_ns') != doc['mtime_ns']:
+                    # Touched but identical: remember the new mtime so the next run skips the read
+                    entry['mtime_ns'], entry['size'] = doc['mtime_ns'], doc['size']
+                    manifest_changed = True
+                continue
+
             # Chunk document
             chunks = self.chunk_document(doc['content'])
+            ids = chunk_ids(doc['path'], [c.embedding_text() for c in chunks])
+            previous_ids = set(self.manifest.chunk_ids(doc['path']))
 
-            for i, chunk in enumerate(chunks):
-                all_chunks.append(chunk)
-                all_metadatas.append({
+            for i, (chunk, chunk_id) in enumerate(zip(chunks, ids)):
+                metadata = {
                     'path': doc['path'],
                     'filename': doc['filename'],
                     'type': doc['type'],
                     'chunk_index': i,
-                    'total_chunks': len(chunks)
-                })
-                all_ids.append(f"doc_{chunk_id}")
-                chunk_id += 1
-
-        print(f"Total chunks: {len(all_chunks)}")
-
-        # Embed in batches
-        batch_size = 100
-        for i in range(0, len(all_chunks), batch_size):
-            batch_end = min(i + batch_size, len(all_chunks))
-
-            batch_chunks = all_chunks[i:batch_end]
-            batch_metadatas = all_metadatas[i:batch_end]
-            batch_ids = all_ids[i:batch_end]
-
-            # Generate embeddings
-            embeddings = self.embedding_model.encode(batch_chunks).tolist()
-
-            # Add to ChromaDB
-            self.collection.add(
-                documents=batch_chunks,
-                metadatas=batch_metadatas,
-                ids=batch_ids,
-                embeddings=embeddings
-            )
-
-            print(f"  Embedded chunks {i}-{batch_end}/{len(all_chunks)}")
+                    'total_chunks': len(chunks),
+                    'section': chunk.section,
+                    'start_char': chunk.start,
+                    'end_char': chunk.end,
+                    'tokens': chunk.tokens
+                }
+                if chunk_id in previous_ids:
+                    moved_ids.append(chunk_id)
+                    moved_metadatas.append(metadata)
+                else:
+                    pending_chunks.append(chunk)
+                    pending_metadatas.append(metadata)
+                    pending_ids.append(chunk_id)
+
+            if len(pending_ids) >= batch_size:
+                flush()
+
+            orphan_ids.extend(previous_ids - set(ids))
+            self.manifest.files[doc['path']] = {
+                'sha256': doc['sha256'],
+                'mtime_ns': doc.get('mtime_ns'),
+                'size': doc.get('size'),
+                'chunk_ids': ids
+            }
+            manifest_changed = True
+
+        if not stats['documents']:
+            print("No documents found!")
+            return stats
+
+        flush()
+
+        # Files that disappeared (or became empty) since the last run
+        for path in list(self.manifest.files):
+            if path not in current_paths:
+                orphan_ids.extend(self.manifest.chunk_ids(path))
+                del self.manifest.files[path]
+                manifest_changed = True
+
+        for i in range(0, len(moved_ids), batch_size):
+            self.collection.update(ids=moved_ids[i:i + batch_size],
+                                   metadatas=moved_metadatas[i:i + batch_size])
+
+        for i in range(0, len(orphan_ids), batch_size):
+            self.collection.delete(ids=orphan_ids[i:i + batch_size])
+
+        if stats['embedded']:
+            print(f"Encoding: {self.encoder.chunks_encoded} chunks in {self.encoder.seconds:.1f}s "
+                  f"({self.encoder.chunks_per_second:.0f} chunks/sec)")
+
+        stats['moved'], stats['deleted'] = len(moved_ids), len(orphan_ids)
+        print(f"Unchanged documents: {stats['unchanged']}/{stats['documents']}")
+
+        # Touched-but-identical files change the manifest, not the collection
+        if rebuilt or stats['embedded'] or moved_ids or orphan_ids:
+            self.manifest.bump_version()
+        if (self.manifest.sparse_version != self.manifest.index_version
+                or not (self.vector_db_path / SPARSE_INDEX_NAME).exists()):
+            self.sync_sparse_index()
+            manifest_changed = True
+
+        if not manifest_changed:
+            print("✓ Index is up to date")
+            return stats
+
+        self.manifest.save()
+        print(f"✓ Indexing complete! Embedded {stats['embedded']} new chunks, "
+              f"re-positioned {stats['moved']}, deleted {stats['deleted']} orphaned chunks")
+        return stats
+
+    def sync_sparse_index(self):
+        """
+        Bring the BM25 index in line with the manifest and save it
 
-        print(f"✓ Embedding complete! Total chunks: {len(all_chunks)}")
+        Chunks added this run are already indexed; this drops orphaned
+        chunks and backfills any the BM25 index never saw (first run after
+        upgrading, or an interrupted run) from the collection.
+        """
+        missing = self.sparse_index.reconcile(self.manifest.all_chunk_ids())
+        if missing:
+            print(f"Backfilling BM25 index with {len(missing)} chunks...")
+        for i in range(0, len(missing), 1000):
+            batch = self.collection.get(ids=missing[i:i + 1000], include=['documents', 'metadatas'])
+            for chunk_id, text, metadata in zip(batch['ids'], batch['documents'], batch['metadatas']):
+                chunk = Chunk(text, metadata['start_char'], metadata['end_char'],
+                              metadata['tokens'], metadata['section'])
+                self.sparse_index.add(chunk_id, chunk.embedding_text())
+        self.sparse_index.save()
+        self.manifest.sparse_version = self.manifest.index_version
+
+    def reset_collection(self):
+        """Drop every indexed chunk (legacy positional IDs or changed model/chunking)"""
+        existing = self.collection.get(include=[])['ids']
+        if existing:
+            print(f"Rebuilding index: removing {len(existing)} chunks indexed with "
+                  f"different settings or positional IDs")
+            for i in range(0, len(existing), 1000):
+                self.collection.delete(ids=existing[i:i + 1000])
+        self.manifest.reset()
 
     def get_stats(self) -> Dict:
         """Get collection statistics"""
-        count = self.collection.count()
+        # The manifest mirrors the collection, so stats don't need to open ChromaDB
+        if self.manifest.exists:
+            count = sum(len(entry['chunk_ids']) for entry in self.manifest.files.values())
+        else:
+            count = self.collection.count()
         return {
             'total_chunks': count,
-            'collection_name': self.collection.name
+            'collection_name': COLLECTION_NAME
         }
 
 
 def main():
     """Main embedding pipeline"""
+    parser = argparse.ArgumentParser(description="Embed ScholarRAG documentation into ChromaDB")
+    parser.add_argument('--device', default=None,
+                        help='Encoding device: cpu, cuda, mps (default: auto-detect)')
+    parser.add_argument('--precision', default='float32', choices=['float32', 'float16', 'int8'],
+                        help='float16 needs a GPU; int8 quantizes for CPU (default: float32)')
+    parser.add_argument('--backend', default='torch', choices=['torch', 'onnx'],
+                        help='Inference backend (default: torch; onnx needs sentence-transformers[onnx]>=3.2)')
+    parser.add_argument('--batch-tokens', type=int, default=16384,
+                        help='Padded tokens per encode batch (default: 16384)')
+    args = parser.parse_args()
+
     # Paths
     project_root = Path(__file__).parent.parent.parent
     docs_dir = project_root / "docs"
@@ -189,18 +416,16 @@ def main():
     print()
 
     # Initialize embedder
-    embedder = DocumentEmbedder(str(docs_dir), str(vector_db_path))
+    embedder = DocumentEmbedder(str(docs_dir), str(vector_db_path), device=args.device,
+                                precision=args.precision, backend=args.backend,
+                                batch_tokens=args.batch_tokens)
 
-    # Load documents
-    documents = embedder.load_documents()
+    # Stream documents straight into the incremental indexer
+    stats = embedder.embed_documents(embedder.load_documents())
 
-    if not documents:
-        print("No documents found!")
+    if not stats['documents']:
         return
 
-    # Embed documents
-    embedder.embed_documents(documents)
-
     # Print stats
     stats = embedder.get_stats()
     print(f"\n{'=' * 60}")
@@ -0,0 +1,136 @@
+"""
+Length-bucketed chunk encoder
+
+Encoding cost is driven by padding: every sequence in a batch is padded to
+the longest one. ChunkEncoder sorts chunks by token length, cuts them into
+buckets of similar length and sizes each batch by a token budget (short
+chunks go in large batches, long chunks in small ones). Embeddings are
+written into one preallocated, contiguous float32 NumPy array in the
+original order; nothing is converted to Python floats.
+
+Options:
+- device: cpu / cuda / mps (default: SentenceTransformer's auto-detection)
+- precision: float32, float16 (GPU only) or int8 (CPU: dynamically
+  quantized ONNX model with backend='onnx', torch dynamic quantization
+  otherwise)
+- backend: torch or onnx (ONNX Runtime, faster on CPU). onnx needs
+  sentence-transformers 3.2+ with its ONNX extra:
+  pip install "sentence-transformers[onnx]>=3.2"
+"""
+
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+# Dynamically quantized ONNX export shipped with all-MiniLM-L6-v2 on the Hugging Face Hub
+ONNX_INT8_FILE = 'onnx/model_qint8_avx2.onnx'
+
+
+class ChunkEncoder:
+    """Token-budgeted, length-sorted batch encoding into float32 arrays"""
+
+    def __init__(self, model_name: str, device: str = None, precision: str = 'float32',
+                 backend: str = 'torch', batch_tokens: int = 16384, max_batch_size: int = 256):
+        """
+        Args:
+            model_name: SentenceTransformer model
+            device: cpu / cuda / mps (None: auto-detect)
+            precision: float32, float16 or int8
+            backend: torch or onnx
+            batch_tokens: Padded tokens per batch (batch size x longest chunk)
+            max_batch_size: Upper bound on chunks per batch
+        """
+        self.model_name = model_name
+        self.device = device
+        self.precision = precision
+        self.backend = backend
+        self.batch_tokens = batch_tokens
+        self.max_batch_size = max_batch_size
+
+        self._model = None
+        self.chunks_encoded = 0
+        self.seconds = 0.0
+
+    @property
+    def model(self):
+        """SentenceTransformer configured for device / precision / backend, loaded on first use"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            print(f"Loading embedding model ({self.backend}, {self.precision}"
+                  f"{', ' + self.device if self.device else ''})...")
+            kwargs = {}
+            if self.backend != 'torch':
+                # backend= only exists in sentence-transformers >= 3.2; torch is the default anyway
+                kwargs['backend'] = self.backend
+                if self.precision == 'int8':
+                    kwargs['model_kwargs'] = {'file_name': ONNX_INT8_FILE}
+            model = SentenceTransformer(self.model_name, device=self.device, **kwargs)
+
+            if self.precision == 'float16':
+                if model.device.type == 'cpu':
+                    print("  ⚠️  float16 needs a GPU; encoding in float32 on CPU")
+                else:
+                    model.half()
+            elif self.precision == 'int8' and self.backend == 'torch':
+                import torch
+
+                if model.device.type != 'cpu':
+                    print("  ⚠️  int8 dynamic quantization runs on CPU only; moving model to CPU")
+                    model.to('cpu')
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            self._model = model
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def plan_batches(self, lengths: Sequence[int]) -> List[np.ndarray]:
+        """
+        Group chunk indices into batches of similar length
+
+        Args:
+            lengths: Token length of each chunk
+
+        Returns:
+            Index arrays, longest chunks first, each within the token budget
+        """
+        order = np.argsort(-np.asarray(lengths), kind='stable')
+        batches = []
+        i = 0
+        while i < len(order):
+            longest = max(int(lengths[order[i]]), 1)  # Sorted, so the first is the longest
+            size = max(1, min(self.max_batch_size, self.batch_tokens // longest))
+            batches.append(order[i:i + size])
+            i += size
+        return batches
+
+    def encode(self, texts: Sequence[str], lengths: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Encode texts into a contiguous (n, dim) float32 array, in input order
+
+        Args:
+            texts: Texts to encode
+            lengths: Token length per text (e.g. Chunk.tokens); characters / 4 if omitted
+        """
+        if lengths is None:
+            lengths = [len(text) // 4 + 2 for text in texts]
+
+        start = time.perf_counter()
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for batch in self.plan_batches(lengths):
+            vectors = self.model.encode([texts[i] for i in batch], batch_size=len(batch),
+                                        convert_to_numpy=True, show_progress_bar=False)
+            embeddings[batch] = vectors  # Casts float16 output to float32 in place
+
+        self.seconds += time.perf_counter() - start
+        self.chunks_encoded += len(texts)
+        return embeddings
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks_encoded / self.seconds if self.seconds else 0.0
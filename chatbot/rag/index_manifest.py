@@ -0,0 +1,135 @@
+"""
+Index manifest for incremental re-embedding
+
+Records, per source file, the SHA-256 of its content, its mtime and size,
+and the IDs of the chunks it produced, together with the settings that
+shaped those chunks (embedding model, chunk size, overlap). A re-index
+skips files whose mtime and size are unchanged, compares the hash of the
+rest and only re-chunks files that changed; chunk IDs are
+derived from (path, chunk text), so unchanged chunks of an edited file keep
+their IDs and embeddings.
+
+Stored as index_manifest.json next to the ChromaDB files. Its
+index_version is bumped whenever the collection's contents change, so
+readers in other processes (the retrieval server's result cache) can tell
+that cached results are stale.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = 'index_manifest.json'
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a document's content"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def chunk_ids(path: str, chunks: List[str]) -> List[str]:
+    """
+    Content-derived chunk IDs
+
+    The same text at the same path always gets the same ID; repeated chunks
+    within one file get a `-2`, `-3`... suffix.
+    """
+    ids = []
+    seen = {}
+    for chunk in chunks:
+        digest = hashlib.sha256(f"{path}\0{chunk}".encode('utf-8')).hexdigest()[:20]
+        seen[digest] = seen.get(digest, 0) + 1
+        ids.append(f"chunk_{digest}" if seen[digest] == 1 else f"chunk_{digest}-{seen[digest]}")
+    return ids
+
+
+class IndexManifest:
+    """Per-file content hashes and chunk IDs of the scholarag_docs collection"""
+
+    def __init__(self, manifest_file: Path, settings: Dict):
+        """
+        Args:
+            manifest_file: JSON file (e.g. chatbot/vector_db/index_manifest.json)
+            settings: Settings the index was built with; a mismatch forces a rebuild
+        """
+        self.manifest_file = Path(manifest_file)
+        self.settings = settings
+        self.files = {}
+        self.stored_settings = None
+        self.index_version = 0
+        self.sparse_version = None  # index_version the BM25 index was last synced to
+        self.exists = False
+        self.load()
+
+    def load(self):
+        if not self.manifest_file.exists():
+            return
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            return
+        self.exists = True
+        self.stored_settings = data.get('settings')
+        self.index_version = data.get('index_version', 0)
+        self.sparse_version = data.get('sparse_version')
+        self.files = data.get('files', {})
+
+    @property
+    def compatible(self) -> bool:
+        """True if the stored index was built with the current settings"""
+        return self.exists and self.stored_settings == self.settings
+
+    def reset(self):
+        """Forget every file (the collection is being rebuilt)"""
+        self.files = {}
+        self.stored_settings = self.settings
+
+    def is_current(self, path: str, digest: str) -> bool:
+        entry = self.files.get(path)
+        return entry is not None and entry['sha256'] == digest
+
+    def is_unchanged_file(self, path: str, mtime_ns: int, size: int) -> bool:
+        """True if a file's mtime and size match the last index (no need to read it)"""
+        entry = self.files.get(path)
+        return (self.compatible and entry is not None
+                and entry.get('mtime_ns') == mtime_ns and entry.get('size') == size)
+
+    def chunk_ids(self, path: str) -> List[str]:
+        entry = self.files.get(path)
+        return entry['chunk_ids'] if entry else []
+
+    def bump_version(self):
+        """Mark the collection's contents as changed (takes effect on save)"""
+        self.index_version += 1
+
+    def all_chunk_ids(self) -> List[str]:
+        return [chunk_id for entry in self.files.values() for chunk_id in entry['chunk_ids']]
+
+    def save(self):
+        """Write the manifest atomically (write + rename)"""
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'settings': self.settings,
+                'index_version': self.index_version,
+                'sparse_version': self.sparse_version,
+                'files': self.files
+            }, f, indent=1)
+        os.replace(tmp_file, self.manifest_file)
+        self.exists = True
+        self.stored_settings = self.settings
+
+
+def read_index_version(manifest_file: Path) -> int:
+    """index_version of a saved manifest (0 if there is none)"""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('index_version', 0)
+    except (OSError, ValueError):
+        return 0
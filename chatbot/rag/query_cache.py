@@ -0,0 +1,140 @@
+"""
+Query embedding and result caches for chatbot retrieval
+
+Chatbot users ask the same questions over and over. The retriever keeps
+two LRU caches with a TTL, keyed by the normalised question (and top_k
+for results):
+
+- embeddings: query vector. It depends only on the model, so it outlives
+  re-indexing, and a repeated question never pays for encoding.
+- results: top-k chunks. Stamped with the index_version from
+  index_manifest.json; when DocumentEmbedder re-indexes and bumps the
+  version, every cached result is dropped. A hit skips the ANN search too.
+
+The version is read from the manifest only when its mtime changes (one
+stat per lookup). Hit rates are published through stats().
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from index_manifest import read_index_version
+
+
+def normalize_query(query: str) -> str:
+    """Cache key: case and whitespace don't change all-MiniLM-L6-v2's (uncased) tokens"""
+    return ' '.join(query.split()).lower()
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, usable: Callable = None):
+        """
+        Cached value or None
+
+        Args:
+            key: Cache key
+            usable: Optional check on the value; an unusable value counts as a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                if usable is None or usable(entry[1]):
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+            elif entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {'size': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+class QueryCache:
+    """Embedding and top-k result caches, invalidated by the index version stamp"""
+
+    def __init__(self, manifest_file: Path, maxsize: int = 1024, ttl: float = 3600.0):
+        """
+        Args:
+            manifest_file: index_manifest.json of the collection being searched
+            maxsize: Entries per cache
+            ttl: Seconds before an entry expires
+        """
+        self.manifest_file = Path(manifest_file)
+        self.embeddings = LRUCache(maxsize, ttl)
+        self.results = LRUCache(maxsize, ttl)
+        self.lock = threading.Lock()
+        self.manifest_mtime = None
+        self.index_version = None
+        self.invalidations = 0
+
+    def check_version(self):
+        """Drop cached results if the index was rebuilt since they were stored"""
+        try:
+            mtime = os.stat(self.manifest_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self.manifest_mtime:
+            return
+
+        with self.lock:
+            if mtime == self.manifest_mtime:
+                return
+            version = read_index_version(self.manifest_file)
+            if self.index_version is not None and version != self.index_version:
+                self.results.clear()
+                self.invalidations += 1
+            self.manifest_mtime, self.index_version = mtime, version
+
+    def get_results(self, query: str, top_k: int) -> Optional[List[Dict]]:
+        """Cached results of a search for exactly top_k"""
+        self.check_version()
+        version = self.index_version
+        entry = self.results.get((normalize_query(query), top_k), lambda entry: entry[0] == version)
+        return entry[1] if entry is not None else None
+
+    def put_results(self, query: str, top_k: int, results: List[Dict], index_version: int):
+        """
+        Args:
+            index_version: Version seen before the search, so results of a
+                search that raced a re-index are never served
+        """
+        self.results.put((normalize_query(query), top_k), (index_version, results))
+
+    def get_embedding(self, query: str):
+        return self.embeddings.get(normalize_query(query))
+
+    def put_embedding(self, query: str, embedding):
+        self.embeddings.put(normalize_query(query), embedding)
+
+    def stats(self) -> Dict:
+        return {'index_version': self.index_version, 'invalidations': self.invalidations,
+                'embeddings': self.embeddings.stats(), 'results': self.results.stats()}
@@ -0,0 +1,397 @@
+"""
+Retrieval server for the ScholarRAG Helper chatbot
+
+Long-lived HTTP service over the scholarag_docs collection built by
+embedder.py. The embedding model and the ChromaDB PersistentClient are
+loaded once at startup, and a warm-up query runs before the port opens,
+so no request pays for a cold load.
+
+Concurrent requests are micro-batched: a single worker thread collects
+queries for up to --max-wait-ms (or --max-batch queries), encodes them in
+one model call and answers them with one collection.query. The model and
+ChromaDB are therefore only touched from one thread.
+
+Repeated questions are answered from query_cache.QueryCache before they
+reach the batcher: cached results skip encoding and the ANN search, and
+cached query embeddings skip encoding. Cached results are dropped when
+embedder.py re-indexes (index_version in index_manifest.json).
+
+Search is hybrid by default: the vector ranking and a BM25 ranking from
+sparse_index.SparseIndex (built by embedder.py alongside the collection)
+are merged with reciprocal-rank fusion, so exact identifiers such as
+`auto_include` or `03b_human_review.py` reach the top-k. --dense-only
+turns BM25 off.
+
+Endpoints:
+    POST /search  {"query": "...", "top_k": 5}
+                  -> {"results": [{content, metadata, similarity}], "took_ms": 12.3}
+                  With "max_tokens", the top_k chunks are merged into passages
+                  (overlap removed) and cut to the budget (context_packer.py)
+    GET  /health  -> {"status": "ok", "chunks": 301, "batches": 10, "queries": 42}
+    GET  /metrics -> batching counters and cache hit rates
+
+Usage:
+    python chatbot/rag/retriever.py --port 8100
+    curl -s localhost:8100/search -d '{"query": "How do I set PRISMA thresholds?"}'
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from context_packer import pack_context
+from embedder import COLLECTION_NAME, EMBEDDING_MODEL
+from encoder import ChunkEncoder
+from index_manifest import MANIFEST_NAME
+from query_cache import QueryCache
+from sparse_index import SPARSE_INDEX_NAME, SparseIndex, reciprocal_rank_fusion
+
+
+DEFAULT_PORT = 8100
+MAX_TOP_K = 50
+MIN_CANDIDATES = 20  # Per ranking, before fusion
+
+
+class Retriever:
+    """Top-k search over the scholarag_docs collection"""
+
+    def __init__(self, vector_db_path: str, device: str = None, precision: str = 'float32',
+                 backend: str = 'torch', cache_size: int = 1024, cache_ttl: float = 3600.0,
+                 hybrid: bool = True):
+        """
+        Args:
+            vector_db_path: ChromaDB storage written by DocumentEmbedder
+            device: cpu / cuda / mps (None: auto-detect)
+            precision: float32, float16 or int8
+            backend: torch or onnx
+            cache_size: Entries per query cache (0 disables caching)
+            cache_ttl: Seconds a cached embedding / result stays valid
+            hybrid: Fuse BM25 with vector search (False: vector search only)
+        """
+        import chromadb
+        from chromadb.config import Settings
+
+        self.vector_db_path = Path(vector_db_path)
+        self.encoder = ChunkEncoder(EMBEDDING_MODEL, device=device, precision=precision,
+                                    backend=backend)
+        self.cache = QueryCache(self.vector_db_path / MANIFEST_NAME, cache_size, cache_ttl)
+        self.hybrid = hybrid
+        self.sparse_index = None
+        self.sparse_version = None
+
+        print("Opening ChromaDB...")
+        self.client = chromadb.PersistentClient(
+            path=str(self.vector_db_path),
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.collection = self.client.get_collection(COLLECTION_NAME)
+
+    def warm_up(self):
+        """Load the model and touch the HNSW index before the first real query"""
+        self.search_batch(["warm-up query"], top_k=1)
+
+    def cached(self, query: str, top_k: int = 5) -> Optional[List[Dict]]:
+        """Cached results for a query, or None"""
+        return self.cache.get_results(query, top_k)
+
+    def search_batch(self, queries: Sequence[str], top_k: Union[int, Sequence[int]] = 5,
+                     check_cache: bool = True) -> List[List[Dict]]:
+        """
+        Search several queries with one encode call and one collection query
+
+        Cached results are returned as is; only queries without a cached
+        embedding are encoded. The batch is searched at the largest top_k;
+        each query's results are cut to its own top_k and cached under it.
+
+        Args:
+            queries: Query texts
+            top_k: Results per query, one value for all or one per query
+            check_cache: Look up cached results first (False if the caller already did)
+
+        Returns:
+            One result list per query: {content, metadata, similarity}
+        """
+        top_ks = [top_k] * len(queries) if isinstance(top_k, int) else list(top_k)
+        if check_cache:
+            results = [self.cache.get_results(query, k) for query, k in zip(queries, top_ks)]
+        else:
+            self.cache.check_version()
+            results = [None] * len(queries)
+        index_version = self.cache.index_version
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        if self.hybrid and self.sparse_version != index_version:
+            # Re-indexed since the BM25 index was loaded
+            self.sparse_index = SparseIndex(self.vector_db_path / SPARSE_INDEX_NAME)
+            self.sparse_version = index_version
+
+        embeddings = np.empty((len(missing), self.encoder.dimension), dtype=np.float32)
+        to_encode = []
+        for row, i in enumerate(missing):
+            embedding = self.cache.get_embedding(queries[i])
+            if embedding is None:
+                to_encode.append(row)
+            else:
+                embeddings[row] = embedding
+        if to_encode:
+            embeddings[to_encode] = self.encoder.encode([queries[missing[row]] for row in to_encode])
+
+        ranked = self.rank([queries[i] for i in missing], embeddings, max(top_ks[i] for i in missing))
+        for row, i in enumerate(missing):
+            results[i] = ranked[row][:top_ks[i]]
+            self.cache.put_results(queries[i], top_ks[i], results[i], index_version)
+        for row in to_encode:
+            self.cache.put_embedding(queries[missing[row]], embeddings[row].copy())
+        return results
+
+    def rank(self, queries: Sequence[str], embeddings: np.ndarray, top_k: int) -> List[List[Dict]]:
+        """Vector search, fused with BM25 when hybrid; one collection query for the whole batch"""
+        use_sparse = self.hybrid and self.sparse_index is not None and len(self.sparse_index) > 0
+        response = self.collection.query(
+            query_embeddings=embeddings,
+            n_results=max(top_k * 4, MIN_CANDIDATES) if use_sparse else top_k,
+            include=['documents', 'metadatas', 'distances']
+        )
+
+        hits = {}  # chunk_id -> (content, metadata)
+        rankings = []
+        for row in range(len(queries)):
+            dense = {}
+            for chunk_id, document, metadata, distance in zip(response['ids'][row],
+                                                              response['documents'][row],
+                                                              response['metadatas'][row],
+                                                              response['distances'][row]):
+                hits[chunk_id] = (document, metadata)
+                dense[chunk_id] = 1 - distance / 2  # Squared L2 between unit vectors: d = 2 - 2 cos
+            if use_sparse:
+                sparse = [chunk_id for chunk_id, _ in
+                          self.sparse_index.search(queries[row], len(response['ids'][row]))]
+                fused = [chunk_id for chunk_id, _ in
+                         reciprocal_rank_fusion([response['ids'][row], sparse])[:top_k]]
+            else:
+                fused = response['ids'][row]
+            rankings.append((fused, dense))
+
+        # Chunks only BM25 found for a query: fetch them and score them against its vector
+        extra = sorted({c for fused, dense in rankings for c in fused if c not in dense})
+        vectors = {}
+        if extra:
+            fetched = self.collection.get(ids=extra, include=['documents', 'metadatas', 'embeddings'])
+            vectors = dict(zip(fetched['ids'], fetched['embeddings']))
+            hits.update((chunk_id, (document, metadata)) for chunk_id, document, metadata
+                        in zip(fetched['ids'], fetched['documents'], fetched['metadatas']))
+
+        results = []
+        for row, (fused, dense) in enumerate(rankings):
+            result = []
+            for chunk_id in fused:
+                if chunk_id not in hits or (chunk_id not in dense and chunk_id not in vectors):
+                    continue  # Deleted by a re-index that is still running
+                similarity = dense.get(chunk_id)
+                if similarity is None:
+                    similarity = float(np.dot(vectors[chunk_id], embeddings[row]))
+                content, metadata = hits[chunk_id]
+                result.append({'content': content, 'metadata': metadata, 'similarity': similarity})
+            results.append(result)
+        return results
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        return self.search_batch([query], top_k)[0]
+
+
+class MicroBatcher:
+    """Coalesce concurrent searches into batched Retriever calls on one worker thread"""
+
+    def __init__(self, retriever: Retriever, max_batch: int = 32, max_wait_ms: float = 2.0):
+        """
+        Cache hits never enter the queue (see search)
+
+        Args:
+            retriever: Loaded Retriever
+            max_batch: Queries per batch
+            max_wait_ms: How long the first query of a batch waits for company
+        """
+        self.retriever = retriever
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.queries = 0
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, query: str, top_k: int) -> Future:
+        future = Future()
+        self.requests.put((query, top_k, future))
+        return future
+
+    def search(self, query: str, top_k: int = 5, timeout: float = 10.0) -> List[Dict]:
+        """Cached results right away; otherwise wait for the next batch"""
+        cached = self.retriever.cached(query, top_k)
+        if cached is not None:
+            return cached
+        return self.submit(query, top_k).result(timeout)
+
+    def collect(self) -> list:
+        """Block for one request, then gather more until the batch is full or the wait is over"""
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.collect()
+            try:
+                results = self.retriever.search_batch([q for q, _, _ in batch], [k for _, k, _ in batch],
+                                                      check_cache=False)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.queries += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class RetrievalServer(ThreadingHTTPServer):
+    """Threaded HTTP front end; all search work goes through the MicroBatcher"""
+
+    daemon_threads = True
+
+    def __init__(self, retriever: Retriever, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 max_batch: int = 32, max_wait_ms: float = 2.0):
+        super().__init__((host, port), SearchHandler)
+        self.retriever = retriever
+        self.batcher = MicroBatcher(retriever, max_batch=max_batch, max_wait_ms=max_wait_ms)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """Handles POST /search and GET /health"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive: no TCP handshake per query
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait on delayed ACKs
+
+    def do_POST(self):
+        if self.path != '/search':
+            self.send_json(404, {'error': f'Unknown path: {self.path}'})
+            return
+
+        start = time.perf_counter()
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            query = str(body['query']).strip()
+            top_k = min(max(int(body.get('top_k', 5)), 1), MAX_TOP_K)
+            max_tokens = int(body['max_tokens']) if body.get('max_tokens') else None
+        except (KeyError, ValueError, TypeError):
+            self.send_json(400, {'error': 'Expected JSON body '
+                                          '{"query": str, "top_k": int, "max_tokens": int}'})
+            return
+        if not query:
+            self.send_json(200, {'results': [], 'took_ms': 0.0})
+            return
+
+        try:
+            results = self.server.batcher.search(query, top_k)
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+            return
+        if max_tokens:
+            results = pack_context(results, max_tokens)
+
+        self.send_json(200, {'results': results,
+                             'took_ms': round((time.perf_counter() - start) * 1000, 2)})
+
+    def do_GET(self):
+        batcher = self.server.batcher
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'chunks': self.server.retriever.collection.count(),
+                                 'batches': batcher.batches, 'queries': batcher.queries})
+        elif self.path == '/metrics':
+            self.send_json(200, {'batches': batcher.batches, 'queries': batcher.queries,
+                                 'cache': self.server.retriever.cache.stats()})
+        else:
+            self.send_json(404, {'error': f'Unknown path: {self.path}'})
+
+    def send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # One line per query would dominate the output
+
+
+def main():
+    project_root = Path(__file__).parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="ScholarRAG Helper retrieval server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--vector-db', default=str(project_root / "chatbot" / "vector_db"),
+                        help='ChromaDB path (default: chatbot/vector_db)')
+    parser.add_argument('--device', default=None,
+                        help='Encoding device: cpu, cuda, mps (default: auto-detect)')
+    parser.add_argument('--precision', default='float32', choices=['float32', 'float16', 'int8'])
+    parser.add_argument('--backend', default='torch', choices=['torch', 'onnx'])
+    parser.add_argument('--max-batch', type=int, default=32,
+                        help='Queries per micro-batch (default: 32)')
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help='Max time a query waits for a batch to fill (default: 2.0)')
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help='Cached queries, embeddings and results each (default: 1024, 0: off)')
+    parser.add_argument('--cache-ttl', type=float, default=3600.0,
+                        help='Seconds a cache entry stays valid (default: 3600)')
+    parser.add_argument('--dense-only', action='store_true',
+                        help='Vector search only, without BM25 fusion')
+    args = parser.parse_args()
+
+    retriever = Retriever(args.vector_db, device=args.device, precision=args.precision,
+                          backend=args.backend, cache_size=args.cache_size,
+                          cache_ttl=args.cache_ttl, hybrid=not args.dense_only)
+    retriever.warm_up()
+
+    server = RetrievalServer(retriever, args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f"🔎 Retrieval server on {server.url} ({retriever.collection.count()} chunks)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        cache = retriever.cache.stats()
+        print(f"\n{server.batcher.queries} queries in {server.batcher.batches} batches, "
+              f"result cache hit rate {cache['results']['hit_rate']:.0%}, "
+              f"embedding cache hit rate {cache['embeddings']['hit_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
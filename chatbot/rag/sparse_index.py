@@ -0,0 +1,185 @@
+"""
+BM25 inverted index over documentation chunks
+
+MiniLM embeddings blur exact identifiers: `auto_include`,
+`decision_confidence` or `03b_human_review.py` come out close to any text
+about screening. This sparse index keeps identifiers intact as terms (and
+also indexes their parts), scores chunks with BM25, and
+reciprocal_rank_fusion() merges its ranking with the vector ranking.
+
+The index is maintained incrementally by DocumentEmbedder.embed_documents,
+under the same content-derived chunk IDs as the ChromaDB collection: new
+chunks are added, orphaned ones removed. It is stored as bm25_index.json
+next to the ChromaDB files (term frequencies per chunk; postings are
+rebuilt on load).
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+SPARSE_INDEX_NAME = 'bm25_index.json'
+SPARSE_INDEX_VERSION = 1
+
+# Words joined by _ . - / stay one term: auto_include, 03b_human_review.py, ai-prisma
+TERM_PATTERN = re.compile(r'[a-z0-9]+(?:[._\-/][a-z0-9]+)*')
+PART_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by can do does for from how i if in is it of on or that the this '
+    'to was what when where which who why will with you your'.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms; compound identifiers are kept whole and also split into parts"""
+    terms = []
+    for match in TERM_PATTERN.finditer(text.lower()):
+        term = match.group()
+        parts = PART_PATTERN.findall(term)
+        if len(parts) > 1:
+            terms.append(term)
+        terms.extend(part for part in parts if part not in STOPWORDS)
+    return terms
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Merge ranked ID lists: score(id) = sum over rankings of 1 / (k + rank)
+
+    Args:
+        rankings: Ranked IDs, best first (e.g. vector results, BM25 results)
+        k: Damping constant; 60 is the value from the original RRF paper
+
+    Returns:
+        (id, score) pairs, best first
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+class SparseIndex:
+    """Incremental BM25 index keyed by chunk ID"""
+
+    def __init__(self, index_file: Path, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            index_file: JSON file (e.g. chatbot/vector_db/bm25_index.json)
+            k1: Term frequency saturation
+            b: Document length normalisation
+        """
+        self.index_file = Path(index_file)
+        self.k1 = k1
+        self.b = b
+
+        self.docs = {}  # chunk_id -> {term: tf}
+        self.lengths = {}
+        self.postings = defaultdict(dict)  # term -> {chunk_id: tf}
+        self.total_length = 0
+        self.exists = False
+        self.load()
+
+    def load(self):
+        if not self.index_file.exists():
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != SPARSE_INDEX_VERSION:
+            return
+        self.exists = True
+        for chunk_id, term_freqs in data['docs'].items():
+            self._insert(chunk_id, term_freqs)
+
+    def save(self):
+        """Write the index atomically (write + rename)"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': SPARSE_INDEX_VERSION, 'docs': self.docs}, f,
+                      separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+        self.exists = True
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self.docs
+
+    def _insert(self, chunk_id: str, term_freqs: Dict[str, int]):
+        self.docs[chunk_id] = term_freqs
+        length = sum(term_freqs.values())
+        self.lengths[chunk_id] = length
+        self.total_length += length
+        for term, tf in term_freqs.items():
+            self.postings[term][chunk_id] = tf
+
+    def add(self, chunk_id: str, text: str):
+        """Index a chunk (replacing any previous text under the same ID)"""
+        if chunk_id in self.docs:
+            self.remove(chunk_id)
+        self._insert(chunk_id, dict(Counter(tokenize(text))))
+
+    def remove(self, chunk_id: str):
+        term_freqs = self.docs.pop(chunk_id, None)
+        if term_freqs is None:
+            return
+        self.total_length -= self.lengths.pop(chunk_id)
+        for term in term_freqs:
+            postings = self.postings[term]
+            postings.pop(chunk_id, None)
+            if not postings:
+                del self.postings[term]
+
+    def clear(self):
+        self.docs.clear()
+        self.lengths.clear()
+        self.postings.clear()
+        self.total_length = 0
+
+    def search(self, query: str, top_k: int = 20) -> List[Tuple[str, float]]:
+        """
+        BM25 top-k
+
+        Returns:
+            (chunk_id, score) pairs, best first; chunks sharing no term are left out
+        """
+        if not self.docs:
+            return []
+        n_docs = len(self.docs)
+        avg_length = self.total_length / n_docs
+        scores = defaultdict(float)
+
+        for term, query_tf in Counter(tokenize(query)).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[chunk_id] / avg_length)
+                scores[chunk_id] += query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)[:top_k]
+
+    def reconcile(self, expected_ids: Iterable[str]) -> List[str]:
+        """
+        Drop chunks that are no longer indexed
+
+        Args:
+            expected_ids: Every chunk ID in the collection
+
+        Returns:
+            Expected IDs missing from this index (to be added by the caller)
+        """
+        expected = set(expected_ids)
+        for chunk_id in [c for c in self.docs if c not in expected]:
+            self.remove(chunk_id)
+        return [c for c in expected if c not in self.docs]
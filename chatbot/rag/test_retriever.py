@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Retrieval Server Latency Test
+
+Starts the retrieval server in-process on a free port against an index
+built by embedder.py and measures end-to-end HTTP latency. The model and
+ChromaDB load once, before timing starts.
+
+Usage:
+    python chatbot/rag/embedder.py          # Build the index first
+    python chatbot/rag/test_retriever.py [--vector-db PATH] [--requests 200] [--clients 8]
+
+Tests:
+    1. Server results match a direct Retriever.search
+    2. Sequential queries: p95 < 50 ms
+    3. Concurrent clients: p95 < 50 ms, queries are micro-batched
+    4. Repeated questions hit the cache, also at a smaller top_k that shared a batch
+       with a larger one; a re-index (index_version bump) invalidates it
+
+Tests 2 and 3 send distinct queries so the query cache never answers them.
+"""
+
+import argparse
+import http.client
+import json
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from index_manifest import MANIFEST_NAME, IndexManifest
+from retriever import RetrievalServer, Retriever
+
+
+P95_BUDGET_MS = 50.0
+
+QUERIES = [
+    "How do I set up a ScholaRAG project?",
+    "What are the five stages of the workflow?",
+    "How should I design a search query for Semantic Scholar?",
+    "What does PRISMA screening do?",
+    "How are auto-include and auto-exclude thresholds chosen?",
+    "Which databases can I fetch papers from?",
+    "How do I configure the research profile?",
+    "What is the difference between knowledge repository and systematic review mode?",
+    "How do I build the RAG vector database?",
+    "How can I troubleshoot API rate limits?",
+    "Where are screening results saved?",
+    "How do I run the workshop exercises?",
+]
+
+
+class RetrieverLatencyTester:
+    """Measure retrieval latency over HTTP, sequentially and under concurrent load"""
+
+    def __init__(self, vector_db_path: str, requests: int = 200, clients: int = 8):
+        self.retriever = Retriever(vector_db_path)
+        self.retriever.warm_up()
+        self.server = RetrievalServer(self.retriever, port=0).start()
+        self.requests = requests
+        self.clients = clients
+
+    def post(self, conn: http.client.HTTPConnection, query: str, top_k: int = 5) -> dict:
+        conn.request('POST', '/search', json.dumps({'query': query, 'top_k': top_k}),
+                     {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return json.loads(response.read())
+
+    def connect(self) -> http.client.HTTPConnection:
+        host, port = self.server.server_address[:2]
+        return http.client.HTTPConnection(host, port)
+
+    def timed_queries(self, n: int, offset: int = 0, repeat: bool = False) -> List[float]:
+        """
+        Send n queries over one keep-alive connection; latency per query in ms
+
+        Args:
+            offset: First query number (distinct per client)
+            repeat: Cycle through QUERIES as is instead of numbering them
+        """
+        conn = self.connect()
+        latencies = []
+        for i in range(offset, offset + n):
+            query = QUERIES[i % len(QUERIES)]
+            start = time.perf_counter()
+            self.post(conn, query if repeat else f"{query} ({i})")
+            latencies.append((time.perf_counter() - start) * 1000)
+        conn.close()
+        return latencies
+
+    @staticmethod
+    def summary(latencies: List[float]) -> str:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+
+    def test_results_match(self) -> bool:
+        conn = self.connect()
+        for query in QUERIES[:3]:
+            served = self.post(conn, query, top_k=3)['results']
+            direct = self.retriever.search(query, top_k=3)
+            if [r['metadata'] for r in served] != [r['metadata'] for r in direct]:
+                print(f"❌ TEST 1 FAILED: results differ for {query!r}")
+                conn.close()
+                return False
+        conn.close()
+        print("✅ TEST 1 PASSED: served results match direct search")
+        return True
+
+    def test_sequential(self) -> bool:
+        latencies = self.timed_queries(self.requests)
+        p95 = np.percentile(latencies, 95)
+        if p95 >= P95_BUDGET_MS:
+            print(f"❌ TEST 2 FAILED: {self.summary(latencies)}")
+            return False
+        print(f"✅ TEST 2 PASSED: {len(latencies)} sequential queries, {self.summary(latencies)}")
+        return True
+
+    def test_concurrent(self) -> bool:
+        batcher = self.server.batcher
+        batches_before, queries_before = batcher.batches, batcher.queries
+
+        per_client = max(1, self.requests // self.clients)
+        with ThreadPoolExecutor(max_workers=self.clients) as pool:
+            runs = list(pool.map(self.timed_queries, [per_client] * self.clients,
+                                 [self.requests + c * per_client for c in range(self.clients)]))
+        latencies = [ms for run in runs for ms in run]
+
+        batches = batcher.batches - batches_before
+        queries = batcher.queries - queries_before
+        p95 = np.percentile(latencies, 95)
+        if p95 >= P95_BUDGET_MS or batches >= queries:
+            print(f"❌ TEST 3 FAILED: {self.summary(latencies)}, {queries} queries in {batches} batches")
+            return False
+        print(f"✅ TEST 3 PASSED: {self.clients} clients, {self.summary(latencies)}, "
+              f"{queries} queries in {batches} batches ({queries / batches:.1f} per batch)")
+        return True
+
+    def test_cache(self) -> bool:
+        cache = self.retriever.cache
+        with tempfile.TemporaryDirectory() as tmp:
+            # Bump the version on a copy, not on the real index
+            manifest_file = Path(tmp) / MANIFEST_NAME
+            shutil.copy(self.retriever.vector_db_path / MANIFEST_NAME, manifest_file)
+            cache.manifest_file = manifest_file
+            cache.check_version()
+
+            self.timed_queries(len(QUERIES), repeat=True)  # Fill
+            hits_before = cache.results.hits
+            latencies = self.timed_queries(self.requests, repeat=True)
+            hits = cache.results.hits - hits_before
+
+            # Batched with a larger top_k: each request is cached under its own top_k
+            small = self.server.batcher.submit("cache small k", 2)
+            self.server.batcher.submit("cache large k", 7).result(10)
+            per_k = self.retriever.cached("cache small k", 2) == small.result(10)
+
+            manifest = IndexManifest(manifest_file, settings={})
+            manifest.bump_version()
+            manifest.save()
+            conn = self.connect()
+            misses_before = cache.results.misses
+            self.post(conn, QUERIES[0])
+            conn.close()
+            invalidated = cache.invalidations == 1 and cache.results.misses == misses_before + 1
+
+        if hits != self.requests or not per_k or not invalidated:
+            print(f"❌ TEST 4 FAILED: {hits}/{self.requests} cache hits, cached per top_k: {per_k}, "
+                  f"invalidated on re-index: {invalidated}")
+            return False
+        print(f"✅ TEST 4 PASSED: {self.requests} repeated questions all cached "
+              f"({self.summary(latencies)}), re-index invalidated the results")
+        print(f"   Cache: {json.dumps(cache.stats())}")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print(f"RETRIEVAL SERVER LATENCY TEST ({self.retriever.collection.count()} chunks)")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_results_match(),
+                self.test_sequential(),
+                self.test_concurrent(),
+                self.test_cache(),
+            ])
+        finally:
+            self.server.shutdown()
+
+
+def main():
+    project_root = Path(__file__).parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="Retrieval server latency test")
+    parser.add_argument('--vector-db', default=str(project_root / "chatbot" / "vector_db"))
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    tester = RetrieverLatencyTester(args.vector_db, args.requests, args.clients)
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,25 +12,96 @@ Example:
     python scripts/03_screen_papers.py \
         --project projects/2025-10-13_AI-Chatbots \
         --question "How do AI chatbots improve speaking skills in language learning?"
+
+    # Bulk screening through the Message Batches API (resumable)
+    python scripts/03_screen_papers.py \
+        --project projects/2025-10-13_AI-Chatbots \
+        --question "How do AI chatbots improve speaking skills in language learning?" \
+        --backend batch
+
+    # Concurrent screening (8 requests in flight, rate limited)
+    python scripts/03_screen_papers.py \
+        --project projects/2025-10-13_AI-Chatbots \
+        --question "How do AI chatbots improve speaking skills in language learning?" \
+        --concurrency 8 --requests-per-minute 50 --tokens-per-minute 40000
+
+    # Pack 4 papers per request (malformed items fall back to single-paper calls)
+    python scripts/03_screen_papers.py \
+        --project projects/2025-10-13_AI-Chatbots \
+        --question "How do AI chatbots improve speaking skills in language learning?" \
+        --pack-size 4
+
+Papers are read from and results written to the project store
+(data/store/, see project_store.py); the CSV files in data/02_screening/
+are exported as a view unless --no-csv is given.
 """
 
 import argparse
+import asyncio
+import contextlib
+import json
+from collections import Counter
 import pandas as pd
 import sys
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import anthropic
 import time
 from dotenv import load_dotenv
 import yaml
 
+from batch_screening import BatchScreener
+from evidence_grounding import ground_quotes
+from paper_ids import assign_paper_ids
+from progress_journal import ProgressJournal
+from project_store import ProjectStore
+from rate_limiter import AsyncRateLimiter
+from retry_policy import (AdaptiveConcurrency, CircuitBreaker, RetryPolicy,
+                          create_message, create_message_async)
+from response_parser import (FIELD_HINTS, ParsedResult, extract_json, merge_repair,
+                             parse_screening_result, validate_result)
+from response_cache import ResponseCache
+from rubric_prescreener import RubricPrescreener
+
 
 class PaperScreener:
     """AI-assisted screening of papers for relevance"""
 
-    def __init__(self, project_path: str, research_question: str):
+    model = "claude-3-5-sonnet-20241022"
+    max_tokens = 1000  # Increased for detailed evidence quotes
+    grounding_threshold = 0.85  # Fraction of quote tokens that must align with the abstract
+
+    # CSV view per zone (3-Zone Model): decision -> (file, label)
+    zone_views = {
+        'auto-include': ("auto_included.csv", "Auto-included papers"),  # Zone 2, high confidence
+        'auto-exclude': ("auto_excluded.csv", "Auto-excluded papers"),  # Zone 2, high confidence
+        'human-review': ("human_review_queue.csv", "Human review queue"),  # Zone 3, medium confidence
+    }
+
+    def __init__(self, project_path: str, research_question: str,
+                 client=None, async_client=None, cache: ResponseCache = None,
+                 csv_views: bool = True, offline: bool = False):
+        """
+        Args:
+            project_path: Path to project directory
+            research_question: Research question for screening
+            client: Optional Anthropic-compatible client (e.g. a local stub)
+            async_client: Optional async client used with concurrency > 1
+            cache: Optional response cache shared across runs and projects
+            csv_views: Also export results as CSV files (the store is always written)
+            offline: No API client, for merging and saving results decided elsewhere
+                (e.g. active_learning.py)
+        """
         self.project_path = Path(project_path)
+        self.store = ProjectStore(project_path, csv_views=csv_views)
+        self.cache = cache
+        self._rubric_prompt = None
+        self.usage = Counter()
+        self.parse_stats = Counter()
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.concurrency_gate = None
         self.research_question = research_question
         self.input_dir = self.project_path / "data" / "01_identification"
         self.output_dir = self.project_path / "data" / "02_screening"
@@ -39,15 +110,21 @@ class PaperScreener:
         # Load project config
         self.load_config()
 
-        # Load API key
-        load_dotenv()
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            print("❌ Error: ANTHROPIC_API_KEY not found in environment")
-            print("   Add to .env file: ANTHROPIC_API_KEY=sk-ant-api03-xxxxx")
-            sys.exit(1)
+        # Injected clients (stubs/tests) skip API key loading entirely
+        if client is None and async_client is None and not offline:
+            load_dotenv()
+            api_key = os.getenv('ANTHROPIC_API_KEY')
+            if not api_key:
+                print("❌ Error: ANTHROPIC_API_KEY not found in environment")
+                print("   Add to .env file: ANTHROPIC_API_KEY=sk-ant-api03-xxxxx")
+                sys.exit(1)
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+            # Retries are scheduled by RetryPolicy/CircuitBreaker, not the SDK
+            client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+            async_client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+
+        self.client = client
+        self.async_client = async_client
 
     def load_config(self):
         """Load project configuration and set screening parameters based on project_type"""
@@ -80,6 +157,28 @@ class PaperScreener:
 
     def build_prisma_prompt(self, title: str, abstract: str) -> str:
         """Build AI-PRISMA scoring prompt with 6-dimension rubric"""
+        return self.rubric_prompt + "\n\n" + self.build_paper_prompt(title, abstract)
+
+    def build_paper_prompt(self, title: str, abstract: str) -> str:
+        """Per-paper part of the prompt (the only text that changes between requests)"""
+        return f"""Paper Title: {title}
+
+Abstract: {abstract}"""
+
+    @property
+    def rubric_prompt(self) -> str:
+        """
+        Static rubric part of the prompt, compiled once per run
+
+        Sent as a cacheable system block so only the paper text is billed at
+        the full input rate after the first request.
+        """
+        if self._rubric_prompt is None:
+            self._rubric_prompt = self.compile_rubric_prompt()
+        return self._rubric_prompt
+
+    def compile_rubric_prompt(self) -> str:
+        """Render the research question, rubric, requirements and decision rules"""
 
         rubric = self.config.get('ai_prisma_rubric', {}).get('scoring_rubric', {})
 
@@ -99,12 +198,8 @@ class PaperScreener:
 
 Research Question: {self.research_question}
 
-Paper Title: {title}
-
-Abstract: {abstract}
-
 ═══════════════════════════════════════════════════════════════════
-TASK: Evaluate this paper using the 6-dimension scoring rubric based on PICO framework.
+TASK: Evaluate the paper (title and abstract) given after this rubric using the 6-dimension scoring rubric based on PICO framework.
 ═══════════════════════════════════════════════════════════════════
 
 SCORING RUBRIC:
@@ -195,13 +290,16 @@ DECISION RULES:
 """
         return prompt
 
-    def validate_evidence_grounding(self, quotes: List[str], abstract: str) -> bool:
+    def validate_evidence_grounding(self, quotes: List[str], abstract: str,
+                                    matches: list = None) -> bool:
         """
         Validate that AI evidence quotes are actually in the abstract
 
         Args:
             quotes: List of quoted evidence from AI
             abstract: Original paper abstract
+            matches: Optional list that receives per-quote QuoteMatch results
+                     (score and character offsets into the abstract)
 
         Returns:
             True if all quotes are grounded, False if hallucination detected
@@ -209,12 +307,19 @@ DECISION RULES:
         if not quotes:
             return True  # No quotes to validate
 
-        for quote in quotes:
-            # Check if quote exists in abstract (case-insensitive, ignore punctuation)
-            if quote.lower().strip() not in abstract.lower():
-                print(f"   ⚠️  Hallucination detected: \"{quote[:50]}...\"")
-                return False
-        return True
+        # Case- and punctuation-insensitive fuzzy match against an abstract
+        # that is normalized and shingle-indexed once for all quotes
+        quote_matches = ground_quotes(quotes, abstract, self.grounding_threshold)
+        if matches is not None:
+            matches.extend(quote_matches)
+
+        grounded = True
+        for match in quote_matches:
+            if not match.grounded:
+                print(f"   ⚠️  Hallucination detected: \"{match.quote[:50]}...\" "
+                      f"(match: {match.score:.0%})")
+                grounded = False
+        return grounded
 
     def determine_decision(self, confidence: int, total_score: int) -> str:
         """
@@ -248,13 +353,17 @@ DECISION RULES:
         """
         print("\n📂 Loading deduplicated papers...")
 
-        dedup_file = self.input_dir / "deduplicated.csv"
-        if not dedup_file.exists():
-            print(f"❌ Error: Deduplicated file not found: {dedup_file}")
+        df = self.store.read('papers')
+        if df is None:
+            print(f"❌ Error: Deduplicated file not found: {self.store.csv_file('papers')}")
             print("   Run deduplication first: python scripts/02_deduplicate.py")
             sys.exit(1)
 
-        df = pd.read_csv(dedup_file)
+        with_ids = assign_paper_ids(df)
+        if with_ids is not df:
+            # Store the IDs once, so later stages join on them without re-deriving
+            df = with_ids
+            self.store.write('papers', df, export=False)
         print(f"   ✓ Loaded {len(df)} papers")
 
         return df
@@ -270,73 +379,502 @@ DECISION RULES:
         Returns:
             Dictionary with scores, decision, and evidence
         """
-        if pd.isna(abstract) or not abstract or abstract.strip() == "":
-            return {
-                'scores': {
-                    'domain': 0,
-                    'intervention': 0,
-                    'method': 0,
-                    'outcomes': 0,
-                    'exclusion': 0,
-                    'title_bonus': 0
-                },
-                'total_score': 0,
-                'confidence': 0,
-                'decision': 'auto-exclude',
-                'reasoning': 'No abstract available for screening',
-                'evidence_quotes': []
-            }
-
-        # Build AI-PRISMA prompt
-        prompt = self.build_prisma_prompt(title, abstract)
+        if not self.has_abstract(abstract):
+            return self.no_abstract_result()
+
+        request = self.build_request(title, abstract)
+        cached = self.cached_result(request, abstract)
+        if cached is not None:
+            return cached
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1000,  # Increased for detailed evidence quotes
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self.call_api(request)
+            return self.process_response(response, abstract, request)
+
+        except Exception as e:
+            print(f"   ⚠️  API Error: {e}")
+            return self.error_result(e)
+
+    async def screen_paper_async(self, title: str, abstract: str,
+                                 limiter: AsyncRateLimiter) -> Dict[str, any]:
+        """
+        Async variant of screen_paper used by the concurrent screening mode
+
+        Args:
+            title: Paper title
+            abstract: Paper abstract
+            limiter: Shared requests/minute + tokens/minute limiter
 
-            result_text = response.content[0].text.strip()
+        Returns:
+            Dictionary with scores, decision, and evidence
+        """
+        if not self.has_abstract(abstract):
+            return self.no_abstract_result()
 
-            # Parse JSON response
-            import json
-            result = json.loads(result_text)
+        request = self.build_request(title, abstract)
+        cached = self.cached_result(request, abstract)
+        if cached is not None:
+            return cached
 
-            # Validate evidence grounding
-            if not self.validate_evidence_grounding(result.get('evidence_quotes', []), abstract):
-                print(f"   ⚠️  WARNING: Hallucination detected in evidence quotes")
-                result['confidence'] = max(0, result['confidence'] - 20)  # Penalty
+        estimated_tokens = self.estimate_tokens(request)
+
+        try:
+            await limiter.acquire(estimated_tokens)
+            response = await self.call_api_async(request)
 
-            # Apply decision rules based on confidence and score
-            result['decision'] = self.determine_decision(
-                result['confidence'],
-                result['total_score']
-            )
+            usage = getattr(response, 'usage', None)
+            if usage is not None:
+                limiter.settle(estimated_tokens, usage.input_tokens + usage.output_tokens)
 
-            return result
+            return await self.process_response_async(response, abstract, request)
 
         except Exception as e:
             print(f"   ⚠️  API Error: {e}")
-            return {
-                'scores': {'domain': 0, 'intervention': 0, 'method': 0,
-                          'outcomes': 0, 'exclusion': 0, 'title_bonus': 0},
-                'total_score': 0,
-                'confidence': 0,
-                'decision': 'error',
-                'reasoning': str(e),
-                'evidence_quotes': []
-            }
-
-    def screen_all_papers(self, df: pd.DataFrame, batch_size: int = 50) -> pd.DataFrame:
+            return self.error_result(e)
+
+    def call_api(self, request: Dict[str, any]):
+        """
+        Send a Messages API request, retrying transient errors
+
+        429/529/5xx and connection errors are retried with jittered
+        exponential backoff (honouring retry-after) while the circuit breaker
+        is closed; anything else, or the last failed attempt, is raised.
+        """
+        for attempt in range(self.retry_policy.max_retries + 1):
+            self.breaker.wait_sync()
+            try:
+                response, _ = create_message(self.client, request)
+            except Exception as e:
+                if not self.retry_policy.is_retryable(e) or attempt == self.retry_policy.max_retries:
+                    raise
+                delay = self.record_retry(e, attempt)
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return response
+
+    async def call_api_async(self, request: Dict[str, any]):
+        """Async variant of call_api; also feeds the adaptive concurrency gate"""
+        for attempt in range(self.retry_policy.max_retries + 1):
+            await self.breaker.wait()
+            try:
+                if self.concurrency_gate is not None:
+                    async with self.concurrency_gate:
+                        response, headers = await create_message_async(self.async_client, request)
+                else:
+                    response, headers = await create_message_async(self.async_client, request)
+            except Exception as e:
+                if not self.retry_policy.is_retryable(e) or attempt == self.retry_policy.max_retries:
+                    raise
+                delay = self.record_retry(e, attempt)
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            if self.concurrency_gate is not None:
+                self.concurrency_gate.on_success(headers)
+            return response
+
+    def record_retry(self, error: Exception, attempt: int) -> float:
+        """Count a retryable failure and return the backoff before the next attempt"""
+        delay = self.retry_policy.delay(attempt, error)
+        self.usage['retries'] += 1
+        self.breaker.record_failure(delay)
+        if self.concurrency_gate is not None and self.retry_policy.is_rate_limit(error):
+            self.concurrency_gate.on_rate_limited()
+
+        status = getattr(error, 'status_code', None) or type(error).__name__
+        print(f"   ↻ {status}: retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+        return delay
+
+    def has_abstract(self, abstract) -> bool:
+        """Check whether a paper has a non-empty abstract to screen"""
+        return not (pd.isna(abstract) or not abstract or abstract.strip() == "")
+
+    def build_request(self, title: str, abstract: str) -> Dict[str, any]:
+        """
+        Build keyword arguments for client.messages.create
+
+        The static rubric is a system block marked for prompt caching; the
+        paper is the only variable suffix.
+        """
+        return {
+            'model': self.model,
+            'max_tokens': self.max_tokens,
+            'system': [
+                {
+                    "type": "text",
+                    "text": self.rubric_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            'messages': [
+                {"role": "user", "content": self.build_paper_prompt(title, abstract)}
+            ]
+        }
+
+    def request_prompt(self, request: Dict[str, any]) -> str:
+        """Full prompt text of a request (system blocks + messages)"""
+        system = "".join(block['text'] for block in request.get('system', []))
+        return system + "".join(m['content'] for m in request['messages'])
+
+    def estimate_tokens(self, request: Dict[str, any]) -> int:
+        """Rough token estimate (≈4 characters per token) for rate limiting"""
+        return len(self.request_prompt(request)) // 4 + request['max_tokens']
+
+    def cache_key(self, request: Dict[str, any]) -> str:
+        """Response cache key for a request: (model, full prompt, max_tokens)"""
+        return ResponseCache.key(request['model'], self.request_prompt(request),
+                                 request['max_tokens'])
+
+    def record_usage(self, response):
+        """Accumulate input/output token usage, split by prompt-cache status"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        self.usage['requests'] += 1
+        self.usage['uncached_input_tokens'] += getattr(usage, 'input_tokens', 0) or 0
+        self.usage['cache_write_tokens'] += getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        self.usage['cache_read_tokens'] += getattr(usage, 'cache_read_input_tokens', 0) or 0
+        self.usage['output_tokens'] += getattr(usage, 'output_tokens', 0) or 0
+
+    def print_usage_stats(self):
+        """Print token usage for the run, including prompt-cache reads/writes"""
+        if not self.usage['requests']:
+            return
+        total_input = (self.usage['uncached_input_tokens'] + self.usage['cache_write_tokens']
+                       + self.usage['cache_read_tokens'])
+        cached_share = self.usage['cache_read_tokens'] / total_input * 100 if total_input else 0.0
+        print(f"\n🧾 Token usage ({self.usage['requests']} API responses):")
+        print(f"   Input (uncached):    {self.usage['uncached_input_tokens']:,}")
+        print(f"   Input (cache write): {self.usage['cache_write_tokens']:,}")
+        print(f"   Input (cache read):  {self.usage['cache_read_tokens']:,} ({cached_share:.1f}% of input)")
+        print(f"   Output:              {self.usage['output_tokens']:,}")
+        if self.usage['retries']:
+            print(f"   Retries: {self.usage['retries']} (circuit breaker opened {self.breaker.trips} times)")
+        if self.usage['packed_requests']:
+            print(f"   Packed: {self.usage['packed_papers']} papers in {self.usage['packed_requests']} "
+                  f"requests, {self.usage['packed_fallbacks']} single-paper fallbacks")
+
+    def print_parse_stats(self):
+        """Print how many responses parsed cleanly, were recovered or failed"""
+        responses = self.parse_stats['responses']
+        if not responses:
+            return
+        initial = self.parse_stats['repair_requests'] + self.parse_stats['unrepairable']
+        print(f"\n🧩 Response parsing ({responses} responses):")
+        print(f"   Recovered locally (prose/fence/truncation): {self.parse_stats['recovered']}")
+        print(f"   Repaired by field-level retry: {self.parse_stats['repaired']}"
+              f" of {self.parse_stats['repair_requests']}")
+        print(f"   Parse failure rate: {initial / responses * 100:.1f}% before retry, "
+              f"{self.parse_stats['failed'] / responses * 100:.1f}% after")
+
+    def cached_result(self, request: Dict[str, any], abstract: str):
+        """Return a processed result from the response cache, or None on a miss"""
+        if self.cache is None:
+            return None
+
+        result_text = self.cache.get(self.cache_key(request))
+        if result_text is None:
+            return None
+
+        parsed = parse_screening_result(result_text)
+        if not parsed.ok:
+            return None
+        return self.apply_decision_rules(parsed.result, abstract)
+
+    def process_response(self, response, abstract: str,
+                         request: Dict[str, any] = None) -> Dict[str, any]:
+        """
+        Parse a Messages API response and apply grounding + decision rules
+
+        Fields that fail schema validation are requested again in a short
+        follow-up call. Results are cached only once they validate, so
+        malformed responses are retried on the next run instead of replayed.
+        """
+        parsed = self.parse_response(response)
+        repair = self.build_repair_request(request, response, parsed)
+        if repair is not None:
+            parsed = self.apply_repair(parsed, self.call_api(repair))
+        return self.finish_result(parsed, abstract, request)
+
+    async def process_response_async(self, response, abstract: str,
+                                     request: Dict[str, any] = None) -> Dict[str, any]:
+        """Async variant of process_response used by the concurrent mode"""
+        parsed = self.parse_response(response)
+        repair = self.build_repair_request(request, response, parsed)
+        if repair is not None:
+            parsed = self.apply_repair(parsed, await self.call_api_async(repair))
+        return self.finish_result(parsed, abstract, request)
+
+    def parse_response(self, response) -> ParsedResult:
+        """Extract and validate the JSON result of one API response"""
+        self.record_usage(response)
+        parsed = parse_screening_result(response.content[0].text)
+        self.parse_stats['responses'] += 1
+        self.parse_stats['recovered'] += parsed.ok and parsed.recovered
+        return parsed
+
+    def build_repair_request(self, request: Dict[str, any], response,
+                             parsed: ParsedResult):
+        """
+        Follow-up request asking only for the fields that failed validation
+
+        Returns None when the result is valid or there is no original request
+        to continue (the caller then reports the failure).
+        """
+        if parsed.ok:
+            return None
+        if request is None:
+            self.parse_stats['unrepairable'] += 1
+            return None
+        self.parse_stats['repair_requests'] += 1
+
+        problems = "; ".join(f"{name}: {reason}" for name, reason in parsed.problems.items())
+        if parsed.result is None:
+            instruction = "Reply with only the complete JSON object in the format above, no other text."
+            max_tokens = request['max_tokens']
+        else:
+            fields = ", ".join(f'"{name}": {FIELD_HINTS[name]}' for name in parsed.problems)
+            instruction = f"Reply with only a JSON object containing these fields: {{{fields}}}"
+            max_tokens = 200
+
+        repair = dict(request)
+        repair['max_tokens'] = max_tokens
+        repair['messages'] = request['messages'] + [
+            {"role": "assistant", "content": response.content[0].text.strip() or "{}"},
+            {"role": "user", "content": f"Your response could not be used ({problems}). {instruction}"}
+        ]
+        return repair
+
+    def apply_repair(self, parsed: ParsedResult, repair_response) -> ParsedResult:
+        """Merge the re-sent fields into the partial result"""
+        self.record_usage(repair_response)
+        repaired = merge_repair(parsed, repair_response.content[0].text)
+        self.parse_stats['repaired'] += repaired.ok
+        return repaired
+
+    def finish_result(self, parsed: ParsedResult, abstract: str,
+                      request: Dict[str, any] = None) -> Dict[str, any]:
+        """Cache a validated result and apply decision rules; raise if still invalid"""
+        if not parsed.ok:
+            self.parse_stats['failed'] += 1
+            raise ValueError(f"Malformed screening response: {parsed.problems}")
+
+        if self.cache is not None and request is not None:
+            self.cache.put(self.cache_key(request), json.dumps(parsed.result))
+
+        return self.apply_decision_rules(parsed.result, abstract)
+
+    def apply_decision_rules(self, result: Dict[str, any], abstract: str) -> Dict[str, any]:
+        """Apply evidence grounding penalty and decision rules to a parsed result"""
+        # Validate evidence grounding
+        matches = []
+        if not self.validate_evidence_grounding(result.get('evidence_quotes', []), abstract, matches):
+            print(f"   ⚠️  WARNING: Hallucination detected in evidence quotes")
+            result['confidence'] = max(0, result['confidence'] - 20)  # Penalty
+        result['evidence_matches'] = [
+            {'quote': m.quote, 'score': round(m.score, 3), 'start': m.start, 'end': m.end}
+            for m in matches
+        ]
+
+        # Apply decision rules based on confidence and score
+        result['decision'] = self.determine_decision(
+            result['confidence'],
+            result['total_score']
+        )
+
+        return result
+
+    def build_packed_request(self, papers: List[Tuple[str, str]]) -> Dict[str, any]:
+        """
+        Build a request that screens several papers at once
+
+        The cached rubric system block is shared with single-paper requests;
+        the user message lists the papers and asks for a JSON array.
+
+        Args:
+            papers: List of (title, abstract) tuples
+        """
+        paper_blocks = "\n\n".join(
+            f"[Paper {i}]\n{self.build_paper_prompt(title, abstract)}"
+            for i, (title, abstract) in enumerate(papers, 1)
+        )
+        content = f"""Evaluate each of the {len(papers)} papers below independently using the rubric above.
+
+Respond with a JSON array containing exactly one object per paper, in the same order.
+Each object uses the JSON format above plus a "paper_index" field (1-{len(papers)}) naming the paper it scores.
+Evidence quotes must come from that paper's own abstract.
+
+{paper_blocks}"""
+
+        request = self.build_request('', '')
+        request['max_tokens'] = self.max_tokens * len(papers)
+        request['messages'] = [{"role": "user", "content": content}]
+        return request
+
+    def split_packed_response(self, response, papers: List[Tuple[str, str]]) -> Dict[int, Dict]:
+        """
+        Split a packed response into per-paper results
+
+        Valid items are cached under their single-paper request key.
+
+        Returns:
+            Results keyed by 0-based paper position; papers whose item is
+            missing or malformed are left out so the caller can fall back
+        """
+        self.record_usage(response)
+        items, _ = extract_json(response.content[0].text)
+        if not isinstance(items, list):
+            return {}
+
+        results = {}
+        for position, item in enumerate(items):
+            if validate_result(item):
+                continue
+            index = item.get('paper_index', position + 1)
+            index = index - 1 if isinstance(index, int) else position
+            if 0 <= index < len(papers) and index not in results:
+                title, abstract = papers[index]
+                # Cache under the single-paper key so either mode can reuse it
+                if self.cache is not None:
+                    self.cache.put(self.cache_key(self.build_request(title, abstract)), json.dumps(item))
+                results[index] = self.apply_decision_rules(item, abstract)
+        return results
+
+    def prepare_pack(self, rows: List[pd.Series]) -> Tuple[list, list]:
+        """
+        Resolve papers that need no API call (no abstract, cached response)
+
+        Returns:
+            (results with None for unresolved papers, positions still to screen)
+        """
+        results = [None] * len(rows)
+        pending = []
+        for i, row in enumerate(rows):
+            if not self.has_abstract(row['abstract']):
+                results[i] = self.no_abstract_result()
+                continue
+            results[i] = self.cached_result(self.build_request(row['title'], row['abstract']),
+                                            row['abstract'])
+            if results[i] is None:
+                pending.append(i)
+        return results, pending
+
+    def screen_papers_packed(self, rows: List[pd.Series]) -> List[Dict[str, any]]:
+        """
+        Screen several papers in one request, falling back to single-paper
+        calls for any paper whose result is missing or fails to parse
+
+        Args:
+            rows: Paper rows with `title` and `abstract`
+
+        Returns:
+            One result per row, in order
+        """
+        results, pending = self.prepare_pack(rows)
+
+        if len(pending) > 1:
+            papers = [(rows[i]['title'], rows[i]['abstract']) for i in pending]
+            try:
+                response = self.call_api(self.build_packed_request(papers))
+                packed = self.split_packed_response(response, papers)
+            except Exception as e:
+                print(f"   ⚠️  API Error (packed request): {e}")
+                packed = {}
+            self.usage['packed_requests'] += 1
+            self.usage['packed_papers'] += len(packed)
+            for j, i in enumerate(pending):
+                results[i] = packed.get(j)
+
+        for i in pending:
+            if results[i] is None:
+                self.usage['packed_fallbacks'] += len(pending) > 1
+                results[i] = self.screen_paper(rows[i]['title'], rows[i]['abstract'])
+
+        return results
+
+    async def screen_papers_packed_async(self, rows: List[pd.Series],
+                                         limiter: AsyncRateLimiter) -> List[Dict[str, any]]:
+        """Async variant of screen_papers_packed used by the concurrent mode"""
+        results, pending = self.prepare_pack(rows)
+
+        if len(pending) > 1:
+            papers = [(rows[i]['title'], rows[i]['abstract']) for i in pending]
+            request = self.build_packed_request(papers)
+            estimated_tokens = self.estimate_tokens(request)
+            try:
+                await limiter.acquire(estimated_tokens)
+                response = await self.call_api_async(request)
+                usage = getattr(response, 'usage', None)
+                if usage is not None:
+                    limiter.settle(estimated_tokens, usage.input_tokens + usage.output_tokens)
+                packed = self.split_packed_response(response, papers)
+            except Exception as e:
+                print(f"   ⚠️  API Error (packed request): {e}")
+                packed = {}
+            self.usage['packed_requests'] += 1
+            self.usage['packed_papers'] += len(packed)
+            for j, i in enumerate(pending):
+                results[i] = packed.get(j)
+
+        for i in pending:
+            if results[i] is None:
+                self.usage['packed_fallbacks'] += len(pending) > 1
+                results[i] = await self.screen_paper_async(rows[i]['title'], rows[i]['abstract'], limiter)
+
+        return results
+
+    def no_abstract_result(self) -> Dict[str, any]:
+        """Result for papers without an abstract (excluded without an API call)"""
+        return {
+            'scores': {
+                'domain': 0,
+                'intervention': 0,
+                'method': 0,
+                'outcomes': 0,
+                'exclusion': 0,
+                'title_bonus': 0
+            },
+            'total_score': 0,
+            'confidence': 0,
+            'decision': 'auto-exclude',
+            'reasoning': 'No abstract available for screening',
+            'evidence_quotes': []
+        }
+
+    def error_result(self, error: Exception) -> Dict[str, any]:
+        """Result recorded when the API call or response parsing fails"""
+        return {
+            'scores': {'domain': 0, 'intervention': 0, 'method': 0,
+                      'outcomes': 0, 'exclusion': 0, 'title_bonus': 0},
+            'total_score': 0,
+            'confidence': 0,
+            'decision': 'error',
+            'reasoning': str(error),
+            'evidence_quotes': []
+        }
+
+    def screen_all_papers(self, df: pd.DataFrame, batch_size: int = 50,
+                          concurrency: int = 1, requests_per_minute: int = 50,
+                          tokens_per_minute: int = 40000, backend: str = 'messages',
+                          poll_interval: int = 60, prescreen: bool = False,
+                          pack_size: int = 1) -> pd.DataFrame:
         """
         Screen all papers with progress tracking
 
         Args:
             df: DataFrame with papers to screen
             batch_size: Save progress every N papers
+            concurrency: Number of API requests in flight (1 = sequential)
+            requests_per_minute: Request rate limit for concurrent mode
+            tokens_per_minute: Token rate limit for concurrent mode
+            backend: 'messages' (interactive) or 'batch' (Message Batches API)
+            poll_interval: Seconds between status checks for the batch backend
+            prescreen: Decide clear rubric exclusions locally, without an API call
+            pack_size: Papers screened per request (messages backend only)
 
         Returns:
             DataFrame with screening results
@@ -346,28 +884,42 @@ DECISION RULES:
         print("="*60)
         print(f"\nResearch Question: {self.research_question}")
         print(f"Total papers to screen: {len(df)}")
-        print(f"Estimated time: {len(df) * 3 / 60:.1f} minutes")
-        print(f"Estimated cost: ${len(df) * 0.01:.2f} (Claude API)")
-
-        # Check if screening already in progress
-        progress_file = self.output_dir / "screening_progress.csv"
-        if progress_file.exists():
-            print(f"\n✓ Found existing progress file")
-            df_progress = pd.read_csv(progress_file)
-            print(f"  Already screened: {len(df_progress)} papers")
+        if backend == 'batch':
+            print(f"Backend: Message Batches API (results typically within 1 hour)")
+            if pack_size > 1:
+                print(f"   ⚠️  --pack-size ignored: batch requests are screened one paper each")
+        elif concurrency > 1:
+            print(f"Concurrency: {concurrency} requests in flight "
+                  f"({requests_per_minute} req/min, {tokens_per_minute} tokens/min)")
+            print(f"Estimated time: {len(df) / min(concurrency * 20, requests_per_minute):.1f} minutes")
+        else:
+            print(f"Estimated time: {len(df) * 3 / 60:.1f} minutes")
+        print(f"Estimated cost: ${len(df) * (0.005 if backend == 'batch' else 0.01):.2f} (Claude API)")
+
+        # Resume from snapshot (screening_progress store table) + append-only journal
+        self.store.refresh('screening_progress')  # Projects screened before the store
+        progress_file = self.store.table_file('screening_progress')
+        journal = ProgressJournal(
+            self.output_dir / "screening_progress.jsonl",
+            progress_file,
+            key='paper_id',
+            fsync_every=batch_size
+        )
+        df_progress = journal.load()
 
-            # Merge with original dataframe
-            df = df.merge(
-                df_progress[['title', 'total_score', 'confidence', 'decision', 'reasoning',
-                            'domain_score', 'intervention_score', 'method_score',
-                            'outcomes_score', 'exclusion_score', 'title_bonus']],
-                on='title',
-                how='left',
-                suffixes=('', '_screened')
-            )
+        if len(df_progress) > 0 and 'paper_id' not in df_progress.columns:
+            # Progress written before paper IDs existed: map titles to IDs once
+            title_to_id = df.drop_duplicates('title').set_index('title')['paper_id']
+            df_progress['paper_id'] = df_progress['title'].map(title_to_id)
+            df_progress = df_progress.dropna(subset=['paper_id'])
+            self.store.write('screening_progress', df_progress, export=False)
+
+        if len(df_progress) > 0:
+            print(f"\n✓ Found existing progress")
+            print(f"  Already screened: {len(df_progress)} papers")
 
             # Continue from where we left off
-            df_to_screen = df[df['decision'].isna()]
+            df_to_screen = df[~df['paper_id'].isin(df_progress['paper_id'])]
             already_screened = len(df) - len(df_to_screen)
             print(f"  Remaining to screen: {len(df_to_screen)}")
         else:
@@ -376,17 +928,19 @@ DECISION RULES:
 
         if len(df_to_screen) == 0:
             print("\n✓ All papers already screened!")
-            return df
+            return self.merge_results(df, self.compact_progress(journal))
 
         print(f"\n⏳ Starting screening...")
 
-        results = []
-        for idx, row in df_to_screen.iterrows():
-            # Screen paper
-            result = self.screen_paper(row['title'], row['abstract'])
+        screened_this_run = 0
+
+        def record_result(row: pd.Series, result: Dict[str, any]):
+            nonlocal screened_this_run
+            screened_this_run += 1
 
-            # Add to results with all scores
-            results.append({
+            # Journal result with all scores as soon as it arrives
+            synced = journal.append({
+                'paper_id': row['paper_id'],
                 'title': row['title'],
                 'domain_score': result['scores']['domain'],
                 'intervention_score': result['scores']['intervention'],
@@ -401,60 +955,205 @@ DECISION RULES:
             })
 
             # Progress indicator
-            screened_count = len(results) + already_screened
+            screened_count = screened_this_run + already_screened
             decision_emoji = {'auto-include': '✅', 'auto-exclude': '⛔', 'human-review': '⚠️', 'error': '❌'}
             emoji = decision_emoji.get(result['decision'], '?')
             print(f"   [{screened_count}/{len(df)}] {row['title'][:50]}... → {emoji} {result['decision']} (score: {result['total_score']}, conf: {result['confidence']}%)")
 
-            # Save progress periodically
-            if len(results) % batch_size == 0:
-                df_batch = pd.DataFrame(results)
-                if already_screened > 0:
-                    # Append to existing progress
-                    df_existing = pd.read_csv(progress_file)
-                    df_batch = pd.concat([df_existing, df_batch], ignore_index=True)
-                df_batch.to_csv(progress_file, index=False)
+            if synced:
                 print(f"   💾 Progress saved ({screened_count}/{len(df)})")
 
-            # Rate limiting
-            time.sleep(1)
-
-        # Save final results
-        df_results = pd.DataFrame(results)
-        if already_screened > 0:
-            df_existing = pd.read_csv(progress_file)
-            df_results = pd.concat([df_existing, df_results], ignore_index=True)
-        df_results.to_csv(progress_file, index=False)
-
-        # Merge with original dataframe
-        df = df.merge(
-            df_results[['title', 'total_score', 'confidence', 'decision', 'reasoning',
-                       'domain_score', 'intervention_score', 'method_score',
-                       'outcomes_score', 'exclusion_score', 'title_bonus']],
-            on='title',
-            how='left',
-            suffixes=('', '_screened')
+        if prescreen:
+            df_to_screen = self.prescreen_papers(df_to_screen, record_result)
+
+        try:
+            if backend == 'batch':
+                BatchScreener(self, poll_interval=poll_interval).run(
+                    df_to_screen, record_result, journal.sync
+                )
+            elif concurrency > 1:
+                asyncio.run(self.screen_concurrently(
+                    df_to_screen, record_result, concurrency,
+                    requests_per_minute, tokens_per_minute, pack_size
+                ))
+            elif pack_size > 1:
+                rows = [row for _, row in df_to_screen.iterrows()]
+                for start in range(0, len(rows), pack_size):
+                    # Screen K papers per request
+                    pack = rows[start:start + pack_size]
+                    for row, result in zip(pack, self.screen_papers_packed(pack)):
+                        record_result(row, result)
+
+                    # Rate limiting
+                    time.sleep(1)
+            else:
+                for idx, row in df_to_screen.iterrows():
+                    # Screen paper
+                    result = self.screen_paper(row['title'], row['abstract'])
+                    record_result(row, result)
+
+                    # Rate limiting
+                    time.sleep(1)
+        finally:
+            journal.close()
+
+        self.print_usage_stats()
+        self.print_parse_stats()
+        if self.cache is not None:
+            self.cache.print_stats()
+
+        df_results = self.compact_progress(journal)
+
+        return self.merge_results(df, df_results)
+
+    def compact_progress(self, journal: ProgressJournal) -> pd.DataFrame:
+        """Compact the progress journal into the screening_progress table (and export its CSV view)"""
+        df_results = journal.compact()
+        if self.store.csv_views:
+            self.store.export_csv('screening_progress', df_results)
+        return df_results
+
+    def prescreen_papers(self, df_to_screen: pd.DataFrame, on_result) -> pd.DataFrame:
+        """
+        Decide clear rubric exclusions locally and return the papers left for Claude
+
+        Args:
+            df_to_screen: Papers still to be screened
+            on_result: Callback taking (row, result) for each locally decided paper
+
+        Returns:
+            Papers that still need an API call
+        """
+        rubric = self.config.get('ai_prisma_rubric', {}).get('scoring_rubric', {})
+        prescreener = RubricPrescreener(rubric)
+        prescores = prescreener.score(df_to_screen)
+        excluded = prescreener.clear_exclusions(prescores)
+
+        for idx, row in df_to_screen[excluded].iterrows():
+            on_result(row, prescreener.to_result(prescores.loc[idx]))
+
+        print(f"\n🧮 Local rubric pre-screen: {excluded.sum()} papers auto-excluded "
+              f"({excluded.sum()} API calls saved, {(~excluded).sum()} sent to Claude)")
+
+        return df_to_screen[~excluded]
+
+    def merge_results(self, df: pd.DataFrame, df_results: pd.DataFrame) -> pd.DataFrame:
+        """Merge screening results back onto the corpus via a paper_id index lookup"""
+        score_columns = ['total_score', 'confidence', 'decision', 'reasoning',
+                         'domain_score', 'intervention_score', 'method_score',
+                         'outcomes_score', 'exclusion_score', 'title_bonus']
+        return df.join(
+            df_results.set_index('paper_id')[score_columns],
+            on='paper_id',
+            rsuffix='_screened'
         )
 
-        return df
+    async def screen_concurrently(self, df_to_screen: pd.DataFrame, on_result,
+                                  concurrency: int, requests_per_minute: int,
+                                  tokens_per_minute: int, pack_size: int = 1):
+        """
+        Screen papers with a fixed pool of async workers
+
+        Results are handed to `on_result` in completion order. Callbacks run on
+        the event loop thread, so progress bookkeeping needs no locking.
+        Requests in flight adapt between 1 and `concurrency` based on
+        rate-limit errors and response headers.
 
-    def save_results(self, df: pd.DataFrame):
+        Args:
+            df_to_screen: Papers still to be screened
+            on_result: Callback taking (row, result) for each finished paper
+            concurrency: Number of workers (maximum requests in flight)
+            requests_per_minute: Request rate limit shared by all workers
+            tokens_per_minute: Token rate limit shared by all workers
+            pack_size: Papers screened per request
+        """
+        limiter = AsyncRateLimiter(requests_per_minute, tokens_per_minute)
+        queue = asyncio.Queue()
+        for _, row in df_to_screen.iterrows():
+            queue.put_nowait(row)
+
+        async def worker():
+            while not queue.empty():
+                if pack_size > 1:
+                    pack = [queue.get_nowait() for _ in range(min(pack_size, queue.qsize()))]
+                    for row, result in zip(pack, await self.screen_papers_packed_async(pack, limiter)):
+                        on_result(row, result)
+                else:
+                    row = queue.get_nowait()
+                    result = await self.screen_paper_async(row['title'], row['abstract'], limiter)
+                    on_result(row, result)
+
+        n_workers = min(concurrency, -(-len(df_to_screen) // pack_size))
+        self.concurrency_gate = AdaptiveConcurrency(n_workers)
+        try:
+            await asyncio.gather(*(worker() for _ in range(n_workers)))
+        finally:
+            gate, self.concurrency_gate = self.concurrency_gate, None
+
+        if gate.lowest < n_workers:
+            print(f"\n🚦 Adaptive concurrency: reduced to {gate.lowest} in flight under rate limits "
+                  f"(ended at {gate.limit}/{n_workers})")
+
+    def save_results(self, df: pd.DataFrame, partition_zones: bool = False):
         """
         Save screening results with AI-PRISMA 3-zone separation
 
+        One groupby pass over `decision` writes each zone straight from its
+        group (CSV view, and store partition with partition_zones) and collects
+        the zone's counts, score statistics and samples along the way.
+
         Args:
             df: DataFrame with screening results
+            partition_zones: Store screened_papers as one file per zone
+                (data/store/screened_papers/decision=<zone>), so later stages
+                load only the zone they need
         """
         print("\n" + "="*60)
         print("📊 AI-PRISMA SCREENING RESULTS")
         print("="*60)
 
-        # Calculate statistics by decision
+        zone_stats = {}
+        samples = {}
+        saved = []
+        writer = (self.store.partition_writer('screened_papers', 'decision')
+                  if partition_zones else contextlib.nullcontext())
+        with writer:
+            for decision, zone in df.groupby('decision', sort=False, dropna=False):
+                scores = zone['total_score']
+                zone_stats[decision] = {'papers': len(zone), 'scored': scores.count(),
+                                        'sum': scores.sum(), 'mean': scores.mean(),
+                                        'min': scores.min(), 'max': scores.max()}
+                samples[decision] = zone.head(2)
+
+                view = self.zone_views.get(decision)
+                if view and self.store.csv_views:
+                    zone.to_csv(self.output_dir / view[0], index=False)
+                    saved.append((view[1], self.output_dir / view[0]))
+                if partition_zones:
+                    writer.write(decision, zone)
+
+        # Empty zones still get a (header-only) view, replacing last run's file
+        if self.store.csv_views:
+            for decision, (file_name, label) in self.zone_views.items():
+                if decision not in zone_stats:
+                    df.head(0).to_csv(self.output_dir / file_name, index=False)
+                    saved.append((label, self.output_dir / file_name))
+
+        # All papers with full details, keyed by paper_id; zones are rows of this table
+        if not partition_zones:
+            self.store.write('screened_papers', df, export=False)
+        saved.insert(0, ("All papers with AI-PRISMA scores", self.store.table_file('screened_papers')))
+        if self.store.csv_views:
+            saved.append(("All papers (CSV)", self.store.export_csv('screened_papers', df)))
+
+        # Statistics by decision
         total = len(df)
-        auto_included = (df['decision'] == 'auto-include').sum()
-        auto_excluded = (df['decision'] == 'auto-exclude').sum()
-        human_review = (df['decision'] == 'human-review').sum()
-        errors = (df['decision'] == 'error').sum()
+        zone_stats = pd.DataFrame.from_dict(zone_stats, orient='index')
+        counts = zone_stats['papers']
+        auto_included = counts.get('auto-include', 0)
+        auto_excluded = counts.get('auto-exclude', 0)
+        human_review = counts.get('human-review', 0)
+        errors = counts.get('error', 0)
 
         print(f"\nTotal papers: {total}")
         print(f"✅ Auto-include (≥{self.screening_threshold}% confidence): {auto_included} ({auto_included/total*100:.1f}%)")
@@ -463,43 +1162,24 @@ DECISION RULES:
         if errors > 0:
             print(f"❌ Errors: {errors} ({errors/total*100:.1f}%)")
 
-        # Score distribution
+        # Score distribution (overall median is the only figure not derived from the zones)
         print(f"\nTotal Score Distribution:")
-        print(f"  Mean: {df['total_score'].mean():.1f}")
+        print(f"  Mean: {zone_stats['sum'].sum() / zone_stats['scored'].sum():.1f}")
         print(f"  Median: {df['total_score'].median():.1f}")
-        print(f"  Range: {df['total_score'].min():.0f} to {df['total_score'].max():.0f}")
-
-        # Save by decision type (3-Zone Model)
+        print(f"  Range: {zone_stats['min'].min():.0f} to {zone_stats['max'].max():.0f}")
+        for decision, stats in zone_stats.iterrows():
+            print(f"  {decision}: mean {stats['mean']:.1f}, range {stats['min']:.0f} to {stats['max']:.0f}")
 
-        # Zone 2: Auto-include (high confidence)
-        df_auto_include = df[df['decision'] == 'auto-include'].copy()
-        auto_include_file = self.output_dir / "auto_included.csv"
-        df_auto_include.to_csv(auto_include_file, index=False)
-        print(f"\n💾 Auto-included papers: {auto_include_file}")
-
-        # Zone 2: Auto-exclude (high confidence)
-        df_auto_exclude = df[df['decision'] == 'auto-exclude'].copy()
-        auto_exclude_file = self.output_dir / "auto_excluded.csv"
-        df_auto_exclude.to_csv(auto_exclude_file, index=False)
-        print(f"💾 Auto-excluded papers: {auto_exclude_file}")
-
-        # Zone 3: Human review queue (medium confidence)
-        df_human_review = df[df['decision'] == 'human-review'].copy()
-        human_review_file = self.output_dir / "human_review_queue.csv"
-        df_human_review.to_csv(human_review_file, index=False)
-        print(f"💾 Human review queue: {human_review_file}")
-
-        # Save all with full details
-        all_file = self.output_dir / "all_screened_papers.csv"
-        df.to_csv(all_file, index=False)
-        print(f"💾 All papers with AI-PRISMA scores: {all_file}")
+        print()
+        for label, path in saved:
+            print(f"💾 {label}: {path}")
 
         print("="*60)
 
         # Show samples from each zone
         if auto_included > 0:
             print("\n📋 Sample Auto-Included Papers:")
-            for idx, row in df_auto_include.head(2).iterrows():
+            for idx, row in samples['auto-include'].iterrows():
                 print(f"\n  • {row['title'][:70]}...")
                 print(f"    Total Score: {row['total_score']:.0f} | Confidence: {row['confidence']:.0f}%")
                 print(f"    Scores: D={row['domain_score']:.0f} I={row['intervention_score']:.0f} M={row['method_score']:.0f} O={row['outcomes_score']:.0f} E={row['exclusion_score']:.0f} TB={row['title_bonus']:.0f}")
@@ -507,7 +1187,7 @@ DECISION RULES:
 
         if human_review > 0:
             print("\n📋 Sample Human Review Queue:")
-            for idx, row in df_human_review.head(2).iterrows():
+            for idx, row in samples['human-review'].iterrows():
                 print(f"\n  • {row['title'][:70]}...")
                 print(f"    Total Score: {row['total_score']:.0f} | Confidence: {row['confidence']:.0f}%")
                 print(f"    Scores: D={row['domain_score']:.0f} I={row['intervention_score']:.0f} M={row['method_score']:.0f} O={row['outcomes_score']:.0f} E={row['exclusion_score']:.0f} TB={row['title_bonus']:.0f}")
@@ -515,7 +1195,7 @@ DECISION RULES:
 
         if auto_excluded > 0:
             print("\n📋 Sample Auto-Excluded Papers:")
-            for idx, row in df_auto_exclude.head(2).iterrows():
+            for idx, row in samples['auto-exclude'].iterrows():
                 print(f"\n  • {row['title'][:70]}...")
                 print(f"    Total Score: {row['total_score']:.0f} | Confidence: {row['confidence']:.0f}%")
                 print(f"    Reasoning: {row['reasoning'][:150]}...")
@@ -526,7 +1206,8 @@ DECISION RULES:
             print("⚠️  HUMAN REVIEW REQUIRED")
             print("="*60)
             print(f"\n{human_review} papers require expert validation.")
-            print(f"See: {human_review_file}")
+            if self.store.csv_views:
+                print(f"See: {self.output_dir / self.zone_views['human-review'][0]}")
             print("\nNext step: Conduct human review and calculate Cohen's Kappa")
             print("   python scripts/03b_human_review.py --project <project_path>")
         else:
@@ -552,7 +1233,86 @@ def main():
         '--batch-size',
         type=int,
         default=50,
-        help='Save progress every N papers (default: 50)'
+        help='fsync the progress journal every N papers (default: 50)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of API requests in flight (default: 1, sequential)'
+    )
+    parser.add_argument(
+        '--requests-per-minute',
+        type=int,
+        default=50,
+        help='Request rate limit when --concurrency > 1 (default: 50)'
+    )
+    parser.add_argument(
+        '--tokens-per-minute',
+        type=int,
+        default=40000,
+        help='Token rate limit when --concurrency > 1 (default: 40000)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['messages', 'batch'],
+        default='messages',
+        help='messages: interactive API; batch: Message Batches API, 50%% cheaper (default: messages)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=int,
+        default=60,
+        help='Seconds between batch status checks with --backend batch (default: 60)'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=6,
+        help='Retries per request on 429/529/5xx/connection errors, with jittered backoff (default: 6)'
+    )
+    parser.add_argument(
+        '--circuit-cooldown',
+        type=float,
+        default=30.0,
+        help='Seconds all workers pause after 5 consecutive API failures (default: 30)'
+    )
+    parser.add_argument(
+        '--pack-size',
+        type=int,
+        default=1,
+        help='Screen K papers per request, with single-paper fallback (default: 1; messages backend only)'
+    )
+    parser.add_argument(
+        '--prescreen',
+        action='store_true',
+        help='Auto-exclude papers hitting -20 exclusion keywords locally, without an API call'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Response cache directory, shared across projects (default: ~/.cache/scholarag/screening)'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=500,
+        help='Evict least recently used cache entries above this size (default: 500)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always call the API, ignoring cached responses'
+    )
+    parser.add_argument(
+        '--no-csv',
+        action='store_true',
+        help='Write results to the project store only, without the CSV view'
+    )
+    parser.add_argument(
+        '--partition-zones',
+        action='store_true',
+        help='Store screened papers as one columnar file per zone (data/store/screened_papers/)'
     )
 
     args = parser.parse_args()
@@ -563,17 +1323,33 @@ def main():
         print(f"❌ Error: Project path does not exist: {project_path}")
         sys.exit(1)
 
+    # Response cache (content-addressed, shared across projects)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, args.cache_max_mb)
+
     # Initialize screener
-    screener = PaperScreener(args.project, args.question)
+    screener = PaperScreener(args.project, args.question, cache=cache,
+                             csv_views=not args.no_csv)
+    screener.retry_policy = RetryPolicy(max_retries=args.max_retries)
+    screener.breaker = CircuitBreaker(cooldown=args.circuit_cooldown)
 
     # Load papers
     df = screener.load_papers()
 
     # Screen papers
-    df = screener.screen_all_papers(df, batch_size=args.batch_size)
+    df = screener.screen_all_papers(
+        df,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        backend=args.backend,
+        poll_interval=args.poll_interval,
+        prescreen=args.prescreen,
+        pack_size=args.pack_size
+    )
 
     # Save results
-    screener.save_results(df)
+    screener.save_results(df, partition_zones=args.partition_zones)
 
 
 if __name__ == '__main__':
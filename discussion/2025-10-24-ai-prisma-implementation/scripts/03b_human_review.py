@@ -18,10 +18,14 @@ Example:
 
 Features:
     - Interactive terminal interface for reviewing borderline papers
+    - Most informative papers first (review_prioritizer.py; --order file
+      keeps queue order)
     - Display AI scores + reasoning + evidence quotes
     - Collect human decisions (include/exclude + reason)
-    - Resume functionality (tracks progress)
-    - Export results to CSV for Cohen's Kappa validation
+    - Resume functionality (append-only decision journal, jumps straight
+      to the next unreviewed paper)
+    - Decisions stored in the project store (data/store/), exported to CSV
+      for Cohen's Kappa validation
 """
 
 import pandas as pd
@@ -31,49 +35,125 @@ import sys
 import os
 from datetime import datetime
 import json
+import yaml
+
+from paper_ids import PAPER_ID_DTYPES, assign_paper_ids
+from progress_journal import ProgressJournal
+from project_store import ProjectStore
+from review_prioritizer import ReviewPrioritizer
 
 
 class HumanReviewer:
     """Interactive human review interface for borderline papers"""
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, csv_views: bool = True, order: str = 'priority'):
+        """
+        Args:
+            project_path: Path to project directory
+            csv_views: Also export decisions as CSV (the store is always written)
+            order: 'priority' (most informative paper next) or 'file' (queue order)
+        """
         self.project_path = Path(project_path)
+        self.store = ProjectStore(project_path, csv_views=csv_views)
+        self.order = order
+        self.active_learning = self.store.read('active_learning', where={'stage': ['human']})
         self.input_dir = self.project_path / "data" / "02_screening"
         self.review_file = self.input_dir / "human_review_queue.csv"
-        self.progress_file = self.input_dir / "human_review_progress.json"
-        self.output_file = self.input_dir / "human_review_decisions.csv"
+        self.progress_file = self.input_dir / "human_review_progress.json"  # Sessions before the journal
+        self.journal_file = self.input_dir / "human_review_decisions.jsonl"
+        self.output_file = self.store.csv_file('human_review_decisions')
 
-        # Validate files exist
-        if not self.review_file.exists():
+        # Validate screening results exist
+        if not self.store.has('screened_papers') and not self.review_file.exists():
             print("❌ Error: Human review queue not found")
-            print(f"   Expected: {self.review_file}")
+            print(f"   Expected: {self.store.table_file('screened_papers')}")
             print("   Run screening first: python scripts/03_screen_papers.py")
             sys.exit(1)
 
+    def load_config(self) -> dict:
+        """Project config.yaml (thresholds and rubric for prioritization), {} if absent"""
+        config_file = self.project_path / "config.yaml"
+        if not config_file.exists():
+            return {}
+        with open(config_file, 'r') as f:
+            return yaml.safe_load(f) or {}
+
+    def build_prioritizer(self, df: pd.DataFrame, results: list,
+                          reviewed_papers: set) -> ReviewPrioritizer:
+        """Prioritizer over the queue, with thresholds already moved by earlier sessions' decisions"""
+        classifier = None
+        if self.active_learning is not None and len(self.active_learning) > 0:
+            # Local model trained on earlier decisions (active_learning.py); papers it didn't score get none
+            probability = self.active_learning.drop_duplicates('paper_id', keep='last') \
+                .set_index('paper_id')['probability']
+            classifier = lambda queue: probability.reindex(queue['paper_id']).to_numpy(dtype=float)
+        prioritizer = ReviewPrioritizer.from_config(df, self.load_config(), classifier)
+        for result in results:
+            prioritizer.record(result['paper_id'], result['human_decision'])
+        prioritizer.remove(reviewed_papers)
+        thresholds = prioritizer.thresholds()
+        print(f"   Order: most informative first (boundary estimates: confidence "
+              f"{thresholds['confidence']}%, total score {thresholds['total_score']})")
+        return prioritizer
+
+    @property
+    def decisions_file(self) -> Path:
+        """Decisions as exported: the CSV view, or the store table with --no-csv"""
+        return self.output_file if self.store.csv_views else self.store.table_file('human_review_decisions')
+
     def load_papers(self) -> pd.DataFrame:
         """Load papers requiring human review"""
-        df = pd.read_csv(self.review_file)
+        # Only the human-review partition is loaded when zones are partitioned
+        df = self.store.read('screened_papers', where={'decision': ['human-review']})
+        if df is None:
+            # Queue exported without the full results
+            df = pd.read_csv(self.review_file, dtype=PAPER_ID_DTYPES)
+        df = assign_paper_ids(df)
+
         print(f"\n📋 Human Review Queue: {len(df)} papers requiring expert validation")
         print("="*70)
         return df
 
-    def load_progress(self) -> dict:
-        """Load review progress if exists"""
+    def open_journal(self) -> ProgressJournal:
+        """Decision journal on top of the human_review_decisions store table"""
+        self.store.refresh('human_review_decisions')  # CSV view edited by hand
+        return ProgressJournal(
+            self.journal_file,
+            self.store.table_file('human_review_decisions'),
+            key='paper_id',
+            fsync_every=1  # One decision per fsync: a crash never loses a reviewer's answer
+        )
+
+    def load_progress(self, decisions: pd.DataFrame, df: pd.DataFrame) -> set:
+        """
+        Reviewed paper IDs if resuming
+
+        Args:
+            decisions: Earlier decisions (snapshot + journal)
+            df: Review queue
+
+        Returns:
+            paper_ids (and pre-paper_id title_year keys) to skip
+        """
+        reviewed = set(decisions['paper_id']) if 'paper_id' in decisions.columns else set()
         if self.progress_file.exists():
             with open(self.progress_file, 'r') as f:
-                progress = json.load(f)
-            print(f"\n✓ Found existing progress: {progress['reviewed_count']}/{progress['total_count']} papers reviewed")
-
-            resume = input("Resume from last session? (y/n): ").lower()
-            if resume == 'y':
-                return progress
-
-        return {'reviewed_papers': [], 'reviewed_count': 0, 'total_count': 0}
-
-    def save_progress(self, progress: dict):
-        """Save current review progress"""
-        with open(self.progress_file, 'w') as f:
-            json.dump(progress, f, indent=2)
+                reviewed |= set(json.load(f).get('reviewed_papers', []))
+        if not reviewed:
+            return set()
+
+        done = int(df['paper_id'].isin(reviewed).sum())
+        print(f"\n✓ Found existing progress: {done}/{len(df)} papers reviewed")
+        resume = input("Resume from last session? (y/n): ").lower()
+        if resume == 'y':
+            return reviewed
+        return set()
+
+    def pending_papers(self, df: pd.DataFrame, reviewed: set) -> pd.Index:
+        """Cursor over the queue: index labels of papers not reviewed yet, in queue order"""
+        legacy_ids = df['title'].astype(str) + '_' + \
+            (df['year'].astype(str) if 'year' in df.columns else 'unknown')  # pre-paper_id sessions
+        return df.index[~(df['paper_id'].isin(reviewed) | legacy_ids.isin(reviewed))]
 
     def display_paper(self, row: pd.Series, idx: int, total: int):
         """Display paper information for review"""
@@ -188,30 +268,36 @@ class HumanReviewer:
 
         # Load papers and progress
         df = self.load_papers()
-        progress = self.load_progress()
-
-        # Track which papers have been reviewed
-        reviewed_papers = set(progress.get('reviewed_papers', []))
-        results = []
+        if len(df) == 0:
+            print("\n✓ No papers left to review")
+            return
 
-        # Load existing decisions if resuming
-        if self.output_file.exists():
-            existing_results = pd.read_csv(self.output_file)
-            results = existing_results.to_dict('records')
+        # Earlier decisions: compacted snapshot + journal of interrupted sessions
+        journal = self.open_journal()
+        existing_results = journal.load()
+        results = existing_results.to_dict('records')
+        if results:
             print(f"   Loaded {len(results)} previous decisions")
 
+        # Track which papers have been reviewed
+        reviewed_papers = self.load_progress(existing_results, df)
+        pending = self.pending_papers(df, reviewed_papers)
+        reviewed_count = len(df) - len(pending)
+
         print(f"\n🎯 Starting review session")
-        print(f"   Papers to review: {len(df) - len(reviewed_papers)}")
-        print(f"   Progress: {len(reviewed_papers)}/{len(df)} ({len(reviewed_papers)/len(df)*100:.1f}%)")
+        print(f"   Papers to review: {len(pending)}")
+        print(f"   Progress: {reviewed_count}/{len(df)} ({reviewed_count/len(df)*100:.1f}%)")
 
-        papers_reviewed_this_session = 0
+        # Review each paper, most informative first (re-ranked after every decision)
+        prioritizer = None
+        if self.order == 'priority' and len(df) > 0:
+            prioritizer = self.build_prioritizer(df, results, set(df['paper_id'].drop(pending)))
 
-        # Review each paper
-        for idx, row in df.iterrows():
-            # Skip already reviewed papers
-            paper_id = f"{row['title']}_{row.get('year', 'unknown')}"
-            if paper_id in reviewed_papers:
-                continue
+        # Only unreviewed papers are visited: resume starts at the first pending one
+        for idx, row in (df.loc[pending].iterrows() if prioritizer is None else prioritizer):
+            paper_id = row['paper_id']
+            if prioritizer is not None:
+                idx = reviewed_count  # Position in review order, not in the queue file
 
             # Display paper
             self.display_paper(row, idx, len(df))
@@ -228,13 +314,7 @@ class HumanReviewer:
                     break
                 elif decision_result['action'] == 'quit':
                     print("\n⚠️  Review interrupted. Progress saved.")
-                    self.save_results(results)
-                    self.save_progress({
-                        'reviewed_papers': list(reviewed_papers),
-                        'reviewed_count': len(reviewed_papers),
-                        'total_count': len(df),
-                        'last_updated': datetime.now().isoformat()
-                    })
+                    self.save_results(journal)
                     return
                 elif decision_result['action'] == 'decide':
                     # Record decision
@@ -258,46 +338,32 @@ class HumanReviewer:
                         'reviewed_at': datetime.now().isoformat()
                     }
 
+                    # One journal line per decision, on disk before the next paper
+                    journal.append(result)
                     results.append(result)
-                    reviewed_papers.add(paper_id)
-                    papers_reviewed_this_session += 1
+                    reviewed_count += 1
+                    if prioritizer is not None:
+                        prioritizer.record(paper_id, decision_result['decision'])
 
                     print(f"✓ Recorded: {decision_result['decision'].upper()} (confidence: {decision_result['confidence']})")
-
-                    # Save progress periodically (every 5 papers)
-                    if papers_reviewed_this_session % 5 == 0:
-                        self.save_results(results)
-                        self.save_progress({
-                            'reviewed_papers': list(reviewed_papers),
-                            'reviewed_count': len(reviewed_papers),
-                            'total_count': len(df),
-                            'last_updated': datetime.now().isoformat()
-                        })
-                        print(f"\n💾 Progress saved ({len(reviewed_papers)}/{len(df)})")
-
                     break
 
         # Save final results
-        self.save_results(results)
-        self.save_progress({
-            'reviewed_papers': list(reviewed_papers),
-            'reviewed_count': len(reviewed_papers),
-            'total_count': len(df),
-            'last_updated': datetime.now().isoformat(),
-            'completed': len(reviewed_papers) == len(df)
-        })
+        self.save_results(journal)
 
         # Display summary
-        self.display_summary(results, df)
+        self.display_summary(pd.DataFrame(results).drop_duplicates('paper_id', keep='last')
+                             .to_dict('records'), df)
 
-    def save_results(self, results: list):
-        """Save review results to CSV"""
-        if not results:
+    def save_results(self, journal: ProgressJournal):
+        """Compact the decision journal into the project store (and export its CSV view)"""
+        df_results = journal.compact()
+        if len(df_results) == 0:
             return
 
-        df_results = pd.DataFrame(results)
-        df_results.to_csv(self.output_file, index=False)
-        print(f"\n💾 Saved {len(results)} decisions to: {self.output_file}")
+        if self.store.csv_views:
+            self.store.export_csv('human_review_decisions', df_results)
+        print(f"\n💾 Saved {len(df_results)} decisions to: {self.decisions_file}")
 
     def display_summary(self, results: list, df_original: pd.DataFrame):
         """Display review session summary"""
@@ -358,7 +424,7 @@ class HumanReviewer:
         print(f"\n📊 Calculate Cohen's Kappa:")
         print(f"   python scripts/validate_human_ai_agreement.py \\")
         print(f"       --ai-decisions {self.input_dir / 'all_screened_papers.csv'} \\")
-        print(f"       --human-decisions {self.output_file} \\")
+        print(f"       --human-decisions {self.decisions_file} \\")
         print(f"       --output {self.input_dir / 'kappa_report.md'}")
 
         print(f"\n📄 Generate PRISMA Diagram:")
@@ -374,6 +440,17 @@ def main():
         required=True,
         help='Path to project directory'
     )
+    parser.add_argument(
+        '--no-csv',
+        action='store_true',
+        help='Write decisions to the project store only, without the CSV view'
+    )
+    parser.add_argument(
+        '--order',
+        choices=['priority', 'file'],
+        default='priority',
+        help='priority: most informative paper next; file: queue order (default: priority)'
+    )
 
     args = parser.parse_args()
 
@@ -384,7 +461,7 @@ def main():
         sys.exit(1)
 
     # Initialize and run reviewer
-    reviewer = HumanReviewer(args.project)
+    reviewer = HumanReviewer(args.project, csv_views=not args.no_csv, order=args.order)
     reviewer.review_papers()
 
     print("\n✨ Human review session complete!")
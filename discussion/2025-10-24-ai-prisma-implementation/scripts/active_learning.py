@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Active-learning screening loop for AI-PRISMA
+
+Human decisions used to be consulted only after the fact, for Cohen's Kappa.
+ActiveLearner trains a local model on everything already decided in the
+project and routes the papers that are still open:
+
+- Labels: human decisions (03b_human_review.py, full weight) and the AI
+  auto-zones (auto-include / auto-exclude, half weight since they are model
+  labels, not ground truth). Human decisions win where both exist.
+- Model: TF-IDF over title + abstract, logistic regression, probabilities
+  calibrated by cross-validation (sigmoid; isotonic with 1000+ labels).
+- Routing: papers not screened yet (or screening errors) and papers waiting
+  in the human review queue are auto-included / auto-excluded when the
+  calibrated confidence reaches --threshold; the rest still go to Claude
+  ("llm") or to a reviewer ("human").
+
+Calibration is checked before anything is decided: the model is
+cross-validated on the labelled papers, and --apply refuses to auto-resolve
+when held-out accuracy on papers above the threshold falls short of it.
+
+With --apply, resolutions become screening results: they are journalled
+into screening_progress (03_screen_papers.py skips them, no API call) and
+screened_papers and its zone views are saved again by 03's own
+save_results, so resolved queue papers leave the human review queue and
+join the auto-zones that run_validation_workflow.py samples. Papers that
+were never screened get the local rubric scores (rubric_prescreener.py);
+queue papers keep Claude's scores. Routes and probabilities are stored in
+the project store as `active_learning`; 03b also uses the probabilities as
+the local classifier when prioritizing the queue.
+
+Usage:
+    python scripts/active_learning.py --project <project_path> [--threshold 0.95] [--apply]
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+from progress_journal import ProgressJournal
+from project_store import ProjectStore
+from rubric_prescreener import RubricPrescreener
+
+screen_papers = importlib.import_module('03_screen_papers')
+
+
+AI_LABEL_WEIGHT = 0.5
+MIN_LABELS_PER_CLASS = 10
+ISOTONIC_MIN_LABELS = 1000
+CV_FOLDS = 5
+
+
+def paper_text(df: pd.DataFrame) -> pd.Series:
+    return df['title'].fillna('').astype(str) + '. ' + df['abstract'].fillna('').astype(str)
+
+
+class ActiveLearner:
+    """TF-IDF + calibrated logistic regression trained on a project's decisions"""
+
+    def __init__(self, threshold: float = 0.95):
+        """
+        Args:
+            threshold: Calibrated confidence, max(p, 1 - p), needed to auto-resolve a paper
+        """
+        self.threshold = threshold
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, ngram_range=(1, 2), min_df=2,
+                                          max_df=0.9, max_features=200000, stop_words='english')
+        self.model = None
+        self.report = {}
+
+    @staticmethod
+    def labelled(papers: pd.DataFrame, progress: pd.DataFrame,
+                 decisions: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Papers with a label (1 = include), weight and source
+
+        Args:
+            papers: All papers (paper_id, title, abstract)
+            progress: Screening results (paper_id, decision)
+            decisions: Human review decisions (paper_id, human_decision), if any
+        """
+        ai = progress[progress['decision'].isin(['auto-include', 'auto-exclude'])]
+        labels = pd.DataFrame({'paper_id': ai['paper_id'],
+                               'label': (ai['decision'] == 'auto-include').astype(int),
+                               'weight': AI_LABEL_WEIGHT, 'source': 'ai'})
+        if decisions is not None and len(decisions) > 0:
+            human = decisions.dropna(subset=['human_decision']).drop_duplicates('paper_id', keep='last')
+            labels = pd.concat([
+                labels[~labels['paper_id'].isin(human['paper_id'])],
+                pd.DataFrame({'paper_id': human['paper_id'],
+                              'label': human['human_decision'].str.lower().str.startswith('include').astype(int),
+                              'weight': 1.0, 'source': 'human'})
+            ], ignore_index=True)
+        return papers.merge(labels, on='paper_id')
+
+    def calibrated_model(self, n_labels: int) -> CalibratedClassifierCV:
+        method = 'isotonic' if n_labels >= ISOTONIC_MIN_LABELS else 'sigmoid'
+        return CalibratedClassifierCV(
+            LogisticRegression(C=4.0, class_weight='balanced', max_iter=2000),
+            method=method, cv=3
+        )
+
+    def fit(self, corpus: pd.DataFrame, train: pd.DataFrame) -> bool:
+        """
+        Fit the vocabulary on the whole corpus and the model on the labelled papers
+
+        Returns:
+            False if there are too few labels of either class to train
+        """
+        counts = train['label'].value_counts()
+        if len(train) == 0 or counts.min() < MIN_LABELS_PER_CLASS or len(counts) < 2:
+            print(f"   ⚠️  Not enough labels yet: {counts.get(1, 0)} include / {counts.get(0, 0)} exclude "
+                  f"(need {MIN_LABELS_PER_CLASS} of each)")
+            return False
+
+        self.vectorizer.fit(paper_text(corpus))
+        X = self.vectorizer.transform(paper_text(train))
+        y = train['label'].to_numpy()
+        weights = train['weight'].to_numpy()
+
+        self.report = self.cross_validate(X, y, weights, train['source'].to_numpy())
+        self.model = self.calibrated_model(len(train))
+        self.model.fit(X, y, sample_weight=weights)
+        return True
+
+    def cross_validate(self, X, y: np.ndarray, weights: np.ndarray, source: np.ndarray) -> Dict:
+        """Held-out accuracy and coverage of auto-resolution on the labelled papers"""
+        folds = StratifiedKFold(n_splits=min(CV_FOLDS, int(np.bincount(y).min())), shuffle=True,
+                                random_state=42)
+        p = cross_val_predict(self.calibrated_model(len(y)), X, y, cv=folds, method='predict_proba',
+                              params={'sample_weight': weights})[:, 1]
+        confident = np.maximum(p, 1 - p) >= self.threshold
+        correct = (p >= 0.5).astype(int) == y
+
+        report = {}
+        for name, mask in (('human', source == 'human'), ('all', np.ones(len(y), dtype=bool))):
+            resolved = mask & confident
+            report[name] = {
+                'labelled': int(mask.sum()),
+                'coverage': float(resolved.sum() / mask.sum()) if mask.any() else 0.0,
+                'accuracy': float(correct[resolved].mean()) if resolved.any() else None,
+            }
+        return report
+
+    def trusted(self) -> bool:
+        """Held-out accuracy above the threshold matches the confidence it claims"""
+        basis = self.report['human'] if self.report['human']['labelled'] >= 2 * MIN_LABELS_PER_CLASS \
+            else self.report['all']
+        return basis['accuracy'] is not None and basis['accuracy'] >= self.threshold
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """Calibrated P(include)"""
+        return self.model.predict_proba(self.vectorizer.transform(paper_text(df)))[:, 1]
+
+    def route(self, df: pd.DataFrame, stage: str) -> pd.DataFrame:
+        """
+        Args:
+            df: Open papers (paper_id, title, abstract)
+            stage: 'llm' (not screened yet) or 'human' (in the review queue)
+
+        Returns:
+            paper_id, stage, probability and route ('auto-include', 'auto-exclude' or stage)
+        """
+        p = self.predict(df) if len(df) else np.array([])
+        confident = np.maximum(p, 1 - p) >= self.threshold  # Same test as cross_validate()
+        route = np.where(confident, np.where(p >= 0.5, 'auto-include', 'auto-exclude'), stage)
+        return pd.DataFrame({'paper_id': df['paper_id'].to_numpy(), 'stage': stage,
+                             'probability': p.round(4), 'route': route})
+
+
+def resolution_note(row: pd.Series, threshold: float) -> str:
+    include = row['route'] == 'auto-include'
+    return (f"Active-learning model: P(include) = {row['probability']:.3f} "
+            f"({'≥' if include else '≤'} {threshold if include else 1 - threshold:.2f}). "
+            f"Decided without an API call.")
+
+
+def resolved_results(resolved: pd.DataFrame, papers: pd.DataFrame, progress: pd.DataFrame,
+                     rubric: Dict, threshold: float) -> List[Dict]:
+    """
+    Screening progress records for the papers the model resolved
+
+    Args:
+        resolved: Routes of resolved papers (paper_id, stage, probability, route)
+        papers: All papers (paper_id, title, abstract)
+        progress: Screening progress, for the scores of queue papers
+        rubric: ai_prisma_rubric.scoring_rubric section of config.yaml
+
+    Returns:
+        Records in 03_screen_papers.py's progress format: queue papers keep
+        Claude's scores, unscreened papers get the local rubric scores
+    """
+    records = []
+
+    queue = resolved[resolved['stage'] == 'human'].merge(progress, on='paper_id')
+    for _, row in queue.iterrows():
+        record = {column: row[column] for column in progress.columns}
+        record.update({
+            'confidence': int(round(100 * row['probability'])),
+            'decision': row['route'],
+            'reasoning': (f"{resolution_note(row, threshold)} Claude: {row['decision']} at "
+                          f"{row['confidence']:.0f}% confidence. {row['reasoning']}"),
+        })
+        records.append(record)
+
+    unscreened = resolved[resolved['stage'] == 'llm'].merge(papers, on='paper_id')
+    scores = RubricPrescreener(rubric).score(unscreened)
+    for (_, row), (_, score) in zip(unscreened.iterrows(), scores.iterrows()):
+        records.append({
+            'paper_id': row['paper_id'],
+            'title': row['title'],
+            'domain_score': int(score['domain']),
+            'intervention_score': int(score['intervention']),
+            'method_score': int(score['method']),
+            'outcomes_score': int(score['outcomes']),
+            'exclusion_score': int(score['exclusion']),
+            'title_bonus': int(score['title_bonus']),
+            'total_score': int(score['total_score']),
+            'confidence': int(round(100 * row['probability'])),
+            'decision': row['route'],
+            'reasoning': f"{resolution_note(row, threshold)} Scores: local keyword rubric.",
+        })
+    return records
+
+
+class ActiveLearningLoop:
+    """Train on a project's decisions, route its open papers, optionally apply the routes"""
+
+    def __init__(self, project_path: str, threshold: float = 0.95):
+        self.project_path = Path(project_path)
+        self.store = ProjectStore(project_path)
+        self.output_dir = self.project_path / "data" / "02_screening"
+        self.learner = ActiveLearner(threshold)
+
+        config_file = self.project_path / "config.yaml"
+        self.config = {}
+        if config_file.exists():
+            with open(config_file, 'r') as f:
+                self.config = yaml.safe_load(f) or {}
+
+    def run(self, apply: bool = False) -> Optional[pd.DataFrame]:
+        print("\n" + "="*60)
+        print("🧠 ACTIVE-LEARNING SCREENING LOOP")
+        print("="*60)
+
+        papers = self.store.read('papers')
+        progress = self.store.read('screening_progress')
+        if papers is None or progress is None:
+            print("❌ Error: No screening results yet")
+            print("   Run screening first: python scripts/03_screen_papers.py")
+            sys.exit(1)
+        papers = papers[['paper_id', 'title', 'abstract']].drop_duplicates('paper_id')
+        decisions = self.store.read('human_review_decisions')
+
+        train = ActiveLearner.labelled(papers, progress, decisions)
+        sources = train['source'].value_counts()
+        print(f"\n📚 Training labels: {sources.get('human', 0)} human decisions, "
+              f"{sources.get('ai', 0)} AI auto-zone decisions")
+        if not self.learner.fit(papers, train):
+            return None
+
+        print(f"\n🎯 Cross-validated auto-resolution at ≥{self.learner.threshold:.0%} confidence:")
+        for name, stats in self.learner.report.items():
+            accuracy = f"{stats['accuracy']:.1%}" if stats['accuracy'] is not None else 'n/a'
+            print(f"   {name:<6} {stats['labelled']:>6} labelled, coverage {stats['coverage']:.1%}, "
+                  f"accuracy {accuracy}")
+
+        # Open papers: never screened (or screening failed) -> Claude; in the review queue -> reviewer
+        screened = progress[progress['decision'] != 'error']
+        reviewed = set(decisions['paper_id']) if decisions is not None and len(decisions) else set()
+        queue = progress.loc[(progress['decision'] == 'human-review')
+                             & ~progress['paper_id'].isin(reviewed), 'paper_id']
+        open_llm = papers[~papers['paper_id'].isin(screened['paper_id'])]
+        open_human = papers[papers['paper_id'].isin(queue)]
+
+        routes = pd.concat([self.learner.route(open_llm, 'llm'),
+                            self.learner.route(open_human, 'human')], ignore_index=True)
+        routes['applied'] = False
+
+        print(f"\n🔀 Routing:")
+        for stage, label in (('llm', 'Not screened yet'), ('human', 'Human review queue')):
+            counts = routes.loc[routes['stage'] == stage, 'route'].value_counts()
+            print(f"   {label}: {counts.get('auto-include', 0)} auto-include, "
+                  f"{counts.get('auto-exclude', 0)} auto-exclude, {counts.get(stage, 0)} → {stage}")
+
+        if apply:
+            if self.learner.trusted():
+                routes = self.apply(routes, papers, progress)
+            else:
+                print(f"\n⛔ Not applied: held-out accuracy of confident predictions is below "
+                      f"{self.learner.threshold:.0%}; collect more human decisions first")
+
+        self.store.write('active_learning', routes)
+        print(f"\n💾 Routes: {self.store.table_file('active_learning')}")
+        return routes
+
+    def apply(self, routes: pd.DataFrame, papers: pd.DataFrame,
+              progress: pd.DataFrame) -> pd.DataFrame:
+        """Record resolved papers as screening results and save the screening zones again"""
+        resolved = routes[routes['route'].isin(['auto-include', 'auto-exclude'])]
+        if resolved.empty:
+            print("\n✓ Nothing to apply")
+            return routes
+
+        rubric = self.config.get('ai_prisma_rubric', {}).get('scoring_rubric', {})
+        self.store.refresh('screening_progress')
+        journal = ProgressJournal(self.output_dir / "screening_progress.jsonl",
+                                  self.store.table_file('screening_progress'), key='paper_id')
+        for record in resolved_results(resolved, papers, progress, rubric, self.learner.threshold):
+            journal.append(record)
+        df_progress = journal.compact()
+        if self.store.csv_views:
+            self.store.export_csv('screening_progress', df_progress)
+
+        self.save_screened_papers(set(resolved['paper_id']), df_progress)
+
+        routes.loc[resolved.index, 'applied'] = True
+        print(f"\n✅ Applied: {int((resolved['stage'] == 'llm').sum())} papers screened locally "
+              f"(API calls saved), {int((resolved['stage'] == 'human').sum())} resolved from the "
+              f"human review queue")
+        return routes
+
+    def save_screened_papers(self, resolved_ids: set, df_progress: pd.DataFrame):
+        """
+        Merge the new results into screened_papers and its zone views, as 03 does
+
+        Without a screened_papers table yet, 03_screen_papers.py merges the
+        journalled results itself on its next run.
+        """
+        screened = self.store.read('screened_papers', columns=['paper_id'])
+        if screened is None:
+            return
+
+        screener = screen_papers.PaperScreener(
+            str(self.project_path), self.config.get('research_question', ''),
+            csv_views=self.store.csv_views, offline=True
+        )
+        df = screener.load_papers()
+        df = df[df['paper_id'].isin(set(screened['paper_id']) | resolved_ids)]
+        screener.save_results(screener.merge_results(df, df_progress),
+                              partition_zones=self.store.table_file('screened_papers').is_dir())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train a local model on human and AI decisions and route the remaining papers"
+    )
+    parser.add_argument(
+        '--project',
+        required=True,
+        help='Path to project directory'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.95,
+        help='Calibrated confidence needed to auto-resolve a paper (default: 0.95)'
+    )
+    parser.add_argument(
+        '--apply',
+        action='store_true',
+        help='Record resolved papers as screening results (no API call, no human review)'
+    )
+
+    args = parser.parse_args()
+
+    project_path = Path(args.project)
+    if not project_path.exists():
+        print(f"❌ Error: Project path does not exist: {project_path}")
+        sys.exit(1)
+
+    ActiveLearningLoop(args.project, args.threshold).run(apply=args.apply)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Message Batches API backend for AI-PRISMA screening
+
+Used by 03_screen_papers.py with --backend batch. Every unscreened paper is
+packed into Message Batches jobs (50% of the interactive price, no rate-limit
+pressure), the jobs are polled until they end, and each result is streamed
+back through PaperScreener.process_response so evidence grounding and the
+decision rules are applied exactly as in interactive screening.
+
+Submitted batch IDs are persisted to data/02_screening/batch_state.json as
+soon as each job is created, so a crashed run collects the outstanding
+batches instead of paying for the same papers twice.
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+import pandas as pd
+
+
+class BatchScreener:
+    """Submit, poll and collect Message Batches jobs for a PaperScreener"""
+
+    # API limit is 100,000 requests / 256 MB per batch; smaller jobs finish
+    # sooner and keep a single failed job cheap to retry
+    max_requests_per_batch = 10000
+
+    def __init__(self, screener, poll_interval: int = 60):
+        """
+        Args:
+            screener: PaperScreener providing client, prompts and decision rules
+            poll_interval: Seconds between batch status checks
+        """
+        self.screener = screener
+        self.client = screener.client
+        self.poll_interval = poll_interval
+        self.state_file = screener.output_dir / "batch_state.json"
+        self.state = self.load_state()
+
+    def load_state(self) -> Dict:
+        """Load outstanding batch IDs from a previous run"""
+        if self.state_file.exists():
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        return {'batches': []}
+
+    def save_state(self):
+        """Persist batch state atomically (write + rename)"""
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        tmp_file.replace(self.state_file)
+
+    def run(self, df_to_screen: pd.DataFrame,
+            on_result: Callable[[pd.Series, Dict], None],
+            on_flush: Callable[[], None]):
+        """
+        Screen papers through the Message Batches API
+
+        Args:
+            df_to_screen: Papers still to be screened
+            on_result: Callback taking (row, result) for each finished paper
+            on_flush: Callback that persists progress; called before a batch
+                      is marked as processed
+        """
+        # paper_id doubles as the batch custom_id (hex, matches ^[a-zA-Z0-9_-]{1,64}$)
+        rows = {row['paper_id']: row for _, row in df_to_screen.iterrows()}
+
+        outstanding = [b for b in self.state['batches'] if b['status'] != 'processed']
+        if outstanding:
+            print(f"\n✓ Found {len(outstanding)} outstanding batch(es) from a previous run")
+
+        pending_ids = set()
+        for batch in outstanding:
+            pending_ids.update(batch['custom_ids'])
+
+        to_submit = []
+        for custom_id, row in rows.items():
+            if custom_id in pending_ids:
+                continue
+            # Papers without abstracts (or with cached responses) never need an API call
+            if not self.screener.has_abstract(row['abstract']):
+                on_result(row, self.screener.no_abstract_result())
+                continue
+
+            cached = self.screener.cached_result(
+                self.screener.build_request(row['title'], row['abstract']), row['abstract']
+            )
+            if cached is not None:
+                on_result(row, cached)
+            else:
+                to_submit.append(custom_id)
+
+        outstanding.extend(self.submit(to_submit, rows))
+        on_flush()
+
+        while outstanding:
+            for batch in list(outstanding):
+                status = self.client.messages.batches.retrieve(batch['id'])
+                counts = status.request_counts
+                print(f"   ⏳ {batch['id']}: {status.processing_status} "
+                      f"(processing: {counts.processing}, succeeded: {counts.succeeded}, "
+                      f"errored: {counts.errored})")
+
+                if status.processing_status == 'ended':
+                    self.collect(batch, rows, on_result)
+                    on_flush()
+                    batch['status'] = 'processed'
+                    self.save_state()
+                    outstanding.remove(batch)
+
+            if outstanding:
+                time.sleep(self.poll_interval)
+
+    def submit(self, custom_ids: list, rows: Dict[str, pd.Series]) -> list:
+        """Create batch jobs for the given papers, persisting each ID immediately"""
+        submitted = []
+        for start in range(0, len(custom_ids), self.max_requests_per_batch):
+            chunk = custom_ids[start:start + self.max_requests_per_batch]
+            requests = [
+                {
+                    'custom_id': custom_id,
+                    'params': self.screener.build_request(rows[custom_id]['title'],
+                                                          rows[custom_id]['abstract'])
+                }
+                for custom_id in chunk
+            ]
+
+            batch = self.client.messages.batches.create(requests=requests)
+            entry = {
+                'id': batch.id,
+                'custom_ids': chunk,
+                'status': 'submitted',
+                'submitted_at': datetime.now().isoformat()
+            }
+            self.state['batches'].append(entry)
+            self.save_state()
+            submitted.append(entry)
+            print(f"   📦 Submitted batch {batch.id} ({len(chunk)} papers)")
+
+        return submitted
+
+    def collect(self, batch: Dict, rows: Dict[str, pd.Series],
+                on_result: Callable[[pd.Series, Dict], None]):
+        """Stream results of an ended batch through the screener's decision rules"""
+        for entry in self.client.messages.batches.results(batch['id']):
+            row = rows.get(entry.custom_id)
+            if row is None:
+                continue  # Already recorded before a crash
+
+            if entry.result.type == 'succeeded':
+                try:
+                    request = self.screener.build_request(row['title'], row['abstract'])
+                    result = self.screener.process_response(entry.result.message,
+                                                            row['abstract'], request)
+                except Exception as e:
+                    print(f"   ⚠️  Parse Error: {e}")
+                    result = self.screener.error_result(e)
+            else:
+                # errored / canceled / expired
+                error = getattr(entry.result, 'error', None) or entry.result.type
+                result = self.screener.error_result(error)
+
+            on_result(row, result)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Multi-Paper Packing Benchmark
+
+Screens the TEST_PAPERS set from test_ai_prisma_scoring.py twice, once with
+one paper per request and once with K papers per request, and compares
+throughput, token usage / cost and agreement between the two paths.
+Requires ANTHROPIC_API_KEY and the test project created by
+test_ai_prisma_scoring.py. The response cache is disabled so both runs hit
+the API.
+
+Usage:
+    python scripts/test_ai_prisma_scoring.py
+    python scripts/benchmark_packing.py [--pack-size 3] [--repeat 2]
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+screen_papers = importlib.import_module('03_screen_papers')
+from test_ai_prisma_scoring import TEST_PAPERS
+
+
+# USD per million tokens for claude-3-5-sonnet
+PRICING = {
+    'uncached_input_tokens': 3.00,
+    'cache_write_tokens': 3.75,
+    'cache_read_tokens': 0.30,
+    'output_tokens': 15.00,
+}
+
+
+class PackingBenchmark:
+    """Compare single-paper and packed screening on TEST_PAPERS"""
+
+    def __init__(self, pack_size: int, repeat: int):
+        self.test_project = Path('/tmp/scholarag/test_projects/ai-prisma-test')
+        self.pack_size = pack_size
+        self.repeat = repeat
+
+    def make_screener(self):
+        if not self.test_project.exists():
+            print(f"❌ Test project not found: {self.test_project}")
+            print(f"   Run: python scripts/test_ai_prisma_scoring.py")
+            sys.exit(1)
+
+        return screen_papers.PaperScreener(
+            str(self.test_project),
+            'How do AI chatbots improve speaking proficiency in second language learning?'
+        )
+
+    def rows(self):
+        """TEST_PAPERS as screening rows, repeated to give packing some work"""
+        papers = [{'title': p['title'], 'abstract': p['abstract']} for p in TEST_PAPERS]
+        return [pd.Series(p) for p in papers * self.repeat]
+
+    def run_mode(self, label: str, screen) -> dict:
+        screener = self.make_screener()
+        rows = self.rows()
+
+        start = time.perf_counter()
+        results = screen(screener, rows)
+        elapsed = time.perf_counter() - start
+
+        cost = sum(screener.usage[k] * price for k, price in PRICING.items()) / 1_000_000
+        print(f"\n{label}: {len(rows)} papers, {screener.usage['requests']} requests, "
+              f"{elapsed:.1f}s ({len(rows) / elapsed:.2f} papers/s), ${cost:.4f}")
+        screener.print_usage_stats()
+
+        return {'results': results, 'elapsed': elapsed, 'cost': cost, 'usage': screener.usage}
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print(f"MULTI-PAPER PACKING BENCHMARK (K={self.pack_size})")
+        print("="*70)
+
+        single = self.run_mode(
+            "Single-paper",
+            lambda screener, rows: [screener.screen_paper(r['title'], r['abstract']) for r in rows]
+        )
+        packed = self.run_mode(
+            f"Packed (K={self.pack_size})",
+            lambda screener, rows: [
+                result
+                for start in range(0, len(rows), self.pack_size)
+                for result in screener.screen_papers_packed(rows[start:start + self.pack_size])
+            ]
+        )
+
+        expected = [p['expected_decision'] for p in TEST_PAPERS] * self.repeat
+        pairs = list(zip(single['results'], packed['results'], expected))
+        same_decision = sum(s['decision'] == p['decision'] for s, p, _ in pairs)
+        score_diff = sum(abs(s['total_score'] - p['total_score']) for s, p, _ in pairs) / len(pairs)
+        single_expected = sum(s['decision'] == e for s, _, e in pairs)
+        packed_expected = sum(p['decision'] == e for _, p, e in pairs)
+
+        print("\n" + "="*70)
+        print("COMPARISON")
+        print("="*70)
+        print(f"Wall time:          {single['elapsed']:.1f}s → {packed['elapsed']:.1f}s "
+              f"({single['elapsed'] / packed['elapsed']:.2f}x)")
+        print(f"Requests:           {single['usage']['requests']} → {packed['usage']['requests']}")
+        print(f"Cost:               ${single['cost']:.4f} → ${packed['cost']:.4f}")
+        print(f"Decision agreement: {same_decision}/{len(pairs)} "
+              f"({same_decision / len(pairs) * 100:.0f}%)")
+        print(f"Mean |Δ score|:     {score_diff:.1f}")
+        print(f"Matches expected:   single {single_expected}/{len(pairs)}, "
+              f"packed {packed_expected}/{len(pairs)}")
+        print(f"Packed fallbacks:   {packed['usage']['packed_fallbacks']}")
+
+        return all(r['decision'] != 'error' for r in single['results'] + packed['results'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-paper packing against single-paper screening")
+    parser.add_argument('--pack-size', type=int, default=3,
+                        help='Papers per packed request (default: 3)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Repeat TEST_PAPERS this many times (default: 1)')
+    args = parser.parse_args()
+
+    benchmark = PackingBenchmark(args.pack_size, args.repeat)
+    success = benchmark.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Evidence grounding for AI-PRISMA quotes
+
+Checks that the evidence quotes Claude returns actually appear in the
+abstract. Matching is case- and punctuation-insensitive and tolerates small
+edits (a dropped word, an inserted function word, a changed inflection, "..."
+elisions), so verbatim quotes are not flagged as hallucinations just because
+the model normalized a hyphen or a quote mark. Edits that can change what a
+quote claims are never tolerated: a quote word that does not align is only
+accepted if it is a function word ("improved writing fluency" and "never
+improved speaking fluency" do not ground "improved speaking fluency"), and a
+negation skipped in the abstract ("did not improve" quoted as "did improve")
+is rejected as well.
+
+Each abstract is tokenized once. Quotes that match token-for-token are found
+with a single string search; the rest are located via an n-gram shingle
+index (built lazily, on the first fuzzy lookup, over inflection-stripped
+tokens) and scored by the fraction of their tokens that align in order with
+the abstract. Quotes too edited to share an n-gram with the abstract (e.g. a
+dropped word in a three-word quote) are located again with unigram
+shingles. Results carry character offsets into the original abstract.
+
+Usage:
+    python scripts/evidence_grounding.py --benchmark 100000
+"""
+
+import argparse
+import bisect
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from itertools import accumulate
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ELLIPSIS_PATTERN = re.compile(r"\.\.\.|…|\[\.\.\.\]")
+INFLECTIONS = ('ing', 'ed', 'es', 's', 'e')
+# Function words a quote may add without changing its claim
+STOPWORDS = frozenset(
+    "a an the this that these those their its his her our they it we "
+    "of in on at to for by from with as into over than "
+    "and or also both which who whose is are was were be been being has have had".split()
+)
+# Words that flip a claim; 't' is the tail of contractions ("didn't" -> didn, t)
+NEGATIONS = frozenset("no not never without neither nor none nothing nobody cannot t".split())
+
+
+def stem(token: str) -> str:
+    """Strip one inflectional suffix, so 'improves' / 'improved' / 'improving' align"""
+    for suffix in INFLECTIONS:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+@dataclass
+class QuoteMatch:
+    """Grounding result for a single quote"""
+    quote: str
+    grounded: bool
+    score: float  # Fraction of quote tokens aligned with the abstract (0-1)
+    start: Optional[int] = None  # Character offsets into the original abstract
+    end: Optional[int] = None
+
+
+class GroundingIndex:
+    """Normalized, shingle-indexed view of one abstract"""
+
+    def __init__(self, abstract: str, shingle_size: int = 3):
+        """
+        Args:
+            abstract: Original paper abstract
+            shingle_size: Tokens per shingle used to find candidate alignments
+        """
+        self.abstract = abstract or ""
+        self.shingle_size = shingle_size
+
+        self.tokens = TOKEN_PATTERN.findall(self.abstract.lower())
+
+        # Space-joined tokens for the exact-match fast path
+        self.normalized = " " + " ".join(self.tokens) + " "
+
+        self._spans = None
+        self._token_starts = None
+        self._stems = None
+        self._shingles = None
+
+    @property
+    def spans(self) -> list:
+        """(start, end) character offsets of each token in the original abstract"""
+        if self._spans is None:
+            self._spans = [m.span() for m in TOKEN_PATTERN.finditer(self.abstract.lower())]
+        return self._spans
+
+    @property
+    def token_starts(self) -> list:
+        """Position of each token in the space-joined normalized text"""
+        if self._token_starts is None:
+            self._token_starts = list(accumulate((len(t) + 1 for t in self.tokens[:-1]), initial=1))
+        return self._token_starts
+
+    @property
+    def stems(self) -> list:
+        """Inflection-stripped tokens, compared by the fuzzy path"""
+        if self._stems is None:
+            self._stems = [stem(t) for t in self.tokens]
+        return self._stems
+
+    @property
+    def shingles(self) -> dict:
+        """Unigram + n-gram shingle positions over stems, built on first fuzzy lookup"""
+        if self._shingles is None:
+            self._shingles = defaultdict(list)
+            for n in {1, self.shingle_size}:
+                for i in range(len(self.stems) - n + 1):
+                    self._shingles[tuple(self.stems[i:i + n])].append(i)
+        return self._shingles
+
+    def match(self, quote: str, threshold: float = 0.85) -> QuoteMatch:
+        """
+        Locate a quote in the abstract
+
+        Quotes with elisions ("A ... B") are matched part by part; every part
+        must be grounded: score >= threshold, every unaligned quote token a
+        function word and no negation skipped in the abstract.
+
+        Args:
+            quote: Evidence quote from the model
+            threshold: Minimum aligned-token fraction to count as grounded
+
+        Returns:
+            QuoteMatch with score and character offsets of the best alignment
+        """
+        parts = [p for p in ELLIPSIS_PATTERN.split(quote) if TOKEN_PATTERN.search(p)]
+        if not parts:
+            return QuoteMatch(quote, True, 1.0)
+
+        part_tokens = [TOKEN_PATTERN.findall(p.lower()) for p in parts]
+        part_matches = [self.match_tokens(tokens) for tokens in part_tokens]
+        score = min(score for score, _, _, _ in part_matches)
+        grounded = all(part_score >= threshold and faithful
+                       for part_score, _, _, faithful in part_matches)
+        starts = [start for _, start, _, _ in part_matches if start is not None]
+        ends = [end for _, _, end, _ in part_matches if end is not None]
+
+        return QuoteMatch(
+            quote=quote,
+            grounded=grounded,
+            score=score,
+            start=min(starts) if starts else None,
+            end=max(ends) if ends else None
+        )
+
+    def match_tokens(self, quote_tokens: List[str]):
+        """Return (score, start, end, faithful) for the best alignment of a token list"""
+        if not self.tokens:
+            return 0.0, None, None, False
+
+        # Fast path: exact token sequence
+        needle = " " + " ".join(quote_tokens) + " "
+        position = self.normalized.find(needle)
+        if position != -1:
+            first = bisect.bisect_left(self.token_starts, position + 1)
+            last = first + len(quote_tokens) - 1
+            return 1.0, self.spans[first][0], self.spans[last][1], True
+
+        # Candidate alignments from shared n-gram shingles; when they are missing or only
+        # partly align (every n-gram of a short quote broken by one edit), from unigrams
+        quote_stems = [stem(t) for t in quote_tokens]
+        best = (0.0, None, None, False)
+        for n in dict.fromkeys((min(self.shingle_size, len(quote_stems)), 1)):
+            best = max(best, self.align(quote_tokens, quote_stems, n), key=lambda match: (match[0], match[3]))
+            if best[0] == 1.0 and best[3]:
+                break
+        return best
+
+    def align(self, quote_tokens: List[str], quote_stems: List[str], n: int):
+        """
+        Best (score, start, end, faithful) among the offsets most voted for by
+        shared n-gram shingles
+
+        faithful is False when the alignment leaves a content word or negation
+        of the quote unmatched, or skips a negation inside the abstract span.
+        """
+        votes = Counter()
+        for i in range(len(quote_stems) - n + 1):
+            for position in self.shingles.get(tuple(quote_stems[i:i + n]), ()):
+                votes[position - i] += 1
+
+        best = (0.0, None, None, False)
+        slack = max(2, len(quote_stems) // 5)
+        for offset, _ in votes.most_common(3):
+            window_start = max(0, offset - slack)
+            window = self.stems[window_start:offset + len(quote_stems) + slack]
+            blocks = [b for b in SequenceMatcher(None, quote_stems, window, autojunk=False)
+                      .get_matching_blocks() if b.size]
+            if not blocks:
+                continue
+
+            score = sum(b.size for b in blocks) / len(quote_stems)
+            first = window_start + blocks[0].b
+            last = window_start + blocks[-1].b + blocks[-1].size - 1
+            aligned_quote = {b.a + k for b in blocks for k in range(b.size)}
+            aligned_abstract = {window_start + b.b + k for b in blocks for k in range(b.size)}
+            faithful = (
+                all(token in STOPWORDS for i, token in enumerate(quote_tokens) if i not in aligned_quote)
+                and not any(self.tokens[i] in NEGATIONS
+                            for i in range(first, last + 1) if i not in aligned_abstract)
+            )
+            if (score, faithful) > (best[0], best[3]):
+                best = (score, self.spans[first][0], self.spans[last][1], faithful)
+
+        return best
+
+
+def ground_quotes(quotes: List[str], abstract: str, threshold: float = 0.85) -> List[QuoteMatch]:
+    """Match every quote against an abstract that is normalized and indexed once"""
+    index = GroundingIndex(abstract)
+    return [index.match(quote, threshold) for quote in quotes]
+
+
+def legacy_grounded(quotes: List[str], abstract: str) -> bool:
+    """Previous check: exact lowercase substring test (kept for benchmarking)"""
+    for quote in quotes:
+        if quote.lower().strip() not in abstract.lower():
+            return False
+    return True
+
+
+def benchmark(n_pairs: int, quotes_per_abstract: int = 4, seed: int = 42):
+    """Time legacy vs. shingle-index grounding on synthetic quote/abstract pairs"""
+    from test_ai_prisma_scoring import TEST_PAPERS
+
+    rng = random.Random(seed)
+    abstracts = [" ".join(p['abstract'].split()) for p in TEST_PAPERS]
+
+    def make_quote(abstract: str) -> str:
+        words = abstract.split()
+        start = rng.randrange(0, len(words) - 12)
+        quote = words[start:start + rng.randint(6, 12)]
+        kind = rng.random()
+        if kind < 0.25:
+            quote = [w.strip('.,;:()') for w in quote]            # punctuation dropped
+        elif kind < 0.4:
+            del quote[rng.randrange(len(quote))]                  # one word dropped
+        elif kind < 0.5:
+            quote = rng.choice(abstracts).split()[:8]             # quote from another paper
+        return " ".join(quote).capitalize()
+
+    pairs = []
+    for _ in range(n_pairs // quotes_per_abstract):
+        abstract = rng.choice(abstracts)
+        pairs.append(([make_quote(abstract) for _ in range(quotes_per_abstract)], abstract))
+
+    start = time.perf_counter()
+    legacy_ok = sum(legacy_grounded(quotes, abstract) for quotes, abstract in pairs)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grounded_ok = sum(all(m.grounded for m in ground_quotes(quotes, abstract))
+                      for quotes, abstract in pairs)
+    grounded_time = time.perf_counter() - start
+
+    total_quotes = len(pairs) * quotes_per_abstract
+    print(f"Quote/abstract pairs: {total_quotes:,} ({len(pairs):,} abstracts)")
+    print(f"Legacy substring check: {legacy_time:.2f}s "
+          f"({total_quotes / legacy_time:,.0f} quotes/s), {legacy_ok:,} abstracts fully grounded")
+    print(f"Shingle index + fuzzy:  {grounded_time:.2f}s "
+          f"({total_quotes / grounded_time:,.0f} quotes/s), {grounded_ok:,} abstracts fully grounded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI-PRISMA evidence grounding")
+    parser.add_argument('--benchmark', type=int, default=100000,
+                        help='Number of quote/abstract pairs (default: 100000)')
+    args = parser.parse_args()
+
+    benchmark(args.benchmark)
+
+
+if __name__ == '__main__':
+    main()
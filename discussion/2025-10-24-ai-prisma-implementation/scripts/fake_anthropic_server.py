@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Fake Anthropic Messages API for offline screening tests
+
+Serves POST /v1/messages with a fixed screening result and injects the
+failures seen under load: random 429/529 responses, an initial burst of
+failures, and 429s whenever more than --max-concurrent requests are in
+flight. Every response carries anthropic-ratelimit-* headers and errors
+carry retry-after-ms, so the retry scheduler, circuit breaker and adaptive
+concurrency can be exercised without an API key.
+
+The Message Batches endpoints (create, retrieve, results) are served too:
+a batch ends --batch-latency seconds after it was created, and its results
+are the same fixed screening result per request.
+
+Usage:
+    python scripts/fake_anthropic_server.py --port 8765 --fail-rate 0.2 --status 529
+
+    # In another shell
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=test \\
+        python scripts/03_screen_papers.py --project <project_path> --question "..." --concurrency 8
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+FAKE_RESULT = {
+    'scores': {'domain': 10, 'intervention': 10, 'method': 5,
+               'outcomes': 10, 'exclusion': 0, 'title_bonus': 10},
+    'total_score': 45,
+    'confidence': 95,
+    'decision': 'auto-include',
+    'reasoning': 'Fake server response',
+    'evidence_quotes': []
+}
+
+ERROR_TYPES = {429: 'rate_limit_error', 529: 'overloaded_error', 500: 'api_error', 503: 'api_error'}
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the failure-injection settings and counters"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, fail_rate: float = 0.0, status: int = 429,
+                 retry_after: float = 0.05, burst: int = 0, max_concurrent: int = 0,
+                 latency: float = 0.05, batch_latency: float = 0.1, seed: int = 42):
+        """
+        Args:
+            port: Port to listen on (0 picks a free port)
+            fail_rate: Probability that a request fails with `status`
+            status: HTTP status for injected failures (429, 529, 500, 503)
+            retry_after: retry-after sent with every error (seconds)
+            burst: The first N requests fail with `status`
+            max_concurrent: Requests beyond this many in flight get a 429 (0: no limit)
+            latency: Simulated processing time per successful request (seconds)
+            batch_latency: Seconds until a message batch ends
+        """
+        super().__init__(('127.0.0.1', port), FakeMessagesHandler)
+        self.fail_rate = fail_rate
+        self.status = status
+        self.retry_after = retry_after
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.latency = latency
+        self.batch_latency = batch_latency
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.responses = Counter()
+        self.batches = {}  # id -> {'created': monotonic time, 'requests': [...]}
+        self.batch_calls = Counter()  # create / retrieve / results
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve from a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def choose_failure(self):
+        """Decide whether the next request fails; returns an HTTP status or None"""
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+            if self.requests <= self.burst:
+                return self.status
+            if self.max_concurrent and self.in_flight > self.max_concurrent:
+                return 429
+            if self.random.random() < self.fail_rate:
+                return self.status
+            return None
+
+    def create_batch(self, requests: list) -> dict:
+        with self.lock:
+            batch_id = f"msgbatch_fake_{len(self.batches) + 1}"
+            self.batches[batch_id] = {'created': time.monotonic(), 'requests': requests}
+            self.batch_calls['create'] += 1
+        return self.batch_status(batch_id)
+
+    def batch_status(self, batch_id: str) -> dict:
+        """MessageBatch object; ended once batch_latency has passed"""
+        batch = self.batches[batch_id]
+        ended = time.monotonic() - batch['created'] >= self.batch_latency
+        n = len(batch['requests'])
+        now = datetime.now(timezone.utc)
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {'processing': 0 if ended else n, 'succeeded': n if ended else 0,
+                               'errored': 0, 'canceled': 0, 'expired': 0},
+            'created_at': now.isoformat(),
+            'expires_at': (now + timedelta(days=1)).isoformat(),
+            'ended_at': now.isoformat() if ended else None,
+            'cancel_initiated_at': None,
+            'archived_at': None,
+            'results_url': f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def rate_limit_headers(self) -> dict:
+        limit = self.max_concurrent or 50
+        remaining = max(0, limit - self.in_flight)
+        return {
+            'anthropic-ratelimit-requests-limit': str(limit),
+            'anthropic-ratelimit-requests-remaining': str(remaining),
+        }
+
+
+class FakeMessagesHandler(BaseHTTPRequestHandler):
+    """Handles POST /v1/messages and the /v1/messages/batches endpoints"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        server = self.server
+
+        if self.path.startswith('/v1/messages/batches'):
+            self.send_json(200, server.create_batch(body.get('requests', [])), {})
+            return
+
+        status = server.choose_failure()
+        try:
+            if status is not None:
+                self.send_json(status, {
+                    'type': 'error',
+                    'error': {'type': ERROR_TYPES.get(status, 'api_error'),
+                              'message': f'Injected {status} from fake server'}
+                }, {'retry-after-ms': str(int(server.retry_after * 1000))})
+            else:
+                time.sleep(server.latency)
+                self.send_json(200, self.message(body), {})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.responses[status or 200] += 1
+
+    def do_GET(self):
+        """GET /v1/messages/batches/<id>[/results]"""
+        server = self.server
+        match = re.match(r'^/v1/messages/batches/([\w-]+)(/results)?', self.path)
+        if match is None or match.group(1) not in server.batches:
+            self.send_json(404, {'type': 'error', 'error': {'type': 'not_found_error',
+                                                            'message': self.path}}, {})
+            return
+
+        batch_id = match.group(1)
+        if not match.group(2):
+            with server.lock:
+                server.batch_calls['retrieve'] += 1
+            self.send_json(200, server.batch_status(batch_id), {})
+            return
+
+        with server.lock:
+            server.batch_calls['results'] += 1
+        lines = [json.dumps({'custom_id': request['custom_id'],
+                             'result': {'type': 'succeeded', 'message': self.message(request['params'])}})
+                 for request in server.batches[batch_id]['requests']]
+        data = ("\n".join(lines) + "\n").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/binary')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def message(self, body: dict) -> dict:
+        """Messages API response; packed requests get one result per [Paper i]"""
+        content = "".join(m['content'] for m in body.get('messages', [])
+                          if isinstance(m.get('content'), str))
+        n_papers = len(re.findall(r'^\[Paper \d+\]', content, re.M))
+        if n_papers:
+            result = [dict(FAKE_RESULT, paper_index=i) for i in range(1, n_papers + 1)]
+        else:
+            result = FAKE_RESULT
+
+        return {
+            'id': f'msg_fake_{self.server.requests}',
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model', 'fake'),
+            'content': [{'type': 'text', 'text': json.dumps(result)}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': len(content) // 4, 'output_tokens': 150}
+        }
+
+    def send_json(self, status: int, payload: dict, headers: dict):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in {**self.server.rate_limit_headers(), **headers}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Keep screening output readable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Anthropic Messages API with failure injection")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-rate', type=float, default=0.2,
+                        help='Probability of an injected failure (default: 0.2)')
+    parser.add_argument('--status', type=int, default=429, choices=sorted(ERROR_TYPES),
+                        help='HTTP status of injected failures (default: 429)')
+    parser.add_argument('--retry-after', type=float, default=1.0,
+                        help='retry-after sent with errors, in seconds (default: 1.0)')
+    parser.add_argument('--burst', type=int, default=0,
+                        help='Fail the first N requests (default: 0)')
+    parser.add_argument('--max-concurrent', type=int, default=0,
+                        help='429 above this many requests in flight (default: 0, no limit)')
+    parser.add_argument('--latency', type=float, default=0.5,
+                        help='Seconds per successful request (default: 0.5)')
+    parser.add_argument('--batch-latency', type=float, default=5.0,
+                        help='Seconds until a message batch ends (default: 5.0)')
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(args.port, args.fail_rate, args.status, args.retry_after,
+                                 args.burst, args.max_concurrent, args.latency, args.batch_latency)
+    print(f"🧪 Fake Anthropic API listening on {server.url}")
+    print(f"   export ANTHROPIC_BASE_URL={server.url} ANTHROPIC_API_KEY=test")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.requests} requests: {dict(server.responses)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Canonical paper IDs shared by all AI-PRISMA scripts
+
+Every paper gets a `paper_id` column the first time a stage loads it. The ID
+is derived from the DOI when there is one, otherwise from the normalized
+title + year, so the same paper gets the same ID in every script and every
+run. IDs are the first 16 hex characters of the SHA-1 of that basis
+(stable across Python and pandas versions, safe as Message Batches
+custom_ids); the rare exact duplicates left after deduplication get a `-2`,
+`-3`... suffix so joins on paper_id never fan out.
+
+Normalization is vectorized over the whole column. An ID can be all digits,
+so CSV files holding IDs must be read with PAPER_ID_DTYPES.
+"""
+
+import hashlib
+
+import pandas as pd
+
+
+# read_csv(..., dtype=PAPER_ID_DTYPES): keep IDs like "0123456789012345" as text
+PAPER_ID_DTYPES = {'paper_id': str}
+
+
+def normalize_doi(doi: pd.Series) -> pd.Series:
+    """Lowercase DOIs and strip resolver prefixes (https://doi.org/, doi:)"""
+    return (
+        doi.astype('string')
+        .str.strip()
+        .str.lower()
+        .str.replace(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', '', regex=True)
+    )
+
+
+def normalize_title(title: pd.Series) -> pd.Series:
+    """Lowercase titles, drop punctuation and collapse whitespace"""
+    return (
+        title.astype('string')
+        .fillna('')
+        .str.lower()
+        .str.replace(r'[^\w\s]', ' ', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def compute_paper_ids(df: pd.DataFrame) -> pd.Series:
+    """
+    Compute canonical paper IDs for a DataFrame of papers
+
+    Args:
+        df: Papers with a `title` column and optional `doi` / `year` columns
+
+    Returns:
+        Series of unique paper IDs aligned with df.index
+    """
+    title_key = normalize_title(df['title'])
+    if 'year' in df.columns:
+        year = pd.to_numeric(df['year'], errors='coerce').astype('Int64').astype('string')
+        title_key = title_key + '|' + year.fillna('')
+    title_key = 'title:' + title_key
+
+    if 'doi' in df.columns:
+        doi = normalize_doi(df['doi'])
+        has_doi = doi.notna() & (doi != '') & (doi != 'n/a')
+        basis = title_key.where(~has_doi, 'doi:' + doi)
+    else:
+        basis = title_key
+
+    ids = pd.Series([hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] for key in basis],
+                    index=df.index)
+
+    # Disambiguate exact duplicates so every row keeps its own ID
+    dup_rank = ids.groupby(ids).cumcount()
+    if dup_rank.any():
+        ids = ids.where(dup_rank == 0, ids + '-' + (dup_rank + 1).astype(str))
+
+    return ids
+
+
+def assign_paper_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Add a `paper_id` column, keeping any IDs the papers already carry"""
+    if 'paper_id' in df.columns and df['paper_id'].notna().all():
+        return df
+
+    df = df.copy()
+    ids = compute_paper_ids(df)
+    df['paper_id'] = df['paper_id'].fillna(ids) if 'paper_id' in df.columns else ids
+    return df
@@ -0,0 +1,137 @@
+"""
+Append-only progress journal with snapshot compaction
+
+Long-running stages (screening, human review) record each result as one JSON
+line the moment it arrives, instead of rewriting a whole CSV every N rows.
+Writes are flushed immediately and fsync'd in batches, so a crash loses at
+most the last un-synced batch and never corrupts earlier results.
+
+On completion the journal is compacted into the stage's snapshot (a
+project store table such as data/store/screening_progress.parquet, or a
+CSV; the format follows the file suffix) and removed. Resuming reads the snapshot plus
+the journal in one sequential scan; records are de-duplicated by key with
+the latest record winning, so nothing is double-counted.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from project_store import read_frame, write_frame
+
+
+def json_value(value):
+    """JSON form of values json can't encode: numpy scalars as Python numbers, anything else as text"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class ProgressJournal:
+    """JSONL journal on top of a compacted snapshot table"""
+
+    def __init__(self, journal_file: Path, snapshot_file: Path, key: str,
+                 fsync_every: int = 50):
+        """
+        Args:
+            journal_file: Append-only JSONL file (e.g. screening_progress.jsonl)
+            snapshot_file: Compacted snapshot (.parquet or .csv)
+            key: Column identifying a record; later records replace earlier ones
+            fsync_every: fsync the journal after this many appends
+        """
+        self.journal_file = Path(journal_file)
+        self.snapshot_file = Path(snapshot_file)
+        self.key = key
+        self.fsync_every = fsync_every
+        self.pending = 0
+        self._handle = None
+
+    def load(self) -> pd.DataFrame:
+        """Load snapshot + journal records, de-duplicated by key (latest wins)"""
+        frames = []
+        if self.snapshot_file.exists():
+            frames.append(read_frame(self.snapshot_file))
+
+        records = self.read_journal()
+        if records:
+            frames.append(pd.DataFrame(records))
+
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        return df.drop_duplicates(subset=[self.key], keep='last').reset_index(drop=True)
+
+    def read_journal(self) -> List[Dict]:
+        """Read journal records in one sequential scan"""
+        if not self.journal_file.exists():
+            return []
+
+        records = []
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn line from a crash mid-write
+                    continue
+        return records
+
+    def append(self, record: Dict) -> bool:
+        """
+        Append one record
+
+        Returns:
+            True if this append triggered an fsync
+        """
+        if self._handle is None:
+            self._handle = open(self.journal_file, 'a', encoding='utf-8')
+            # Terminate a torn line left by a crash so the next record stays readable
+            if self._handle.tell() > 0:
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._handle.write("\n")
+
+        self._handle.write(json.dumps(record, ensure_ascii=False, default=json_value) + "\n")
+        self._handle.flush()
+        self.pending += 1
+
+        if self.pending >= self.fsync_every:
+            self.sync()
+            return True
+        return False
+
+    def sync(self):
+        """Force journal contents to disk"""
+        if self._handle is not None and self.pending:
+            os.fsync(self._handle.fileno())
+        self.pending = 0
+
+    def close(self):
+        """Sync and close the journal file"""
+        if self._handle is not None:
+            self.sync()
+            self._handle.close()
+            self._handle = None
+
+    def compact(self) -> pd.DataFrame:
+        """
+        Fold the journal into the snapshot and remove the journal
+
+        The snapshot is replaced atomically (write + rename) before the journal
+        is deleted, so a crash at any point leaves a loadable state.
+
+        Returns:
+            The compacted records
+        """
+        self.close()
+        df = self.load()
+
+        write_frame(df, self.snapshot_file)
+
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+
+        return df
@@ -0,0 +1,309 @@
+"""
+Columnar project data store
+
+Every stage used to hand full DataFrames to the next one through CSV
+(deduplicated.csv -> screening_progress.csv -> all_screened_papers.csv ->
+human_review_queue.csv -> human_review_decisions.csv), re-parsing every
+abstract from text on each load. ProjectStore keeps one typed table per
+hand-off under <project>/data/store/, keyed by paper_id:
+
+- Parquet (pyarrow, see requirements.txt): typed and columnar, so a
+  50k-paper table loads in milliseconds instead of seconds and `columns=`
+  reads only those columns. Nothing is ever unpickled.
+- Writes are atomic (write + rename), so a crash never leaves a torn table.
+- CSV files stay as an optional export view at their usual paths, for
+  spreadsheets and manual review. A CSV view edited by hand (newer than its
+  table) is imported back on the next read; projects that only have CSV
+  files are imported the same way.
+
+Tables:
+    papers                  data/01_identification/deduplicated.csv
+    screening_progress      data/02_screening/screening_progress.csv
+    screened_papers         data/02_screening/all_screened_papers.csv
+    human_review_decisions  data/02_screening/human_review_decisions.csv
+    active_learning         data/02_screening/active_learning.csv
+
+The human review queue and the other zones are not stored separately:
+they are rows of screened_papers selected by `decision`. A table can be
+partitioned on a column (partition_writer()): one file per value in
+data/store/<table>/<column>=<value>.parquet, so reading one zone
+(read(..., where={'decision': ['human-review']})) loads only its file.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from paper_ids import PAPER_ID_DTYPES
+
+STORE_DIR = Path('data') / 'store'
+
+# Table -> CSV view, relative to the project directory
+TABLES = {
+    'papers': Path('data') / '01_identification' / 'deduplicated.csv',
+    'screening_progress': Path('data') / '02_screening' / 'screening_progress.csv',
+    'screened_papers': Path('data') / '02_screening' / 'all_screened_papers.csv',
+    'human_review_decisions': Path('data') / '02_screening' / 'human_review_decisions.csv',
+    'active_learning': Path('data') / '02_screening' / 'active_learning.csv',
+}
+
+TABLE_SUFFIX = '.parquet'
+
+
+def parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Text columns holding mixed values (lists, numbers, NaN) as strings, so Parquet can type them"""
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        if values.map(lambda v: v is None or isinstance(v, str)).all():
+            continue
+        df[column] = values.map(
+            lambda v: None if v is None or (isinstance(v, float) and pd.isna(v))
+            else v if isinstance(v, str)
+            else json.dumps(v, ensure_ascii=False) if isinstance(v, (list, dict))
+            else str(v)
+        )
+    return df
+
+
+def partition_files(path: Path, where: Optional[Dict[str, Iterable]] = None) -> List[Path]:
+    """Partition files of a partitioned table directory, optionally only those matching where"""
+    files = sorted(f for f in Path(path).iterdir() if f.suffix == TABLE_SUFFIX)
+    if not where:
+        return files
+
+    def matches(f: Path) -> bool:
+        column, _, value = f.stem.partition('=')
+        return column not in where or value in {str(v) for v in where[column]}
+
+    return [f for f in files if matches(f)]
+
+
+def read_frame(path: Path, columns: Optional[List[str]] = None,
+               where: Optional[Dict[str, Iterable]] = None) -> pd.DataFrame:
+    """
+    Read a table file: Parquet for .parquet, CSV otherwise
+
+    Args:
+        path: Table file, or directory of a partitioned table
+        columns: Only load these columns
+        where: {column: values} row filter; on a partitioned table, partitions
+            that can't match are not read at all
+    """
+    path = Path(path)
+    where = where or {}
+    load_columns = columns
+    if columns is not None:
+        load_columns = list(columns) + [c for c in where if c not in columns]
+
+    if path.is_dir():
+        files = partition_files(path, where)
+        if not files:
+            # Nothing matches: an empty frame that still has the table's columns
+            files = partition_files(path)[:1]
+            return read_frame(files[0], columns).head(0) if files else pd.DataFrame(columns=columns)
+        df = pd.concat([read_frame(f, load_columns) for f in files], ignore_index=True)
+    elif path.suffix == '.parquet':
+        df = pd.read_parquet(path, columns=load_columns)
+    else:
+        # Paths may come from the command line: anything else is parsed as CSV, never unpickled
+        df = pd.read_csv(path, usecols=load_columns, dtype=PAPER_ID_DTYPES)
+
+    if not where:
+        return df
+    for column, values in where.items():
+        df = df[df[column].astype(str).isin({str(v) for v in values})]
+    return df[columns if columns is not None else df.columns].reset_index(drop=True)
+
+
+def write_frame(df: pd.DataFrame, path: Path):
+    """Write a table file atomically (write + rename); the format follows the suffix"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix(path.suffix + '.tmp')
+    if path.suffix == '.parquet':
+        parquet_safe(df).to_parquet(tmp_file, index=False)
+    else:
+        df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, path)
+
+
+class ProjectStore:
+    """Per-project tables keyed by paper_id, with CSV files as an optional view"""
+
+    def __init__(self, project_path: str, csv_views: bool = True):
+        """
+        Args:
+            project_path: Path to project directory
+            csv_views: Also export each written table to its CSV view
+        """
+        self.project_path = Path(project_path)
+        self.store_dir = self.project_path / STORE_DIR
+        self.csv_views = csv_views
+
+    def table_file(self, table: str) -> Path:
+        """
+        File holding a table: the partition directory if the table is
+        partitioned, else the Parquet file
+        """
+        for path in self._copies(table):
+            if path.exists():
+                return path
+        return self.store_dir / f"{table}{TABLE_SUFFIX}"
+
+    def _copies(self, table: str) -> List[Path]:
+        return [self.store_dir / table, self.store_dir / f"{table}{TABLE_SUFFIX}"]
+
+    def csv_file(self, table: str) -> Path:
+        return self.project_path / TABLES[table]
+
+    def has(self, table: str) -> bool:
+        return self.table_file(table).exists() or self.csv_file(table).exists()
+
+    def refresh(self, table: str) -> bool:
+        """
+        Import the CSV view into the store if it is missing or was edited
+
+        Returns:
+            True if the CSV view was imported
+        """
+        path, csv_file = self.table_file(table), self.csv_file(table)
+        if not csv_file.exists():
+            return False
+        if path.exists() and csv_file.stat().st_mtime <= path.stat().st_mtime:
+            return False
+
+        print(f"   📥 Importing {csv_file.name} into the project store")
+        df = pd.read_csv(csv_file, dtype=PAPER_ID_DTYPES)
+        self._write_table(table, df)
+        self._sync_mtime(table)
+        return True
+
+    def read(self, table: str, columns: Optional[List[str]] = None,
+             where: Optional[Dict[str, Iterable]] = None) -> Optional[pd.DataFrame]:
+        """
+        Read a table
+
+        Args:
+            table: Table name (see TABLES)
+            columns: Only load these columns
+            where: {column: values} row filter, e.g. {'decision': ['human-review']}
+
+        Returns:
+            DataFrame, or None if the project has neither the table nor its CSV view
+        """
+        self.refresh(table)
+        path = self.table_file(table)
+        if not path.exists():
+            return None
+        return read_frame(path, columns, where)
+
+    def write(self, table: str, df: pd.DataFrame, export: Optional[bool] = None):
+        """
+        Replace a table
+
+        Args:
+            table: Table name (see TABLES)
+            df: Table contents
+            export: Export the CSV view too (default: csv_views)
+        """
+        self._write_table(table, df)
+        if self.csv_views if export is None else export:
+            self.export_csv(table, df)
+
+    def upsert(self, table: str, df: pd.DataFrame, key: str = 'paper_id',
+               export: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Insert or replace rows by key (rows in df win)
+
+        Returns:
+            The updated table
+        """
+        existing = self.read(table)
+        if existing is not None and len(existing) > 0:
+            df = pd.concat([existing[~existing[key].isin(df[key])], df], ignore_index=True)
+        self.write(table, df, export)
+        return df
+
+    def export_csv(self, table: str, df: Optional[pd.DataFrame] = None) -> Path:
+        """Write the CSV view of a table (stamped with the table's mtime, so it isn't re-imported)"""
+        if df is None:
+            df = read_frame(self.table_file(table))
+        csv_file = self.csv_file(table)
+        write_frame(df, csv_file)
+        self._sync_mtime(table)
+        return csv_file
+
+    def partition_writer(self, table: str, column: str) -> 'PartitionWriter':
+        """Write a table one partition (value of column) at a time, see PartitionWriter"""
+        return PartitionWriter(self, table, column)
+
+    def _write_table(self, table: str, df: pd.DataFrame):
+        path = self.store_dir / f"{table}{TABLE_SUFFIX}"
+        write_frame(df, path)
+        self._drop_other_copies(table, path)
+
+    def _drop_other_copies(self, table: str, keep: Path):
+        # E.g. an earlier partitioned version of the table
+        for other in self._copies(table):
+            if other != keep and other.is_dir():
+                shutil.rmtree(other)
+            elif other != keep and other.exists():
+                other.unlink()
+
+    def _sync_mtime(self, table: str):
+        csv_file = self.csv_file(table)
+        if csv_file.exists():
+            mtime = self.table_file(table).stat().st_mtime
+            os.utime(csv_file, (mtime, mtime))
+
+
+class PartitionWriter:
+    """
+    Write a table one partition at a time (<column>=<value> files)
+
+    Partitions go to a staging directory as they are written; close() swaps
+    it in for the previous version of the table, so readers never see a mix
+    of old and new partitions. Leaving the with-block on an exception drops
+    the staged partitions and keeps the previous table.
+    """
+
+    def __init__(self, store: ProjectStore, table: str, column: str):
+        self.store = store
+        self.table = table
+        self.column = column
+        self.path = store.store_dir / table
+        self.staging = store.store_dir / f"{table}.partial"
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.staging.mkdir(parents=True)
+
+    def write(self, value, df: pd.DataFrame) -> Path:
+        """Write the rows whose column equals value"""
+        path = self.staging / f"{self.column}={value}{TABLE_SUFFIX}"
+        write_frame(df, path)
+        return path
+
+    def close(self):
+        old = self.store.store_dir / f"{self.table}.old"
+        shutil.rmtree(old, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(self.staging, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+        self.store._drop_other_copies(self.table, self.path)
+
+    def abort(self):
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+    def __enter__(self) -> 'PartitionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
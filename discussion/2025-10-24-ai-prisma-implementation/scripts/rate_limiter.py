@@ -0,0 +1,72 @@
+"""
+Token-bucket rate limiting for concurrent Claude API screening
+
+Used by 03_screen_papers.py when screening with --concurrency > 1. Two buckets
+are kept: one for requests/minute and one for tokens/minute, matching the two
+limits Anthropic enforces per organization.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Refilling token bucket that async callers wait on"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        """
+        Args:
+            rate_per_minute: Refill rate (tokens added per minute)
+            capacity: Maximum burst size (default: one minute of refill)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` tokens are available, then take them"""
+        # A single request larger than the bucket would wait forever
+        amount = min(amount, self.capacity)
+
+        # The lock keeps waiters in FIFO order so large requests are not starved
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """
+        Return unused tokens, or take extra ones when `amount` is negative
+
+        Taking extra tokens can drive the bucket into debt, which makes the
+        next callers wait for the overshoot.
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AsyncRateLimiter:
+    """Combined requests/minute and tokens/minute limiter"""
+
+    def __init__(self, requests_per_minute: int = 50, tokens_per_minute: int = 40000):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int):
+        """Reserve one request slot and an estimated token budget"""
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once real usage is known"""
+        self.tokens.adjust(estimated_tokens - actual_tokens)
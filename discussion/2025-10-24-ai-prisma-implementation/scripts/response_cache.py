@@ -0,0 +1,127 @@
+"""
+Content-addressed cache for Claude screening responses
+
+Keys are a SHA-256 of (model, full prompt, max_tokens), so a paper is only
+re-sent to the API when something that could change the answer changes. The
+cache lives in a single SQLite file shared by all projects
+(default: ~/.cache/scholarag/screening/responses.sqlite3) and evicts the
+least recently used entries once it grows past its size limit.
+
+Only raw response text is stored. Evidence grounding and decision rules are
+re-applied on every hit, so threshold changes in config.yaml take effect
+without invalidating the cache.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "scholarag" / "screening"
+
+
+class ResponseCache:
+    """SQLite-backed response cache with size-based LRU eviction"""
+
+    def __init__(self, cache_dir: str = None, max_size_mb: int = 500):
+        """
+        Args:
+            cache_dir: Directory holding responses.sqlite3
+            max_size_mb: Evict least recently used entries above this size
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.cache_dir / "responses.sqlite3"
+        self.max_bytes = max_size_mb * 1024 * 1024
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        self.conn.commit()
+
+        self.total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key(model: str, prompt: str, max_tokens: int) -> str:
+        """Content address for a request"""
+        payload = json.dumps([model, prompt, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response text, or None on a miss"""
+        row = self.conn.execute(
+            "SELECT text FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        self.conn.commit()
+        return row[0]
+
+    def put(self, key: str, text: str):
+        """Store response text and evict old entries if over the size limit"""
+        size = len(text.encode('utf-8'))
+        previous = self.conn.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, text, size, time.time())
+        )
+        self.conn.commit()
+        self.total_bytes += size - (previous[0] if previous else 0)
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache is at 90% of its limit"""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        )
+
+        doomed = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.conn.commit()
+        self.evictions += len(doomed)
+
+    def print_stats(self):
+        """Print hit/miss counts for the current run"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0.0
+        print(f"\n🗄️  Response cache: {self.hits} hits, {self.misses} misses "
+              f"({hit_rate:.1f}% hit rate)")
+        print(f"   Size: {self.total_bytes / 1024 / 1024:.1f} MB "
+              f"(limit: {self.max_bytes / 1024 / 1024:.0f} MB, evicted this run: {self.evictions})")
+        print(f"   Location: {self.db_file}")
@@ -0,0 +1,263 @@
+"""
+Tolerant JSON extraction and schema validation for screening responses
+
+Claude occasionally wraps its JSON in prose or a ```json fence, leaves a
+trailing comma, or runs out of max_tokens mid-object. A plain json.loads
+turns every one of those into a `decision: 'error'` row and the paper has to
+be screened again at full cost.
+
+JSONExtractor scans text incrementally (it can be fed streamed chunks) and
+returns the first complete top-level JSON value, skipping surrounding prose
+and fences. Truncated output is closed off so the fields that did arrive
+are kept. validate_result() then checks the rubric schema field by field:
+missing or malformed `scores` / `confidence` are reported so the caller can
+ask for just those fields again; everything else is normalized locally.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+SCORE_RANGES = {
+    'domain': (0, 10),
+    'intervention': (0, 10),
+    'method': (0, 5),
+    'outcomes': (0, 10),
+    'exclusion': (-20, 0),
+    'title_bonus': (0, 10),
+}
+DECISIONS = {'auto-include', 'auto-exclude', 'human-review'}
+
+# Schema hints used when asking the model to resend specific fields
+FIELD_HINTS = {
+    'scores': '{"domain": <0-10>, "intervention": <0-10>, "method": <0-5>, '
+              '"outcomes": <0-10>, "exclusion": <-20 to 0>, "title_bonus": <0 or 10>}',
+    'confidence': '<0-100>',
+}
+
+TRAILING_COMMA = re.compile(r',\s*([}\]])')
+DANGLING_KEY = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*:\s*$')
+TRAILING_STRING = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+class JSONExtractor:
+    """Incremental extractor for the first complete top-level JSON value in a text stream"""
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.start = None
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.value = None
+        self.done = False
+        self.repaired = False
+
+    def feed(self, chunk: str):
+        """
+        Consume the next chunk of model output
+
+        Returns:
+            The parsed value once a complete JSON object/array has been seen,
+            otherwise None
+        """
+        if self.done:
+            return self.value
+        self.text += chunk
+
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            self.pos += 1
+
+            if self.start is None:
+                if char in '{[':
+                    self.start = self.pos - 1
+                    self.stack = ['}' if char == '{' else ']']
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.stack.append('}' if char == '{' else ']')
+            elif char in '}]':
+                if char != self.stack[-1]:
+                    self.restart()
+                    continue
+                self.stack.pop()
+                if not self.stack:
+                    value = self.loads(self.text[self.start:self.pos])
+                    if value is not None:
+                        self.value, self.done = value, True
+                        return value
+                    self.restart()
+
+        return None
+
+    def restart(self):
+        """Candidate was not JSON (e.g. braces in prose); rescan after its opening bracket"""
+        self.pos = self.start + 1
+        self.start = None
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+
+    def loads(self, candidate: str):
+        """json.loads with a trailing-comma repair; None if still invalid"""
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        try:
+            value = json.loads(TRAILING_COMMA.sub(r'\1', candidate))
+            self.repaired = True
+            return value
+        except json.JSONDecodeError:
+            return None
+
+    def finish(self):
+        """
+        Signal end of stream
+
+        If the output stopped mid-value (max_tokens), close open strings and
+        brackets and drop a dangling key so the fields that did arrive are kept.
+        """
+        if self.done or self.start is None:
+            return self.value
+
+        candidate = self.text[self.start:]
+        if self.in_string:
+            candidate += '"'
+        candidate = DANGLING_KEY.sub('', candidate.rstrip().rstrip(','))
+        # An object can't end on a key without a value ("..., "evidence_q")
+        key = TRAILING_STRING.search(candidate)
+        if key and self.stack[-1] == '}' and not candidate[:key.start()].rstrip().endswith(':'):
+            candidate = candidate[:key.start()]
+        candidate = candidate.rstrip().rstrip(',') + ''.join(reversed(self.stack))
+
+        value = self.loads(candidate)
+        if value is not None:
+            self.value, self.done, self.repaired = value, True, True
+        return self.value
+
+    @property
+    def had_extra_text(self) -> bool:
+        """True if prose or a code fence surrounded the JSON value"""
+        if not self.done or self.start is None:
+            return False
+        return bool(self.text[:self.start].strip()) or bool(self.text[self.pos:].strip())
+
+
+def extract_json(text: str):
+    """Extract the first JSON value from complete model output"""
+    extractor = JSONExtractor()
+    extractor.feed(text or "")
+    return extractor.finish(), extractor
+
+
+@dataclass
+class ParsedResult:
+    """Outcome of parsing one screening response"""
+    result: Optional[Dict]
+    problems: Dict[str, str] = field(default_factory=dict)  # field -> reason, needs a retry
+    recovered: bool = False  # Needed prose/fence stripping or truncation repair
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None and not self.problems
+
+
+def as_number(value):
+    """Accept ints, floats and numeric strings; None for anything else"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value) if '.' in value else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def validate_result(result) -> Dict[str, str]:
+    """
+    Validate and normalize a screening result in place
+
+    `scores` and `confidence` cannot be recovered locally and are returned as
+    problems. `total_score` is recomputed from the scores when missing, an
+    invalid `decision` is dropped (decision rules recompute it), and
+    `reasoning` / `evidence_quotes` get safe defaults.
+
+    Returns:
+        Mapping of field name to problem description (empty when valid)
+    """
+    if not isinstance(result, dict):
+        return {'scores': 'response is not a JSON object', 'confidence': 'response is not a JSON object'}
+
+    problems = {}
+
+    scores = result.get('scores')
+    if not isinstance(scores, dict):
+        problems['scores'] = 'missing or not an object'
+    else:
+        for dimension, (low, high) in SCORE_RANGES.items():
+            value = as_number(scores.get(dimension))
+            if value is None or not low <= value <= high:
+                problems['scores'] = f'"{dimension}" missing or outside {low}..{high}'
+                break
+            scores[dimension] = value
+
+    confidence = as_number(result.get('confidence'))
+    if confidence is None or not 0 <= confidence <= 100:
+        problems['confidence'] = 'missing or outside 0..100'
+    else:
+        result['confidence'] = confidence
+
+    if 'scores' not in problems:
+        total = as_number(result.get('total_score'))
+        result['total_score'] = total if total is not None else sum(scores[d] for d in SCORE_RANGES)
+
+    if result.get('decision') not in DECISIONS:
+        result.pop('decision', None)
+
+    if not isinstance(result.get('reasoning'), str):
+        result['reasoning'] = ''
+
+    quotes = result.get('evidence_quotes')
+    if isinstance(quotes, str):
+        quotes = [quotes]
+    result['evidence_quotes'] = [q for q in quotes if isinstance(q, str)] if isinstance(quotes, list) else []
+
+    return problems
+
+
+def parse_screening_result(text: str) -> ParsedResult:
+    """Extract and validate a single-paper screening result"""
+    value, extractor = extract_json(text)
+    if not isinstance(value, dict):
+        return ParsedResult(None, {'scores': 'no JSON object found', 'confidence': 'no JSON object found'})
+
+    problems = validate_result(value)
+    return ParsedResult(value, problems, extractor.had_extra_text or extractor.repaired)
+
+
+def merge_repair(parsed: ParsedResult, repair_text: str) -> ParsedResult:
+    """Merge re-sent fields into a partially valid result and re-validate"""
+    fields, _ = extract_json(repair_text)
+    if not isinstance(fields, dict):
+        return parsed
+
+    result = dict(parsed.result or {})
+    result.update({k: v for k, v in fields.items() if k in parsed.problems or k not in result})
+    return ParsedResult(result, validate_result(result), True)
@@ -0,0 +1,237 @@
+"""
+Retry scheduling for Claude API calls
+
+Rate-limit (429), overload (529), 5xx and connection errors are retried
+with full-jitter exponential backoff instead of becoming `error` rows. A
+`retry-after` / `retry-after-ms` header always wins over the computed delay.
+
+A CircuitBreaker shared by all workers opens after several consecutive
+retryable failures and pauses the whole pool until the API recovers, so
+concurrent workers don't keep hammering an overloaded endpoint. In the
+concurrent mode an AdaptiveConcurrency gate additionally shrinks the number
+of requests in flight on rate-limit errors (multiplicative decrease) and
+grows it back while the anthropic-ratelimit-* response headers show spare
+capacity (additive increase).
+
+The SDK's own retries are disabled (max_retries=0) so this module is the
+only place that schedules retries.
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import anthropic
+
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class RetryPolicy:
+    """Which errors to retry, and how long to wait before the next attempt"""
+
+    def __init__(self, max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Args:
+            max_retries: Retries per request before it is recorded as an error
+            base_delay: Backoff ceiling for the first retry (seconds)
+            max_delay: Upper bound for any computed backoff (seconds)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Transient errors: rate limits, overload, 5xx, timeouts, dropped connections"""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        return getattr(error, 'status_code', None) in RETRYABLE_STATUS
+
+    @staticmethod
+    def is_rate_limit(error: Exception) -> bool:
+        return getattr(error, 'status_code', None) in (429, 529)
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """Server-requested wait from retry-after-ms / retry-after headers"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+
+        try:
+            if headers.get('retry-after-ms') is not None:
+                return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than retry-after
+
+        Args:
+            attempt: 0 for the first retry
+            error: The exception that triggered the retry
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(backoff, self.retry_after(error) or 0.0)
+
+
+class CircuitBreaker:
+    """Pauses every worker after repeated retryable failures"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive retryable failures that open the circuit
+            cooldown: Minimum pause once open (seconds); retry-after may extend it
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.trips = 0
+
+    def remaining(self) -> float:
+        """Seconds until the circuit closes again (0 when closed)"""
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self, delay: float):
+        """Count a retryable failure; open the circuit once the threshold is reached"""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            if not self.remaining():
+                self.trips += 1
+                print(f"   🔌 Circuit open: {self.consecutive_failures} consecutive API failures, "
+                      f"pausing all workers for {max(self.cooldown, delay):.1f}s")
+            self.open_until = max(self.open_until, time.monotonic() + max(self.cooldown, delay))
+
+    def wait_sync(self):
+        while self.remaining():
+            time.sleep(self.remaining())
+
+    async def wait(self):
+        while self.remaining():
+            await asyncio.sleep(self.remaining())
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on requests in flight, driven by rate-limit errors and headers"""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = None,
+                 low_headroom: float = 0.1, high_headroom: float = 0.5,
+                 decrease_interval: float = 1.0):
+        """
+        Args:
+            initial: Starting number of requests in flight (--concurrency)
+            minimum: Never go below this many requests in flight
+            maximum: Never grow beyond this (default: initial)
+            low_headroom: Shrink when remaining/limit from headers falls below this
+            high_headroom: Grow only while remaining/limit stays above this
+            decrease_interval: Rate-limit errors within this many seconds of the
+                last decrease count once (a burst of 429s halves the limit once)
+        """
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.low_headroom = low_headroom
+        self.high_headroom = high_headroom
+        self.decrease_interval = decrease_interval
+        self.last_decrease = float('-inf')
+        self.in_flight = 0
+        self.successes = 0
+        self.lowest = initial
+        self._condition = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_rate_limited(self):
+        """Multiplicative decrease"""
+        now = time.monotonic()
+        if now - self.last_decrease < self.decrease_interval:
+            return
+        self.last_decrease = now
+        self.limit = max(self.minimum, self.limit // 2)
+        self.lowest = min(self.lowest, self.limit)
+        self.successes = 0
+
+    def on_success(self, headers: Dict[str, str]):
+        """Additive increase while headers show headroom; back off when they don't"""
+        headroom = self.headroom(headers)
+        if headroom is not None and headroom < self.low_headroom:
+            self.limit = max(self.minimum, self.limit - 1)
+            self.lowest = min(self.lowest, self.limit)
+            self.successes = 0
+            return
+
+        self.successes += 1
+        if self.successes >= self.limit and (headroom is None or headroom > self.high_headroom):
+            self.limit = min(self.maximum, self.limit + 1)
+            self.successes = 0
+
+    @staticmethod
+    def headroom(headers: Dict[str, str]) -> Optional[float]:
+        """Smallest remaining/limit ratio over the request and token rate limits"""
+        ratios = []
+        for kind in ('requests', 'tokens', 'input-tokens', 'output-tokens'):
+            try:
+                remaining = float(headers[f'anthropic-ratelimit-{kind}-remaining'])
+                limit = float(headers[f'anthropic-ratelimit-{kind}-limit'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if limit > 0:
+                ratios.append(remaining / limit)
+        return min(ratios) if ratios else None
+
+
+def create_message(client, request: Dict):
+    """
+    Send a Messages API request and return (response, headers)
+
+    Uses with_raw_response when the client supports it so rate-limit headers
+    are visible; injected stub clients just use create().
+    """
+    raw_api = getattr(client.messages, 'with_raw_response', None)
+    if raw_api is None:
+        return client.messages.create(**request), {}
+    raw = raw_api.create(**request)
+    return raw.parse(), raw.headers
+
+
+async def create_message_async(client, request: Dict):
+    """Async variant of create_message"""
+    raw_api = getattr(client.messages, 'with_raw_response', None)
+    if raw_api is None:
+        return await client.messages.create(**request), {}
+    raw = await raw_api.create(**request)
+    return await raw.parse(), raw.headers
@@ -0,0 +1,231 @@
+"""
+Review queue prioritization for AI-PRISMA Zone 3
+
+03b_human_review.py used to walk the human review queue in file order, so
+easy borderline papers took as much reviewer time as truly ambiguous ones.
+ReviewPrioritizer serves the paper whose human label is expected to teach
+the most, re-ranking the remaining queue after every decision.
+
+Priority (in bits, up to 1 + disagreement_weight) combines:
+- uncertainty: entropy of P(include) from a logistic boundary over the
+  paper's AI confidence and total_score, each measured as a distance to its
+  thresholds (auto-exclude / auto-include confidence from config.yaml; the
+  determine_decision score rules: negative -> exclude, >= 30 -> include)
+- disagreement: |P(include) - P_local(include)| against a local classifier
+  (the active_learning.py model when it has been run, else the keyword
+  rubric of rubric_prescreener; no API call either way)
+
+The boundary starts at the configured thresholds and is refit after each
+human decision (warm-started logistic regression with the thresholds as the
+prior), so papers near where reviewers actually draw the line rise to the
+top and the queue converges on the truly ambiguous papers.
+"""
+
+import math
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from rubric_prescreener import RubricPrescreener
+
+
+# determine_decision: negative total_score -> auto-exclude, >= 30 (with high confidence) -> auto-include
+SCORE_THRESHOLDS = (0, 30)
+PROBABILITY_FLOOR = 1e-6
+
+
+def binary_entropy(p: np.ndarray) -> np.ndarray:
+    """Entropy in bits of a Bernoulli(p)"""
+    p = np.clip(p, PROBABILITY_FLOOR, 1 - PROBABILITY_FLOOR)
+    return -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-np.clip(z, -30, 30)))
+
+
+def threshold_units(x, low: float, high: float) -> np.ndarray:
+    """Distance to the thresholds' midpoint, scaled so low -> -ln 9 and high -> +ln 9 (P = 0.1 / 0.9)"""
+    scale = max((high - low) / (2 * math.log(9)), 1e-6)
+    return (np.asarray(x, dtype=float) - (low + high) / 2) / scale
+
+
+class BoundaryModel:
+    """
+    Logistic P(include | features), refit as human decisions arrive
+
+    Features are threshold units, so the prior (weights summing to 1, no
+    bias) puts the boundary at the configured thresholds. Each update()
+    takes a few Newton steps from the previous fit (warm start), which is
+    exact and cheap for review-sized samples.
+    """
+
+    def __init__(self, n_features: int, prior_weight: float = 4.0):
+        """
+        Args:
+            n_features: Number of features (threshold units)
+            prior_weight: How many maximally uncertain decisions the prior counts for
+        """
+        self.prior = np.append(np.full(n_features, 1.0 / n_features), 0.0)
+        self.params = self.prior.copy()
+        self.prior_precision = prior_weight * 0.25
+        self.rows = []
+        self.labels = []
+
+    def probability(self, features: np.ndarray) -> np.ndarray:
+        """features: (papers, n_features); NaN (missing value) contributes nothing"""
+        return sigmoid(np.nan_to_num(features) @ self.params[:-1] + self.params[-1])
+
+    def update(self, features: np.ndarray, included: bool, steps: int = 3):
+        """Add one decision and refit"""
+        self.rows.append(np.append(np.nan_to_num(features), 1.0))
+        self.labels.append(float(included))
+        X, y = np.array(self.rows), np.array(self.labels)
+
+        for _ in range(steps):
+            p = sigmoid(X @ self.params)
+            gradient = X.T @ (y - p) - self.prior_precision * (self.params - self.prior)
+            hessian = (X.T * (p * (1 - p))) @ X + self.prior_precision * np.eye(len(self.params))
+            self.params = self.params + np.linalg.solve(hessian, gradient)
+
+
+def rubric_classifier(rubric: Dict, low: float = SCORE_THRESHOLDS[0],
+                      high: float = SCORE_THRESHOLDS[1]) -> Optional[Callable[[pd.DataFrame], np.ndarray]]:
+    """
+    Include probability from the local keyword rubric (no API call)
+
+    Args:
+        rubric: ai_prisma_rubric.scoring_rubric section of config.yaml
+        low, high: Rubric scores mapped to P(include) = 0.1 / 0.9
+
+    Returns:
+        Classifier (papers -> probabilities), or None without rubric keywords
+    """
+    prescreener = RubricPrescreener(rubric or {})
+    if prescreener.pattern is None:
+        return None
+    return lambda df: sigmoid(threshold_units(prescreener.score(df)['total_score'], low, high))
+
+
+class ReviewPrioritizer:
+    """Serve queue papers by expected information gain, updating thresholds as decisions arrive"""
+
+    def __init__(self, queue: pd.DataFrame, include_threshold: float = 90,
+                 exclude_threshold: float = 10,
+                 classifier: Optional[Callable[[pd.DataFrame], np.ndarray]] = None,
+                 disagreement_weight: float = 0.5):
+        """
+        Args:
+            queue: Papers to review, with paper_id, confidence and total_score
+            include_threshold: Auto-include confidence threshold (%)
+            exclude_threshold: Auto-exclude confidence threshold (%)
+            classifier: Optional local model, papers -> P(include)
+            disagreement_weight: Weight of disagreement with the local classifier
+        """
+        self.queue = queue
+        self.position = pd.Series(np.arange(len(queue)), index=queue['paper_id'].to_numpy())
+        self.confidence_thresholds = (exclude_threshold, include_threshold)
+        self.features = np.column_stack([
+            threshold_units(pd.to_numeric(queue['confidence'], errors='coerce'), *self.confidence_thresholds),
+            threshold_units(pd.to_numeric(queue['total_score'], errors='coerce'), *SCORE_THRESHOLDS),
+        ])
+        self.model = BoundaryModel(self.features.shape[1])
+        self.local = None
+        if classifier is not None and len(queue) > 0:
+            self.local = np.asarray(classifier(queue), dtype=float)
+        self.disagreement_weight = disagreement_weight
+        self.pending = np.ones(len(queue), dtype=bool)
+
+    @classmethod
+    def from_config(cls, queue: pd.DataFrame, config: Dict,
+                    classifier: Optional[Callable[[pd.DataFrame], np.ndarray]] = None) -> 'ReviewPrioritizer':
+        """
+        Thresholds and rubric from a project's config.yaml (same defaults as 03_screen_papers.py)
+
+        Args:
+            queue: Papers to review
+            config: Project config.yaml contents
+            classifier: Local model to use instead of the keyword rubric
+        """
+        rubric = config.get('ai_prisma_rubric', {})
+        lenient = config.get('project_type', 'systematic_review') == 'knowledge_repository'
+        thresholds = rubric.get('decision_confidence', {})
+        return cls(
+            queue,
+            include_threshold=thresholds.get('auto_include', 50 if lenient else 90),
+            exclude_threshold=thresholds.get('auto_exclude', 20 if lenient else 10),
+            classifier=classifier or rubric_classifier(rubric.get('scoring_rubric', {}))
+        )
+
+    def probability(self) -> np.ndarray:
+        """Current P(include) of every paper in the queue"""
+        return self.model.probability(self.features)
+
+    def priority(self) -> np.ndarray:
+        """Uncertainty + weighted disagreement (bits) of every paper in the queue"""
+        p = self.probability()
+        priority = binary_entropy(p)
+        if self.local is not None:
+            priority += self.disagreement_weight * np.nan_to_num(np.abs(p - self.local))
+        return priority
+
+    def priorities(self) -> pd.Series:
+        """Priority of every paper still pending, highest first"""
+        priority = pd.Series(self.priority()[self.pending], index=self.position.index[self.pending])
+        return priority.sort_values(ascending=False, kind='stable')
+
+    def next_paper(self) -> Optional[str]:
+        """paper_id of the most informative pending paper (None when the queue is done)"""
+        if not self.pending.any():
+            return None
+        priority = np.where(self.pending, self.priority(), -np.inf)
+        return self.position.index[int(np.argmax(priority))]
+
+    def record(self, paper_id: str, human_decision: str):
+        """
+        A human decided on a paper: refit the boundary with the decision
+
+        Args:
+            paper_id: Reviewed paper (papers outside the queue are ignored)
+            human_decision: 'include' or 'exclude'
+        """
+        i = self.position.get(paper_id)
+        if i is None:
+            return
+        self.model.update(self.features[i], str(human_decision).lower().startswith('include'))
+
+    def remove(self, paper_ids: Iterable[str]):
+        """Drop papers from this session's queue without a decision (e.g. reviewed earlier)"""
+        positions = self.position.reindex(list(paper_ids)).dropna().astype(int)
+        self.pending[positions.to_numpy()] = False
+
+    def thresholds(self) -> Dict[str, float]:
+        """
+        Where reviewers draw the line so far: the confidence at which P(include) = 0.5
+        for a paper scored at the score midpoint, and the total_score likewise
+        """
+        w_confidence, w_score, bias = self.model.params
+        estimates = {}
+        for name, weight, (low, high) in (('confidence', w_confidence, self.confidence_thresholds),
+                                          ('total_score', w_score, SCORE_THRESHOLDS)):
+            # A feature reviewers ignore (weight ~ 0) has no meaningful threshold
+            units = -bias / weight if weight > 0.05 else math.nan
+            estimates[name] = round(float((low + high) / 2 + units * (high - low) / (2 * math.log(9))), 1)
+        return estimates
+
+    def __iter__(self) -> Iterator[Tuple[int, pd.Series]]:
+        """
+        (index, row) of the queue in priority order, like DataFrame.iterrows()
+
+        Each paper is yielded once (skipped papers come back next session);
+        record() the decision before asking for the next so it is reflected
+        in the ranking.
+        """
+        while True:
+            paper_id = self.next_paper()
+            if paper_id is None:
+                return
+            i = int(self.position[paper_id])
+            self.pending[i] = False
+            yield self.queue.index[i], self.queue.iloc[i]
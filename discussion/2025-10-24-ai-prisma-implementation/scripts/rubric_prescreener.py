@@ -0,0 +1,132 @@
+"""
+Local rubric pre-screening for AI-PRISMA
+
+Scores the six rubric dimensions from config.yaml directly over title and
+abstract, before any API call. All keywords of all dimensions are compiled
+into a single multi-pattern regex that is run once over each lowercased
+paper through pandas' vectorized string methods; per-dimension scores are
+then aggregated with a groupby instead of per-paper Python loops.
+
+Only papers that the rubric itself marks as clear exclusions are decided
+locally: those matching an exclusion keyword with a -20 penalty ("-20
+penalty = automatic exclusion"). A total that is negative only because of
+softer penalties (e.g. 'medical' -10 with no positive match) is keyword
+evidence, not a clear case, and still goes to Claude like everything else.
+"""
+
+import re
+from typing import Dict
+
+import pandas as pd
+
+
+POSITIVE_DIMENSIONS = {
+    # rubric key: (dimension, max points)
+    'domain_keywords': ('domain', 10),
+    'intervention_keywords': ('intervention', 10),
+    'method_keywords': ('method', 5),
+    'outcome_keywords': ('outcomes', 10),
+}
+HARD_EXCLUSION_PENALTY = -20
+TITLE_BONUS = 10
+
+
+class RubricPrescreener:
+    """Vectorized keyword scoring of the 6-dimension AI-PRISMA rubric"""
+
+    def __init__(self, rubric: Dict):
+        """
+        Args:
+            rubric: ai_prisma_rubric.scoring_rubric section of config.yaml
+        """
+        rows = []
+        for rubric_key, (dimension, max_points) in POSITIVE_DIMENSIONS.items():
+            for kw in rubric.get(rubric_key, []):
+                rows.append((kw['keyword'].lower(), dimension, min(kw['weight'], max_points)))
+        for kw in rubric.get('exclusion_keywords', []):
+            rows.append((kw['keyword'].lower(), 'exclusion', max(kw['penalty'], HARD_EXCLUSION_PENALTY)))
+
+        self.keywords = pd.DataFrame(rows, columns=['keyword', 'dimension', 'points'])
+        self.pattern = self.compile(self.keywords['keyword'])
+        self.domain_pattern = self.compile(
+            self.keywords.loc[self.keywords['dimension'] == 'domain', 'keyword']
+        )
+
+    @staticmethod
+    def compile(keywords: pd.Series):
+        """One alternation for all keywords; longest first so phrases win over prefixes"""
+        unique = sorted(set(keywords), key=len, reverse=True)
+        if not unique:
+            return None
+        alternation = "|".join(re.escape(kw) for kw in unique)
+        # Lookarounds instead of \b so keywords like "K-12" or "pre-post test" match.
+        # Text is lowercased up front, which is ~2.5x faster than re.IGNORECASE.
+        return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every paper on the six rubric dimensions
+
+        Args:
+            df: Papers with `title` and `abstract` columns
+
+        Returns:
+            DataFrame aligned with df.index with one column per dimension plus
+            total_score and matched_exclusions
+        """
+        dimensions = ['domain', 'intervention', 'method', 'outcomes', 'exclusion']
+        scores = pd.DataFrame(0.0, index=df.index, columns=dimensions + ['title_bonus'])
+        scores['matched_exclusions'] = ''
+
+        if self.pattern is not None:
+            text = df['title'].fillna('').astype(str) + "\n" + df['abstract'].fillna('').astype(str)
+            found = text.str.lower().str.findall(self.pattern).explode().dropna()
+
+            if len(found) > 0:
+                hits = pd.DataFrame({'row': found.index, 'keyword': found.values})
+                hits = hits.drop_duplicates().merge(self.keywords, on='keyword')
+
+                is_exclusion = hits['dimension'] == 'exclusion'
+                positive = hits[~is_exclusion].groupby(['row', 'dimension'])['points'].max()
+                exclusion = hits[is_exclusion].groupby('row')['points'].min()
+
+                scores.update(positive.unstack())
+                scores['exclusion'] = exclusion.reindex(df.index).fillna(0)
+                scores['matched_exclusions'] = (
+                    hits[is_exclusion].groupby('row')['keyword'].agg(', '.join)
+                    .reindex(df.index).fillna('')
+                )
+
+        if self.domain_pattern is not None:
+            in_title = df['title'].fillna('').astype(str).str.lower().str.contains(self.domain_pattern)
+            scores['title_bonus'] = in_title.astype(int) * TITLE_BONUS
+
+        score_columns = dimensions + ['title_bonus']
+        scores[score_columns] = scores[score_columns].astype(int)
+        scores['total_score'] = scores[score_columns].sum(axis=1)
+        return scores
+
+    def clear_exclusions(self, scores: pd.DataFrame) -> pd.Series:
+        """Boolean mask of papers the rubric excludes without needing an LLM (hard -20 penalty)"""
+        return scores['exclusion'] <= HARD_EXCLUSION_PENALTY
+
+    @staticmethod
+    def to_result(score_row: pd.Series) -> Dict[str, any]:
+        """Convert a pre-screen score row into a screen_paper-style result"""
+        return {
+            'scores': {
+                'domain': int(score_row['domain']),
+                'intervention': int(score_row['intervention']),
+                'method': int(score_row['method']),
+                'outcomes': int(score_row['outcomes']),
+                'exclusion': int(score_row['exclusion']),
+                'title_bonus': int(score_row['title_bonus'])
+            },
+            'total_score': int(score_row['total_score']),
+            'confidence': 100,
+            'decision': 'auto-exclude',
+            'reasoning': (f"Local rubric pre-screen: exclusion keyword(s) matched "
+                          f"({score_row['matched_exclusions']}; penalty {int(score_row['exclusion'])}). "
+                          f"Decided without an API call."),
+            'evidence_quotes': []
+        }
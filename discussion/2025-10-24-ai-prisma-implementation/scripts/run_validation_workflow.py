@@ -26,6 +26,9 @@ import sys
 import subprocess
 import random
 
+from paper_ids import assign_paper_ids
+from project_store import ProjectStore
+
 
 class ValidationWorkflow:
     """Orchestrate complete validation workflow"""
@@ -35,23 +38,22 @@ class ValidationWorkflow:
         self.sample_size = sample_size
         self.review_mode = review_mode
         self.data_dir = self.project_path / "data" / "02_screening"
+        self.store = ProjectStore(project_path)
 
         # File paths
-        self.ai_decisions_file = self.data_dir / "all_screened_papers.csv"
-        self.human_review_queue_file = self.data_dir / "human_review_queue.csv"
-        self.human_decisions_file = self.data_dir / "human_review_decisions.csv"
+        self.human_decisions_file = self.store.csv_file('human_review_decisions')
         self.sample_file = self.data_dir / "validation_sample.csv"
         self.kappa_report_file = self.data_dir / "kappa_report.md"
 
     def check_prerequisites(self):
         """Check that AI screening has been completed"""
-        if not self.ai_decisions_file.exists():
+        if not self.store.has('screened_papers'):
             print("❌ Error: AI screening not found")
-            print(f"   Expected: {self.ai_decisions_file}")
+            print(f"   Expected: {self.store.table_file('screened_papers')}")
             print("   Run screening first: python scripts/03_screen_papers.py")
             sys.exit(1)
 
-        print(f"✓ Found AI screening results: {self.ai_decisions_file}")
+        print(f"✓ Found AI screening results: {self.store.table_file('screened_papers')}")
 
     def create_validation_sample(self):
         """Create stratified random sample for validation"""
@@ -59,12 +61,12 @@ class ValidationWorkflow:
         print(f"\n📋 Creating validation sample...")
 
         # Load AI decisions
-        df_ai = pd.read_csv(self.ai_decisions_file)
+        df_ai = self.store.read('screened_papers')
         print(f"   Total papers: {len(df_ai)}")
 
         # Check if we should sample from human review queue or all papers
-        if self.human_review_queue_file.exists():
-            df_queue = pd.read_csv(self.human_review_queue_file)
+        df_queue = df_ai[df_ai['decision'] == 'human-review']
+        if len(df_queue) > 0:
             print(f"   Human review queue: {len(df_queue)} papers (11-89% confidence)")
 
             # Sample from queue (priority)
@@ -119,11 +121,7 @@ class ValidationWorkflow:
             df_sample = pd.concat(samples, ignore_index=True)
 
         # Add paper_id if not present (needed for Cohen's Kappa)
-        if 'paper_id' not in df_sample.columns:
-            df_sample['paper_id'] = df_sample.apply(
-                lambda row: f"{row['title']}_{row.get('year', 'unknown')}",
-                axis=1
-            )
+        df_sample = assign_paper_ids(df_sample)
 
         # Save sample
         df_sample.to_csv(self.sample_file, index=False)
@@ -166,27 +164,23 @@ class ValidationWorkflow:
 
         print(f"\n📊 Calculating Cohen's Kappa...")
 
-        # Check human decisions exist
-        if not self.human_decisions_file.exists():
+        # Check human decisions exist (a hand-edited CSV view is imported first)
+        df_human = self.store.read('human_review_decisions')
+        if df_human is None:
             print(f"❌ Error: Human decisions not found")
             print(f"   Expected: {self.human_decisions_file}")
             print(f"   Run human review first")
             sys.exit(1)
 
         # Prepare AI decisions for validation
-        # Read human decisions to get paper_ids
-        df_human = pd.read_csv(self.human_decisions_file)
+        # Human decisions give the paper_ids
         paper_ids = set(df_human['paper_id'])
 
         # Read AI decisions and filter to matching papers
-        df_ai = pd.read_csv(self.ai_decisions_file)
+        df_ai = self.store.read('screened_papers')
 
         # Add paper_id if not present
-        if 'paper_id' not in df_ai.columns:
-            df_ai['paper_id'] = df_ai.apply(
-                lambda row: f"{row['title']}_{row.get('year', 'unknown')}",
-                axis=1
-            )
+        df_ai = assign_paper_ids(df_ai)
 
         # Filter to validation sample
         df_ai_sample = df_ai[df_ai['paper_id'].isin(paper_ids)].copy()
@@ -207,7 +201,7 @@ class ValidationWorkflow:
             'python3',
             'scripts/validate_human_ai_agreement.py',
             '--ai-decisions', str(ai_for_validation_file),
-            '--human-validation', str(self.human_decisions_file),
+            '--human-validation', str(self.store.table_file('human_review_decisions')),
             '--output', str(self.kappa_report_file)
         ]
 
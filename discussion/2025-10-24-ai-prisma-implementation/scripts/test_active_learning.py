@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Active-Learning Loop Test (no API key required)
+
+Builds a synthetic project (separable include/exclude vocabularies, part of
+it screened, a few human decisions) in a temporary directory and runs the
+active-learning loop on it.
+
+Usage:
+    python scripts/test_active_learning.py
+
+Tests:
+    1. Human decisions override AI auto-zone labels, at full weight
+    2. Papers are split into resolved (auto-include/exclude) and routed (llm/human)
+    3. --apply turns resolutions into screening results the later stages read
+    4. --apply is refused when confident predictions contradict human decisions
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+from active_learning import ActiveLearner, ActiveLearningLoop
+from project_store import ProjectStore
+
+
+INCLUDE_WORDS = "chatbot conversational agent speaking practice learners fluency dialogue tutor".split()
+EXCLUDE_WORDS = "protein genome surgery tumor cell imaging dosage patients mice clinical".split()
+COMMON_WORDS = "study results method analysis data effect approach evaluation".split()
+
+
+class ActiveLearningTester:
+    """Test labelling, routing and applying on a synthetic project"""
+
+    def __init__(self):
+        self.project = Path(tempfile.mkdtemp(prefix='active_learning_test_'))
+        self.store = ProjectStore(self.project)
+
+    def setup(self, n_papers: int = 800, n_screened: int = 500, n_human: int = 60,
+              flip_human: float = 0.0):
+        """Papers with a hidden label; the first n_screened screened, some reviewed by a human"""
+        shutil.rmtree(self.project / 'data', ignore_errors=True)
+        rng = random.Random(0)
+
+        papers = []
+        for i in range(n_papers):
+            include = rng.random() < 0.4
+            vocabulary = INCLUDE_WORDS if include else EXCLUDE_WORDS
+            words = [rng.choice(vocabulary) if rng.random() < 0.5 else rng.choice(COMMON_WORDS)
+                     for _ in range(40)]
+            papers.append({'paper_id': f"p{i:04d}", 'title': " ".join(words[:8]),
+                           'abstract': " ".join(words), 'year': 2024, 'include': include})
+        self.papers = pd.DataFrame(papers)
+
+        progress = []
+        for paper in papers[:n_screened]:
+            ai_confident = rng.random() < 0.7
+            decision = ('auto-include' if paper['include'] else 'auto-exclude') if ai_confident \
+                else 'human-review'
+            progress.append({
+                'paper_id': paper['paper_id'], 'title': paper['title'],
+                'domain_score': 5, 'intervention_score': 5, 'method_score': 3, 'outcomes_score': 5,
+                'exclusion_score': 0, 'title_bonus': 0, 'total_score': 18,
+                'confidence': {'auto-include': 95, 'auto-exclude': 5}.get(decision, 50),
+                'decision': decision, 'reasoning': 'Synthetic screening result.'
+            })
+        progress = pd.DataFrame(progress)
+
+        queue = progress[progress['decision'] == 'human-review'].head(n_human)
+        truth = self.papers.set_index('paper_id')['include'].reindex(queue['paper_id'])
+        flipped = pd.Series([rng.random() < flip_human for _ in range(len(queue))], index=truth.index)
+        decisions = pd.DataFrame({
+            'paper_id': queue['paper_id'].to_numpy(),
+            'human_decision': (truth ^ flipped).map({True: 'include', False: 'exclude'}).to_numpy(),
+        })
+
+        (self.project / 'config.yaml').write_text(yaml.safe_dump({
+            'research_question': 'How do chatbots support speaking practice?',
+            'ai_prisma_rubric': {'scoring_rubric': {
+                'intervention_keywords': [{'keyword': 'chatbot', 'weight': 10}],
+                'exclusion_keywords': [{'keyword': 'tumor', 'penalty': -20}],
+            }},
+        }))
+        self.store.write('papers', self.papers.drop(columns='include'))
+        self.store.write('screening_progress', progress, export=False)
+        self.store.write('screened_papers',
+                         self.papers.drop(columns='include').merge(progress.drop(columns='title'),
+                                                                   on='paper_id'))
+        self.store.write('human_review_decisions', decisions)
+        return progress, decisions
+
+    def test_labels(self) -> bool:
+        progress, decisions = self.setup()
+        # A human decision on an auto-zone paper wins over the AI label
+        overridden = progress[progress['decision'] == 'auto-exclude'].iloc[0]['paper_id']
+        decisions = pd.concat([decisions, pd.DataFrame([{'paper_id': overridden,
+                                                         'human_decision': 'include'}])])
+
+        labels = ActiveLearner.labelled(self.papers[['paper_id', 'title', 'abstract']],
+                                        progress, decisions).set_index('paper_id')
+        row = labels.loc[overridden]
+        expected = int((progress['decision'] != 'human-review').sum()) + len(decisions) - 1
+        if labels.index.duplicated().any() or len(labels) != expected \
+                or (row['label'], row['weight'], row['source']) != (1, 1.0, 'human'):
+            print(f"❌ TEST 1 FAILED: {len(labels)} labels (expected {expected}), override {row.to_dict()}")
+            return False
+        print(f"✅ TEST 1 PASSED: {len(labels)} labels, human decisions override AI labels")
+        return True
+
+    def test_routing(self) -> bool:
+        learner = ActiveLearner(threshold=0.9)
+        learner.predict = lambda df: df['p'].to_numpy()  # Fixed probabilities instead of a fitted model
+        df = pd.DataFrame({'paper_id': ['a', 'b', 'c', 'd', 'e'], 'p': [0.97, 0.9, 0.5, 0.1, 0.02]})
+
+        routes = learner.route(df, 'human')
+        expected = ['auto-include', 'auto-include', 'human', 'auto-exclude', 'auto-exclude']
+        if routes['route'].tolist() != expected or learner.route(df.head(0), 'llm').shape[0] != 0:
+            print(f"❌ TEST 2 FAILED: {routes['route'].tolist()} != {expected}")
+            return False
+        print("✅ TEST 2 PASSED: confident papers resolved at the threshold, the rest routed")
+        return True
+
+    def test_apply(self) -> bool:
+        self.setup()
+        routes = ActiveLearningLoop(str(self.project), threshold=0.95).run(apply=True)
+        if routes is None or not routes['applied'].any():
+            print("❌ TEST 3 FAILED: nothing applied")
+            return False
+
+        resolved = routes[routes['applied']].set_index('paper_id')
+        progress = self.store.read('screening_progress').set_index('paper_id')
+        screened = self.store.read('screened_papers').set_index('paper_id')
+        queue = set(self.store.read('screened_papers', where={'decision': ['human-review']})['paper_id'])
+        truth = self.papers.set_index('paper_id')['include']
+
+        results = screened.reindex(resolved.index)
+        score_columns = ['total_score', 'domain_score', 'intervention_score', 'method_score',
+                         'outcomes_score', 'exclusion_score', 'title_bonus', 'confidence']
+        problems = []
+        if not resolved.index.isin(progress.index).all():
+            problems.append("resolved papers missing from screening_progress (03 would screen them)")
+        if (results['decision'] != resolved['route']).any():
+            problems.append("screened_papers decisions differ from the routes")
+        if resolved.index.isin(list(queue)).any():
+            problems.append("resolved papers still in the human review queue")
+        if results[score_columns].isna().any().any():
+            problems.append("resolved papers have missing scores")
+        accuracy = ((results['decision'] == 'auto-include') == truth.reindex(results.index)).mean()
+        if accuracy < 0.95:
+            problems.append(f"accuracy {accuracy:.1%}")
+        routed = routes[~routes['applied']]
+        if (routed['route'] != routed['stage']).any() \
+                or routed.loc[routed['stage'] == 'llm', 'paper_id'].isin(progress.index).any():
+            problems.append("unresolved papers not left to their stage")
+
+        if problems:
+            print(f"❌ TEST 3 FAILED: {'; '.join(problems)}")
+            return False
+        counts = resolved['stage'].value_counts()
+        print(f"✅ TEST 3 PASSED: {counts.get('llm', 0)} unscreened and {counts.get('human', 0)} queue "
+              f"papers resolved ({accuracy:.1%} correct), {len(routed)} routed on")
+        return True
+
+    def test_refused(self) -> bool:
+        self.setup(flip_human=0.3)
+        before = self.store.read('screening_progress')
+        routes = ActiveLearningLoop(str(self.project), threshold=0.95).run(apply=True)
+        after = self.store.read('screening_progress')
+        if routes is None or routes['applied'].any() or len(after) != len(before):
+            print("❌ TEST 4 FAILED: resolutions applied despite contradicting human decisions")
+            return False
+        print("✅ TEST 4 PASSED: --apply refused with 30% of human decisions contradicting the model")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("ACTIVE-LEARNING LOOP TEST (synthetic project)")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_labels(),
+                self.test_routing(),
+                self.test_apply(),
+                self.test_refused(),
+            ])
+        finally:
+            shutil.rmtree(self.project, ignore_errors=True)
+
+
+def main():
+    tester = ActiveLearningTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
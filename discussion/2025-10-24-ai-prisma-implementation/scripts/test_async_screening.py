@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Concurrent Screening Test (no API key required)
+
+Runs PaperScreener's concurrent mode against a local stub client so the
+async engine, rate limiter and progress file can be checked offline.
+Uses the test project created by test_ai_prisma_scoring.py.
+
+Usage:
+    python scripts/test_async_screening.py [--concurrency 4] [--latency 0.2]
+
+Tests:
+    1. Concurrent screening finishes every paper without errors
+    2. Progress file has exactly one row per paper
+    3. Concurrent run is faster than the sequential equivalent
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+
+sys.path.insert(0, str(Path(__file__).parent))
+screen_papers = importlib.import_module('03_screen_papers')
+
+
+STUB_RESULT = {
+    'scores': {'domain': 10, 'intervention': 10, 'method': 5,
+               'outcomes': 10, 'exclusion': 0, 'title_bonus': 10},
+    'total_score': 45,
+    'confidence': 95,
+    'decision': 'auto-include',
+    'reasoning': 'Stub response',
+    'evidence_quotes': []
+}
+
+
+class StubAsyncClient:
+    """Mimics anthropic.AsyncAnthropic().messages.create with fixed latency"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.messages = self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=json.dumps(STUB_RESULT))],
+            usage=SimpleNamespace(input_tokens=800, output_tokens=200)
+        )
+
+
+class AsyncScreeningTester:
+    """Test concurrent screening against a stub client"""
+
+    def __init__(self, concurrency: int, latency: float):
+        self.source_project = Path('/tmp/scholarag/test_projects/ai-prisma-test')
+        self.test_project = Path('/tmp/scholarag/test_projects/ai-prisma-async-test')
+        self.concurrency = concurrency
+        self.latency = latency
+
+    def setup(self):
+        """Copy the test project so real screening output is not touched"""
+        if not self.source_project.exists():
+            print(f"❌ Test project not found: {self.source_project}")
+            print(f"   Run: python scripts/test_ai_prisma_scoring.py")
+            sys.exit(1)
+
+        if self.test_project.exists():
+            shutil.rmtree(self.test_project)
+        shutil.copytree(self.source_project, self.test_project)
+        shutil.rmtree(self.test_project / 'data' / '02_screening', ignore_errors=True)
+        shutil.rmtree(self.test_project / 'data' / 'store', ignore_errors=True)
+        print(f"✓ Test project copied to: {self.test_project}")
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("CONCURRENT SCREENING TEST (stub client)")
+        print("="*70)
+
+        self.setup()
+
+        client = StubAsyncClient(self.latency)
+        screener = screen_papers.PaperScreener(
+            str(self.test_project),
+            'How do AI chatbots improve speaking proficiency in second language learning?',
+            client=object(),
+            async_client=client
+        )
+        df = screener.load_papers()
+
+        start = time.perf_counter()
+        df = screener.screen_all_papers(
+            df,
+            batch_size=2,
+            concurrency=self.concurrency,
+            requests_per_minute=6000,
+            tokens_per_minute=10_000_000
+        )
+        elapsed = time.perf_counter() - start
+
+        errors = (df['decision'] == 'error').sum()
+        if errors or df['decision'].isna().any():
+            print(f"❌ TEST 1 FAILED: {errors} errors, {df['decision'].isna().sum()} unscreened")
+            return False
+        print(f"\n✅ TEST 1 PASSED: {len(df)} papers screened "
+              f"(max in flight: {client.max_in_flight})")
+
+        progress = screener.store.read('screening_progress')
+        if len(progress) != len(df):
+            print(f"❌ TEST 2 FAILED: progress has {len(progress)} rows, expected {len(df)}")
+            return False
+        print(f"✅ TEST 2 PASSED: progress file has {len(progress)} rows")
+
+        sequential = client.calls * self.latency
+        if self.concurrency > 1 and elapsed >= sequential:
+            print(f"❌ TEST 3 FAILED: {elapsed:.2f}s concurrent vs {sequential:.2f}s sequential")
+            return False
+        print(f"✅ TEST 3 PASSED: {elapsed:.2f}s concurrent vs {sequential:.2f}s sequential")
+
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test concurrent screening with a stub client")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.2,
+                        help='Simulated API latency in seconds (default: 0.2)')
+    args = parser.parse_args()
+
+    tester = AsyncScreeningTester(args.concurrency, args.latency)
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
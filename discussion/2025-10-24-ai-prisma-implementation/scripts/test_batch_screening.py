@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Batch Screening Test (no API key required)
+
+Screens the test project with --backend batch through the real Anthropic
+SDK pointed at fake_anthropic_server.py (Message Batches endpoints), and
+kills the run at the points where a crash costs money. Uses the test project
+created by test_ai_prisma_scoring.py.
+
+Usage:
+    python scripts/test_batch_screening.py
+
+Tests:
+    1. Submit, poll and collect: every paper screened, batches marked processed
+    2. Killed after submit: the resumed run collects the batches from batch_state.json
+    3. Killed mid-collect: recorded results are kept, the rest collected, nothing resubmitted
+"""
+
+import importlib
+import json
+import shutil
+import sys
+from pathlib import Path
+from unittest import mock
+
+import anthropic
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+screen_papers = importlib.import_module('03_screen_papers')
+from batch_screening import BatchScreener
+from fake_anthropic_server import FakeAnthropicServer
+
+
+class Crash(BaseException):
+    """The screening process is killed (not an Exception, so nothing catches it)"""
+
+
+class BatchScreeningTester:
+    """Test the Message Batches backend and its crash recovery against a fake server"""
+
+    def __init__(self):
+        self.source_project = Path('/tmp/scholarag/test_projects/ai-prisma-test')
+        self.test_project = Path('/tmp/scholarag/test_projects/ai-prisma-batch-test')
+        self.server = None
+
+    def setup(self):
+        """Fresh copy of the test project (no screening output) and a fresh fake server"""
+        if not self.source_project.exists():
+            print(f"❌ Test project not found: {self.source_project}")
+            print(f"   Run: python scripts/test_ai_prisma_scoring.py")
+            sys.exit(1)
+
+        if self.test_project.exists():
+            shutil.rmtree(self.test_project)
+        shutil.copytree(self.source_project, self.test_project)
+        shutil.rmtree(self.test_project / 'data' / '02_screening', ignore_errors=True)
+        shutil.rmtree(self.test_project / 'data' / 'store', ignore_errors=True)
+
+        if self.server is not None:
+            self.server.shutdown()
+        self.server = FakeAnthropicServer(batch_latency=0.1).start()
+
+    def screen(self):
+        """One screening run (a new process: new screener, state read from disk)"""
+        screener = screen_papers.PaperScreener(
+            str(self.test_project),
+            'How do AI chatbots improve speaking proficiency in second language learning?',
+            client=anthropic.Anthropic(api_key='test', base_url=self.server.url, max_retries=0)
+        )
+        df = screener.load_papers()
+        # Two jobs for the six test papers
+        with mock.patch.object(BatchScreener, 'max_requests_per_batch', 4):
+            return screener, screener.screen_all_papers(df, backend='batch', poll_interval=0.05)
+
+    def crashed_run(self, target, attribute: str, after: int = 0) -> bool:
+        """Run until target.attribute is called for the (after + 1)-th time, then crash"""
+        original = getattr(target, attribute)
+        calls = []
+
+        def crash(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > after:
+                raise Crash
+            return original(*args, **kwargs)
+
+        with mock.patch.object(target, attribute, crash):
+            try:
+                self.screen()
+            except Crash:
+                return True
+        return False
+
+    def state(self) -> list:
+        state_file = self.test_project / 'data' / '02_screening' / 'batch_state.json'
+        return json.loads(state_file.read_text())['batches'] if state_file.exists() else []
+
+    def check_complete(self, df, test: int) -> bool:
+        """Every paper screened once, every batch processed, no batch submitted twice"""
+        progress = self.screener.store.read('screening_progress')
+        state = self.state()
+        submitted = [custom_id for batch in state for custom_id in batch['custom_ids']]
+        problems = []
+        if (df['decision'] == 'error').any() or df['decision'].isna().any():
+            problems.append(f"decisions {df['decision'].tolist()}")
+        if len(progress) != len(df) or progress['paper_id'].duplicated().any():
+            problems.append(f"{len(progress)} progress rows for {len(df)} papers")
+        exported = pd.read_csv(self.screener.store.csv_file('screening_progress'))
+        if sorted(exported['paper_id']) != sorted(progress['paper_id']):
+            problems.append(f"{len(exported)} rows in the screening_progress CSV view")
+        if len(state) != 2 or any(b['status'] != 'processed' for b in state):
+            problems.append(f"batch state {[b['status'] for b in state]}")
+        if self.server.batch_calls['create'] != 2 or sorted(submitted) != sorted(df['paper_id']):
+            problems.append(f"{self.server.batch_calls['create']} batches created")
+
+        if problems:
+            print(f"❌ TEST {test} FAILED: {'; '.join(problems)}")
+            return False
+        return True
+
+    def test_full_run(self) -> bool:
+        self.setup()
+        self.screener, df = self.screen()
+        if not self.check_complete(df, 1):
+            return False
+        print(f"✅ TEST 1 PASSED: {len(df)} papers in 2 batches, "
+              f"{self.server.batch_calls['retrieve']} status checks, all processed")
+        return True
+
+    def test_crash_after_submit(self) -> bool:
+        self.setup()
+        # Killed when the first job ends, before collecting it: both jobs exist, nothing recorded
+        if not self.crashed_run(BatchScreener, 'collect'):
+            print("❌ TEST 2 FAILED: run did not reach collection")
+            return False
+        statuses = [batch['status'] for batch in self.state()]
+        if statuses != ['submitted', 'submitted']:
+            print(f"❌ TEST 2 FAILED: batch state after the crash {statuses}")
+            return False
+
+        self.screener, df = self.screen()
+        if not self.check_complete(df, 2):
+            return False
+        print("✅ TEST 2 PASSED: resumed from batch_state.json, outstanding batches collected, "
+              "none resubmitted")
+        return True
+
+    def test_crash_mid_collect(self) -> bool:
+        self.setup()
+        # Killed while parsing the 3rd result: two papers of the first job are journaled
+        if not self.crashed_run(screen_papers.PaperScreener, 'process_response', after=2):
+            print("❌ TEST 3 FAILED: run did not reach collection")
+            return False
+        journaled = self.test_project / 'data' / '02_screening' / 'screening_progress.jsonl'
+        recorded = [json.loads(line)['paper_id'] for line in journaled.read_text().splitlines()]
+        if len(recorded) != 2:
+            print(f"❌ TEST 3 FAILED: {len(recorded)} results journaled before the crash")
+            return False
+
+        self.screener, df = self.screen()
+        if not self.check_complete(df, 3):
+            return False
+        print(f"✅ TEST 3 PASSED: {len(recorded)} results kept across the crash, "
+              f"the other {len(df) - len(recorded)} collected once")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("BATCH SCREENING TEST (fake server)")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_full_run(),
+                self.test_crash_after_submit(),
+                self.test_crash_mid_collect(),
+            ])
+        finally:
+            if self.server is not None:
+                self.server.shutdown()
+
+
+def main():
+    tester = BatchScreeningTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Evidence Grounding Test (no API key required)
+
+Checks that GroundingIndex accepts faithful quotes with small edits,
+rejects quotes the abstract doesn't support, and reports the right offsets.
+
+Usage:
+    python scripts/test_evidence_grounding.py
+
+Tests:
+    1. Verbatim quotes match exactly, with offsets into the original abstract
+    2. Quotes with a dropped word, an inserted function word or a changed inflection stay grounded
+    3. Elided quotes ("...") are grounded part by part
+    4. Unsupported quotes are not grounded, including one-word changes of the claim
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from evidence_grounding import GroundingIndex
+
+
+ABSTRACT = ("Students who used the AI chatbot improved their speaking fluency by 25% "
+            "compared with the control group. Anxiety scores decreased significantly.")
+OTHER_ABSTRACT = ("Chatbot practice significantly improved speaking fluency. "
+                  "Grammar accuracy did not improve.")
+
+
+class EvidenceGroundingTester:
+    """Test fuzzy quote grounding against one abstract"""
+
+    def __init__(self):
+        self.indexes = {abstract: GroundingIndex(abstract) for abstract in (ABSTRACT, OTHER_ABSTRACT)}
+
+    def check(self, test: str, quote: str, grounded: bool, span: str = None, abstract: str = ABSTRACT) -> bool:
+        """Match a quote; optionally check the abstract text at the returned offsets"""
+        match = self.indexes[abstract].match(quote)
+        found = abstract[match.start:match.end] if match.start is not None else None
+        if match.grounded != grounded or (span is not None and found != span):
+            print(f"❌ {test} FAILED: {quote!r} -> grounded={match.grounded}, "
+                  f"score={match.score:.2f}, span={found!r}")
+            return False
+        return True
+
+    def test_exact(self) -> bool:
+        ok = all([
+            self.check("TEST 1", "used the AI chatbot", True, "used the AI chatbot"),
+            self.check("TEST 1", "Speaking fluency by 25%", True, "speaking fluency by 25"),
+            self.check("TEST 1", "anxiety scores decreased", True, "Anxiety scores decreased"),
+        ])
+        if ok:
+            print("✅ TEST 1 PASSED: verbatim quotes grounded at the right offsets")
+        return ok
+
+    def test_small_edits(self) -> bool:
+        ok = all([
+            # Dropped word: no trigram in common with the abstract
+            self.check("TEST 2", "improved speaking fluency", True, "improved their speaking fluency"),
+            self.check("TEST 2", "chatbot improved speaking fluency", True,
+                       "chatbot improved their speaking fluency"),
+            self.check("TEST 2", "used the chatbot improved", True, "used the AI chatbot improved"),
+            # Changed inflection
+            self.check("TEST 2", "AI chatbot improves their speaking fluency", True,
+                       "AI chatbot improved their speaking fluency"),
+            self.check("TEST 2", "anxiety score decreasing", True, "Anxiety scores decreased"),
+            # Inserted function word
+            self.check("TEST 2", "used the AI chatbot and improved their speaking fluency", True,
+                       "used the AI chatbot improved their speaking fluency"),
+            self.check("TEST 2", "chatbot practice improved speaking fluency", True,
+                       "Chatbot practice significantly improved speaking fluency", OTHER_ABSTRACT),
+        ])
+        if ok:
+            print("✅ TEST 2 PASSED: dropped, inserted function and inflected words tolerated")
+        return ok
+
+    def test_elisions(self) -> bool:
+        ok = all([
+            self.check("TEST 3", "Students who used the AI chatbot … speaking fluency by 25%", True,
+                       "Students who used the AI chatbot improved their speaking fluency by 25"),
+            self.check("TEST 3", "used the AI chatbot ... anxiety scores decreased", True,
+                       ABSTRACT[ABSTRACT.index("used"):ABSTRACT.index(" significantly")]),
+            self.check("TEST 3", "used the AI chatbot [...] writing accuracy doubled", False),
+        ])
+        if ok:
+            print("✅ TEST 3 PASSED: elided quotes grounded part by part")
+        return ok
+
+    def test_unsupported(self) -> bool:
+        ok = all([
+            self.check("TEST 4", "improved speaking accuracy", False),
+            self.check("TEST 4", "chatbot never improved fluency", False),
+            self.check("TEST 4", "the control group improved their writing accuracy", False),
+            self.check("TEST 4", "teachers preferred the robot tutor", False),
+            # One word away from the abstract, but a different claim
+            self.check("TEST 4", "students who used the AI chatbot greatly improved their speaking fluency", False),
+            self.check("TEST 4", "students who used the AI chatbot never improved their speaking fluency", False),
+            self.check("TEST 4", "chatbot practice never improved speaking fluency", False,
+                       abstract=OTHER_ABSTRACT),
+            self.check("TEST 4", "significantly improved writing fluency", False, abstract=OTHER_ABSTRACT),
+            self.check("TEST 4", "grammar accuracy did improve", False, abstract=OTHER_ABSTRACT),
+        ])
+        if ok:
+            print("✅ TEST 4 PASSED: unsupported quotes rejected")
+        return ok
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("EVIDENCE GROUNDING TEST")
+        print("="*70)
+
+        return all([
+            self.test_exact(),
+            self.test_small_edits(),
+            self.test_elisions(),
+            self.test_unsupported(),
+        ])
+
+
+def main():
+    tester = EvidenceGroundingTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
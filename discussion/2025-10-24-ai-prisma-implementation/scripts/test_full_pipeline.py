@@ -25,6 +25,8 @@ import subprocess
 import sys
 import os
 
+from paper_ids import assign_paper_ids
+
 
 class PipelineTester:
     """Test complete AI-PRISMA pipeline"""
@@ -237,10 +239,7 @@ class PipelineTester:
             print(f"Creating mock decisions for {len(df_queue)} papers")
 
             # Create paper_id
-            df_queue['paper_id'] = df_queue.apply(
-                lambda row: f"{row['title']}_{row.get('year', 'unknown')}",
-                axis=1
-            )
+            df_queue = assign_paper_ids(df_queue)
 
             # Mock human decisions (agree with AI 70% of the time)
             mock_decisions = []
@@ -316,11 +315,7 @@ class PipelineTester:
             df_ai = pd.read_csv(self.data_dir / 'all_screened_papers.csv')
 
             # Add paper_id if not present
-            if 'paper_id' not in df_ai.columns:
-                df_ai['paper_id'] = df_ai.apply(
-                    lambda row: f"{row['title']}_{row.get('year', 'unknown')}",
-                    axis=1
-                )
+            df_ai = assign_paper_ids(df_ai)
 
             # Filter to validation sample
             df_ai_sample = df_ai[df_ai['paper_id'].isin(paper_ids)].copy()
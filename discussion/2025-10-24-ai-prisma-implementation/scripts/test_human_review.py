@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Human Review Resume Test (no API key required)
+
+Drives HumanReviewer with scripted keyboard input on a temporary project:
+a session that crashes, one that resumes and quits, and one that finishes.
+
+Usage:
+    python scripts/test_human_review.py
+
+Tests:
+    1. A crash mid-session keeps every decision already entered (journal on disk)
+    2. Resume starts at the first unreviewed paper; quit compacts the journal and exports the CSV
+    3. Skipped papers come back next session; one decision row per paper
+    4. Priority order serves only the papers not reviewed yet
+"""
+
+import contextlib
+import importlib
+import io
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from project_store import ProjectStore
+
+human_review = importlib.import_module('03b_human_review')
+
+
+class Crash(Exception):
+    """The reviewer's terminal dies: raised when the scripted input runs out"""
+
+
+class HumanReviewTester:
+    """Test journal-based resume of the interactive review"""
+
+    def __init__(self):
+        self.project = Path(tempfile.mkdtemp(prefix='human_review_test_'))
+        self.store = ProjectStore(self.project)
+
+    def setup(self):
+        shutil.rmtree(self.project / 'data', ignore_errors=True)
+        self.store.write('screened_papers', pd.DataFrame({
+            'paper_id': ['q0', 'q1', 'q2', 'q3', 'q4', 'a0'],
+            'title': [f"Paper {i}" for i in range(6)],
+            'year': 2024,
+            'decision': ['human-review'] * 5 + ['auto-include'],
+            'total_score': [5, 10, 15, 20, 25, 40],
+            'confidence': [30, 40, 50, 60, 70, 95],
+            'reasoning': 'Borderline.',
+        }))
+
+    def session(self, answers, order: str = 'file'):
+        """
+        Run one review session on scripted answers
+
+        Returns:
+            (paper_ids shown, in order; True if the session crashed)
+        """
+        shown = []
+        remaining = iter(answers)
+
+        def scripted_input(prompt=''):
+            try:
+                return next(remaining)
+            except StopIteration:
+                raise Crash
+
+        reviewer = human_review.HumanReviewer(str(self.project), order=order)
+        display = lambda row, idx, total: shown.append(row['paper_id'])
+        crashed = False
+        with mock.patch('builtins.input', scripted_input), mock.patch.object(reviewer, 'display_paper', display), \
+                contextlib.redirect_stdout(io.StringIO()):
+            try:
+                reviewer.review_papers()
+            except Crash:
+                crashed = True
+        return shown, crashed
+
+    def decisions(self) -> dict:
+        df = self.store.read('human_review_decisions')
+        return {} if df is None else dict(zip(df['paper_id'], df['human_decision']))
+
+    @property
+    def journal_file(self) -> Path:
+        return self.project / 'data' / '02_screening' / 'human_review_decisions.jsonl'
+
+    def test_crash(self) -> bool:
+        self.setup()
+        shown, crashed = self.session(['i', 'on topic', '3', 'e', '', '2'])
+        lines = self.journal_file.read_text().splitlines() if self.journal_file.exists() else []
+        if not crashed or shown != ['q0', 'q1', 'q2'] or len(lines) != 2:
+            print(f"❌ TEST 1 FAILED: shown {shown}, crashed={crashed}, {len(lines)} journal lines")
+            return False
+        print("✅ TEST 1 PASSED: crash on paper 3 kept both decisions in the journal")
+        return True
+
+    def test_resume(self) -> bool:
+        # Resume, skip q2, decide q3, quit on q4
+        shown, crashed = self.session(['y', 's', 'i', '', '1', 'q'])
+        decisions = self.decisions()
+        csv_file = self.store.csv_file('human_review_decisions')
+        exported = pd.read_csv(csv_file) if csv_file.exists() else pd.DataFrame()
+        if crashed or shown != ['q2', 'q3', 'q4'] \
+                or decisions != {'q0': 'include', 'q1': 'exclude', 'q3': 'include'}:
+            print(f"❌ TEST 2 FAILED: shown {shown}, decisions {decisions}")
+            return False
+        if self.journal_file.exists() or len(exported) != 3 or self.store.refresh('human_review_decisions'):
+            print(f"❌ TEST 2 FAILED: journal left={self.journal_file.exists()}, {len(exported)} CSV rows")
+            return False
+        print("✅ TEST 2 PASSED: resumed at q2, journal compacted into the store and CSV on quit")
+        return True
+
+    def test_finish(self) -> bool:
+        shown, crashed = self.session(['y', 'e', '', '3', 'i', '', '3'])
+        df = self.store.read('human_review_decisions')
+        if crashed or shown != ['q2', 'q4'] or len(df) != 5 or df['paper_id'].duplicated().any() \
+                or self.decisions()['q2'] != 'exclude':
+            print(f"❌ TEST 3 FAILED: shown {shown}, decisions {self.decisions()}")
+            return False
+        print("✅ TEST 3 PASSED: skipped q2 came back, 5 papers decided once each")
+        return True
+
+    def test_priority(self) -> bool:
+        self.setup()
+        self.session(['i', '', '3', 'i', '', '3', 'q'])  # First two papers, in file order
+        first = set(self.decisions())
+        shown, crashed = self.session(['y'] + ['e', '', '2'] * 3, order='priority')
+        if crashed or len(shown) != 3 or set(shown) & first or len(self.decisions()) != 5:
+            print(f"❌ TEST 4 FAILED: reviewed {sorted(first)}, then shown {shown}")
+            return False
+        print(f"✅ TEST 4 PASSED: after {sorted(first)}, priority order served {shown}")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("HUMAN REVIEW RESUME TEST")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_crash(),
+                self.test_resume(),
+                self.test_finish(),
+                self.test_priority(),
+            ])
+        finally:
+            shutil.rmtree(self.project, ignore_errors=True)
+
+
+def main():
+    tester = HumanReviewTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
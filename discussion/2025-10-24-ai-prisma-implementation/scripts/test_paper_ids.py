@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Paper ID Test (no API key required)
+
+Checks that canonical paper IDs are deterministic, unique and survive the
+CSV views unchanged.
+
+Usage:
+    python scripts/test_paper_ids.py
+
+Tests:
+    1. IDs are the SHA-1 prefix of the normalized DOI or title/year basis
+    2. Exact duplicates get -2, -3... suffixes; existing IDs are kept
+    3. IDs (including all-digit ones) stay identical after a CSV round-trip
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from paper_ids import assign_paper_ids, compute_paper_ids
+from project_store import ProjectStore
+
+
+def sha1_id(basis: str) -> str:
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:16]
+
+
+class PaperIdTester:
+    """Test paper ID derivation and persistence"""
+
+    def test_derivation(self) -> bool:
+        df = pd.DataFrame([
+            {'title': 'Chatbots & EFL', 'year': 2023, 'doi': 'https://doi.org/10.1000/ABC'},
+            {'title': 'Other title', 'year': 2021, 'doi': 'doi: 10.1000/abc'},
+            {'title': '  Chatbots and   EFL: a study!', 'year': 2023.0, 'doi': None},
+            {'title': 'chatbots and efl a study', 'year': '2023', 'doi': 'N/A'},
+        ])
+        ids = compute_paper_ids(df).tolist()
+        # Same DOI, and same title/year without a usable DOI: the second copy is suffixed
+        doi_id, title_id = sha1_id('doi:10.1000/abc'), sha1_id('title:chatbots and efl a study|2023')
+        expected = [doi_id, doi_id + '-2', title_id, title_id + '-2']
+        if ids != expected:
+            print(f"❌ TEST 1 FAILED: {ids} (expected {expected})")
+            return False
+        print("✅ TEST 1 PASSED: IDs are SHA-1 prefixes of the normalized DOI / title+year")
+        return True
+
+    def test_duplicates(self) -> bool:
+        df = pd.DataFrame({'title': ['Same', 'Same', 'Same', 'Different'], 'year': 2020})
+        ids = compute_paper_ids(df)
+        if ids.nunique() != 4 or not ids[1].endswith('-2') or not ids[2].endswith('-3'):
+            print(f"❌ TEST 2 FAILED: {ids.tolist()}")
+            return False
+
+        kept = assign_paper_ids(df.assign(paper_id=['a', None, 'c', 'd']))
+        if kept['paper_id'].tolist() != ['a', ids[1], 'c', 'd']:
+            print(f"❌ TEST 2 FAILED: existing IDs not kept: {kept['paper_id'].tolist()}")
+            return False
+        print("✅ TEST 2 PASSED: duplicates suffixed, existing IDs kept")
+        return True
+
+    def test_csv_round_trip(self) -> bool:
+        # A table whose IDs are all digits (e.g. a one-paper queue) is what read_csv turns into ints
+        titles = [f"Paper {i}" for i in range(5000)]
+        papers = assign_paper_ids(pd.DataFrame({'title': titles, 'year': 2020, 'abstract': ''}))
+        df = papers[papers['paper_id'].str.fullmatch(r'\d+')].reset_index(drop=True)
+        if df.empty:
+            print("❌ TEST 3 FAILED: no all-digit ID among 5000 papers")
+            return False
+
+        project = Path(tempfile.mkdtemp(prefix='paper_ids_test_'))
+        try:
+            store = ProjectStore(project)
+            store.write('papers', df)
+            # Edit the CSV view so the next read imports it back
+            csv_file = store.csv_file('papers')
+            os.utime(csv_file, (csv_file.stat().st_mtime + 10,) * 2)
+            reloaded = store.read('papers')
+            again = assign_paper_ids(reloaded.drop(columns='paper_id'))
+        finally:
+            shutil.rmtree(project, ignore_errors=True)
+
+        if reloaded['paper_id'].tolist() != df['paper_id'].tolist() \
+                or again['paper_id'].tolist() != df['paper_id'].tolist():
+            print(f"❌ TEST 3 FAILED: IDs changed through the CSV view "
+                  f"({df['paper_id'].tolist()} -> {reloaded['paper_id'].tolist()})")
+            return False
+        print(f"✅ TEST 3 PASSED: all-digit IDs {df['paper_id'].tolist()} unchanged after a CSV round-trip")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("PAPER ID TEST")
+        print("="*70)
+
+        return all([
+            self.test_derivation(),
+            self.test_duplicates(),
+            self.test_csv_round_trip(),
+        ])
+
+
+def main():
+    tester = PaperIdTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
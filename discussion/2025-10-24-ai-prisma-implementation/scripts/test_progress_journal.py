@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Progress Journal Test (no API key required)
+
+Checks ProgressJournal's crash safety and compaction in a temporary
+directory.
+
+Usage:
+    python scripts/test_progress_journal.py
+
+Tests:
+    1. Resume after a crash: snapshot + journal load, a torn last line is skipped
+    2. Records are de-duplicated by key, the latest record winning
+    3. Compaction folds the journal into the snapshot (any format) and removes it
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from progress_journal import ProgressJournal
+from project_store import write_frame
+
+
+class ProgressJournalTester:
+    """Test the append-only journal on top of a snapshot table"""
+
+    def __init__(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='progress_journal_test_'))
+
+    def journal(self, suffix: str = '.parquet') -> ProgressJournal:
+        return ProgressJournal(self.tmp / 'progress.jsonl', self.tmp / f'progress{suffix}',
+                               key='paper_id', fsync_every=2)
+
+    def reset(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+
+    def test_crash_resume(self) -> bool:
+        self.reset()
+        write_frame(pd.DataFrame({'paper_id': ['a', 'b'], 'total_score': [10, 20]}), self.tmp / 'progress.parquet')
+
+        journal = self.journal()
+        journal.append({'paper_id': 'c', 'total_score': np.int64(30)})
+        journal.append({'paper_id': 'd', 'total_score': 40})
+        # Crash mid-write: the process dies with half a record on disk
+        journal._handle.write('{"paper_id": "e", "total_')
+        journal._handle.close()
+        journal._handle = None
+
+        resumed = self.journal()
+        df = resumed.load()
+        resumed.append({'paper_id': 'e', 'total_score': 50})  # Written after the torn line
+        resumed.close()
+        after = self.journal().load()
+
+        if df['paper_id'].tolist() != ['a', 'b', 'c', 'd'] or after['paper_id'].tolist()[-1] != 'e' \
+                or after.loc[after['paper_id'] == 'c', 'total_score'].item() != 30:
+            print(f"❌ TEST 1 FAILED: resumed {df.to_dict('records')}, then {after.to_dict('records')}")
+            return False
+        print("✅ TEST 1 PASSED: snapshot + journal resumed, torn line skipped, appends continue")
+        return True
+
+    def test_latest_wins(self) -> bool:
+        self.reset()
+        write_frame(pd.DataFrame({'paper_id': ['a'], 'decision': ['error']}), self.tmp / 'progress.parquet')
+
+        journal = self.journal()
+        journal.append({'paper_id': 'b', 'decision': 'human-review'})
+        journal.append({'paper_id': 'a', 'decision': 'auto-include'})  # Retried after an error
+        journal.append({'paper_id': 'b', 'decision': 'auto-exclude'})
+        journal.close()
+
+        df = self.journal().load().set_index('paper_id')['decision'].to_dict()
+        if df != {'a': 'auto-include', 'b': 'auto-exclude'}:
+            print(f"❌ TEST 2 FAILED: {df}")
+            return False
+        print("✅ TEST 2 PASSED: one row per key, latest record wins")
+        return True
+
+    def test_compaction(self) -> bool:
+        for suffix in ('.parquet', '.csv'):
+            self.reset()
+            journal = self.journal(suffix)
+            for i in range(5):
+                journal.append({'paper_id': f'p{i}', 'total_score': i})
+            journal.append({'paper_id': 'p0', 'total_score': 99})
+            compacted = journal.compact()
+
+            reloaded = self.journal(suffix).load()
+            if journal.journal_file.exists() or len(compacted) != 5 \
+                    or reloaded['total_score'].tolist() != [1, 2, 3, 4, 99]:
+                print(f"❌ TEST 3 FAILED ({suffix}): journal left={journal.journal_file.exists()}, "
+                      f"{reloaded.to_dict('records')}")
+                return False
+        print("✅ TEST 3 PASSED: journal compacted into .parquet / .csv snapshots and removed")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("PROGRESS JOURNAL TEST")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_crash_resume(),
+                self.test_latest_wins(),
+                self.test_compaction(),
+            ])
+        finally:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+def main():
+    tester = ProgressJournalTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Project Store Test (no API key required)
+
+Checks ProjectStore's tables, CSV views and partitioned writes in a
+temporary project directory.
+
+Usage:
+    python scripts/test_project_store.py
+
+Tests:
+    1. Write, read and upsert a Parquet table; the CSV view is exported but not re-imported
+    2. A CSV view newer than its table (edited by hand, or CSV-only project) is imported
+    3. Partitioned tables: a where-filter reads only the matching partitions
+    4. A PartitionWriter left on an exception keeps the previous table
+    5. Input files are never unpickled
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from project_store import ProjectStore, partition_files, read_frame
+
+
+PAPERS = pd.DataFrame({
+    'paper_id': ['a1', 'b2', 'c3', 'd4'],
+    'title': ['Chatbots', 'Tutors', 'Proteins', 'Surgery'],
+    'decision': ['auto-include', 'human-review', 'auto-exclude', 'human-review'],
+    'total_score': [40, 20, -10, 15],
+})
+
+
+class ProjectStoreTester:
+    """Test table storage, CSV views and partitions"""
+
+    def __init__(self):
+        self.project = Path(tempfile.mkdtemp(prefix='project_store_test_'))
+
+    def store(self) -> ProjectStore:
+        shutil.rmtree(self.project, ignore_errors=True)
+        return ProjectStore(self.project)
+
+    def touch(self, path: Path, seconds: float = 10):
+        """Make a file look edited after its table was written"""
+        mtime = path.stat().st_mtime + seconds
+        os.utime(path, (mtime, mtime))
+
+    def test_write_read_upsert(self) -> bool:
+        store = self.store()
+        store.write('screened_papers', PAPERS)
+        csv_file = store.csv_file('screened_papers')
+
+        if store.table_file('screened_papers').suffix != '.parquet' or not csv_file.exists() \
+                or store.refresh('screened_papers') \
+                or not store.read('screened_papers').equals(PAPERS):
+            print(f"❌ TEST 1 FAILED: round trip or CSV view (exists={csv_file.exists()})")
+            return False
+
+        update = pd.DataFrame({'paper_id': ['b2', 'e5'], 'title': ['Tutors', 'Games'],
+                               'decision': ['auto-include', 'auto-exclude'], 'total_score': [30, -5]})
+        store.upsert('screened_papers', update)
+        df = store.read('screened_papers').set_index('paper_id')
+        if sorted(df.index) != ['a1', 'b2', 'c3', 'd4', 'e5'] or df.loc['b2', 'decision'] != 'auto-include' \
+                or store.read('screened_papers', columns=['title']).columns.tolist() != ['title'] \
+                or store.read('papers') is not None:
+            print(f"❌ TEST 1 FAILED: after upsert {df.to_dict('index')}")
+            return False
+        print("✅ TEST 1 PASSED: table written, read back, upserted by paper_id")
+        return True
+
+    def test_csv_import(self) -> bool:
+        store = self.store()
+        store.write('screened_papers', PAPERS)
+        csv_file = store.csv_file('screened_papers')
+
+        edited = PAPERS.copy()
+        edited.loc[1, 'decision'] = 'auto-exclude'
+        edited.to_csv(csv_file, index=False)
+        self.touch(csv_file, -10)  # Older than the table: ignored
+        if store.read('screened_papers').loc[1, 'decision'] != 'human-review':
+            print("❌ TEST 2 FAILED: a CSV older than its table was imported")
+            return False
+
+        self.touch(csv_file, 20)
+        df = store.read('screened_papers')
+        if df.loc[1, 'decision'] != 'auto-exclude' or store.refresh('screened_papers'):
+            print("❌ TEST 2 FAILED: edited CSV view not imported (or imported twice)")
+            return False
+
+        # A project from before the store: only the CSV files exist
+        store = self.store()
+        csv_file = store.csv_file('papers')
+        csv_file.parent.mkdir(parents=True)
+        PAPERS.to_csv(csv_file, index=False)
+        if not store.read('papers').equals(PAPERS) or not store.table_file('papers').exists():
+            print("❌ TEST 2 FAILED: CSV-only project not imported")
+            return False
+        print("✅ TEST 2 PASSED: newer CSV views imported, older ones ignored")
+        return True
+
+    def test_partitions(self) -> bool:
+        store = self.store()
+        store.write('screened_papers', PAPERS)
+        with store.partition_writer('screened_papers', 'decision') as writer:
+            for decision, group in PAPERS.groupby('decision'):
+                writer.write(decision, group)
+
+        path = store.table_file('screened_papers')
+        queue = store.read('screened_papers', where={'decision': ['human-review']})
+        none = store.read('screened_papers', columns=['paper_id'], where={'decision': ['error']})
+        everything = store.read('screened_papers')
+        if not path.is_dir() or len(list(path.iterdir())) != 3 \
+                or store.store_dir.joinpath('screened_papers.parquet').exists():
+            print(f"❌ TEST 3 FAILED: partition files {sorted(os.listdir(store.store_dir))}")
+            return False
+        read_files = [f.stem for f in partition_files(path, {'decision': ['human-review']})]
+        if read_files != ['decision=human-review'] or queue['paper_id'].tolist() != ['b2', 'd4'] \
+                or len(everything) != 4 \
+                or none.columns.tolist() != ['paper_id'] or len(none) != 0:
+            print(f"❌ TEST 3 FAILED: queue {queue['paper_id'].tolist()}, {len(everything)} rows in total")
+            return False
+
+        # A later plain write replaces the partitions
+        store.write('screened_papers', PAPERS.head(1))
+        if path.exists() or len(store.read('screened_papers')) != 1:
+            print("❌ TEST 3 FAILED: plain write left the partition directory")
+            return False
+        print("✅ TEST 3 PASSED: one file per decision, where-filter reads only the queue")
+        return True
+
+    def test_abort(self) -> bool:
+        store = self.store()
+        with store.partition_writer('screened_papers', 'decision') as writer:
+            writer.write('auto-include', PAPERS.head(1))
+
+        try:
+            with store.partition_writer('screened_papers', 'decision') as writer:
+                writer.write('human-review', PAPERS.iloc[[1, 3]])
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+
+        df = store.read('screened_papers')
+        if df['paper_id'].tolist() != ['a1'] or store.store_dir.joinpath('screened_papers.partial').exists():
+            print(f"❌ TEST 4 FAILED: {df['paper_id'].tolist()} after an interrupted rewrite")
+            return False
+        print("✅ TEST 4 PASSED: interrupted partition rewrite dropped, previous table kept")
+        return True
+
+    def test_no_unpickling(self) -> bool:
+        self.store()
+        marker = self.project / 'unpickled'
+        untrusted = self.project / 'human_validation.pkl'
+
+        class Payload:
+            def __reduce__(self):
+                return Path.touch, (marker,)
+
+        self.project.mkdir(exist_ok=True)
+        untrusted.write_bytes(pickle.dumps(Payload()))
+        try:
+            read_frame(untrusted)
+        except Exception:
+            pass  # Not a CSV either
+        if marker.exists():
+            print("❌ TEST 5 FAILED: read_frame unpickled an input file")
+            return False
+        print("✅ TEST 5 PASSED: a pickle passed as input is not deserialized")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("PROJECT STORE TEST")
+        print("="*70)
+
+        try:
+            return all([
+                self.test_write_read_upsert(),
+                self.test_csv_import(),
+                self.test_partitions(),
+                self.test_abort(),
+                self.test_no_unpickling(),
+            ])
+        finally:
+            shutil.rmtree(self.project, ignore_errors=True)
+
+
+def main():
+    tester = ProjectStoreTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Response Parser Test (no API key required)
+
+Checks that JSONExtractor and validate_result recover screening results from
+the malformed replies Claude occasionally sends.
+
+Usage:
+    python scripts/test_response_parser.py
+
+Tests:
+    1. JSON wrapped in prose or a ```json fence (with a trailing comma) is extracted
+    2. Streamed chunks: the value is returned once the object closes, braces in prose skipped
+    3. Truncated replies keep the fields that arrived; the missing ones are reported
+    4. Re-sent fields are merged into the partial result and re-validated
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from response_parser import JSONExtractor, merge_repair, parse_screening_result
+
+
+SCORES = {'domain': 8, 'intervention': 10, 'method': 3, 'outcomes': 7, 'exclusion': 0, 'title_bonus': 10}
+RESULT = {'scores': SCORES, 'total_score': 38, 'confidence': 92, 'decision': 'auto-include',
+          'reasoning': 'Chatbot {speaking} practice with EFL learners.',
+          'evidence_quotes': ['a chatbot improved "fluency" scores']}
+
+
+class ResponseParserTester:
+    """Test extraction and field-level repair of screening responses"""
+
+    def test_wrapped(self) -> bool:
+        body = json.dumps(RESULT, indent=2)
+        replies = {
+            'fenced': f"Here is my assessment:\n```json\n{body}\n```\nLet me know if you need more.",
+            'prose': f"Sure. {body} That is all.",
+            'trailing comma': body[:-1].rstrip() + ",\n}",
+        }
+        for name, text in replies.items():
+            parsed = parse_screening_result(text)
+            if not parsed.ok or not parsed.recovered or parsed.result != RESULT:
+                print(f"❌ TEST 1 FAILED ({name}): ok={parsed.ok} recovered={parsed.recovered} "
+                      f"problems={parsed.problems}")
+                return False
+
+        plain = parse_screening_result(json.dumps(RESULT))
+        if not plain.ok or plain.recovered:
+            print(f"❌ TEST 1 FAILED: clean JSON flagged as recovered={plain.recovered}")
+            return False
+        print("✅ TEST 1 PASSED: fenced / prose-wrapped / trailing-comma replies extracted")
+        return True
+
+    def test_streamed(self) -> bool:
+        text = "Scoring {as requested}: " + json.dumps(RESULT) + " done {}"
+        extractor = JSONExtractor()
+        values = [extractor.feed(text[i:i + 7]) for i in range(0, len(text), 7)]
+        first = next((i for i, v in enumerate(values) if v is not None), None)
+        closes_at = (text.index(json.dumps(RESULT)) + len(json.dumps(RESULT)) - 1) // 7
+
+        if extractor.value != RESULT or first != closes_at or not extractor.had_extra_text:
+            print(f"❌ TEST 2 FAILED: value={extractor.value}, first returned at chunk {first} "
+                  f"(object closes in chunk {closes_at})")
+            return False
+        print(f"✅ TEST 2 PASSED: value returned at chunk {first} of {len(values)}, prose braces skipped")
+        return True
+
+    def test_truncated(self) -> bool:
+        body = json.dumps({'scores': SCORES, 'total_score': 38, 'reasoning': 'Chatbot practice',
+                           'evidence_quotes': ['a chatbot improved fluency'], 'confidence': 92})
+        cuts = {
+            'mid-string': body.index('practice') + 3,
+            'dangling key': body.index('"confidence"') + len('"confidence":'),
+            'partial key': body.index('"confidence"') + 5,
+            'mid-array': body.index('improved'),
+        }
+        for name, cut in cuts.items():
+            parsed = parse_screening_result(body[:cut])
+            if parsed.result is None or not parsed.recovered or parsed.result.get('scores') != SCORES \
+                    or set(parsed.problems) != {'confidence'}:
+                print(f"❌ TEST 3 FAILED ({name}): {parsed}")
+                return False
+
+        # Cut inside the scores: only then are scores re-requested too
+        parsed = parse_screening_result(body[:body.index('"outcomes"')])
+        if set(parsed.problems) != {'scores', 'confidence'}:
+            print(f"❌ TEST 3 FAILED (inside scores): problems={parsed.problems}")
+            return False
+        print("✅ TEST 3 PASSED: truncated replies closed off, only missing fields reported")
+        return True
+
+    def test_repair(self) -> bool:
+        body = json.dumps({'scores': SCORES, 'decision': 'maybe', 'evidence_quotes': 'one quote'})
+        parsed = parse_screening_result(body[:-1])
+        if set(parsed.problems) != {'confidence'} or 'decision' in parsed.result \
+                or parsed.result['evidence_quotes'] != ['one quote'] or parsed.result['total_score'] != 38:
+            print(f"❌ TEST 4 FAILED: partial result not normalized: {parsed}")
+            return False
+
+        repaired = merge_repair(parsed, 'Here you go: {"confidence": "85", "scores": {"domain": 0}}')
+        if not repaired.ok or repaired.result['confidence'] != 85 or repaired.result['scores'] != SCORES:
+            print(f"❌ TEST 4 FAILED: {repaired}")
+            return False
+        if merge_repair(parsed, 'I cannot help with that.') is not parsed:
+            print("❌ TEST 4 FAILED: a repair reply without JSON changed the result")
+            return False
+        print("✅ TEST 4 PASSED: only the re-requested fields merged, result now valid")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("RESPONSE PARSER TEST")
+        print("="*70)
+
+        return all([
+            self.test_wrapped(),
+            self.test_streamed(),
+            self.test_truncated(),
+            self.test_repair(),
+        ])
+
+
+def main():
+    tester = ResponseParserTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
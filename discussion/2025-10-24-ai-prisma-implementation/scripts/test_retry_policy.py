@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Retry / Circuit Breaker Test (no API key required)
+
+Screens the test project through the real Anthropic SDK pointed at
+fake_anthropic_server.py, which injects 429/529 failures. Uses the test
+project created by test_ai_prisma_scoring.py.
+
+Usage:
+    python scripts/test_retry_policy.py
+
+Tests:
+    1. Backoff honours retry-after and stays within max_delay
+    2. Random 429s are retried; no paper ends up as an error row
+    3. A burst of 529s opens the circuit breaker and the pool recovers
+    4. Concurrency adapts down when the server limits requests in flight
+"""
+
+import importlib
+import shutil
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import anthropic
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+screen_papers = importlib.import_module('03_screen_papers')
+from fake_anthropic_server import FakeAnthropicServer
+from paper_ids import assign_paper_ids
+from retry_policy import CircuitBreaker, RetryPolicy
+
+
+class RetryPolicyTester:
+    """Test retries, circuit breaker and adaptive concurrency against a fake server"""
+
+    def __init__(self):
+        self.source_project = Path('/tmp/scholarag/test_projects/ai-prisma-test')
+        self.test_project = Path('/tmp/scholarag/test_projects/ai-prisma-retry-test')
+
+    def setup(self):
+        """Copy the test project so real screening output is not touched"""
+        if not self.source_project.exists():
+            print(f"❌ Test project not found: {self.source_project}")
+            print(f"   Run: python scripts/test_ai_prisma_scoring.py")
+            sys.exit(1)
+
+        if self.test_project.exists():
+            shutil.rmtree(self.test_project)
+        shutil.copytree(self.source_project, self.test_project)
+
+    def screen(self, server: FakeAnthropicServer, copies: int = 1, **kwargs) -> tuple:
+        """Run screen_all_papers against the fake server from a clean output dir"""
+        shutil.rmtree(self.test_project / 'data' / '02_screening', ignore_errors=True)
+        shutil.rmtree(self.test_project / 'data' / 'store', ignore_errors=True)
+
+        screener = screen_papers.PaperScreener(
+            str(self.test_project),
+            'How do AI chatbots improve speaking proficiency in second language learning?',
+            client=anthropic.Anthropic(api_key='test', base_url=server.url, max_retries=0),
+            async_client=anthropic.AsyncAnthropic(api_key='test', base_url=server.url, max_retries=0)
+        )
+        screener.retry_policy = RetryPolicy(max_retries=8, base_delay=0.05, max_delay=0.5)
+        screener.breaker = CircuitBreaker(failure_threshold=5, cooldown=0.5)
+
+        df = screener.load_papers()
+        if copies > 1:
+            df = pd.concat(
+                [df.assign(title=df['title'] + f' (copy {i})') for i in range(copies)],
+                ignore_index=True
+            )
+            df = assign_paper_ids(df.drop(columns='paper_id'))
+
+        df = screener.screen_all_papers(df, requests_per_minute=60000,
+                                        tokens_per_minute=100_000_000, **kwargs)
+        return screener, df
+
+    def test_backoff(self) -> bool:
+        policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+        error = SimpleNamespace(status_code=429,
+                                response=SimpleNamespace(headers={'retry-after': '3'}))
+        delays = [policy.delay(attempt, error) for attempt in range(10)]
+        if min(delays) < 3 or max(delays) > 8:
+            print(f"❌ TEST 1 FAILED: delays {delays}")
+            return False
+
+        no_header = SimpleNamespace(status_code=529, response=SimpleNamespace(headers={}))
+        if not policy.is_retryable(no_header) or policy.is_retryable(SimpleNamespace(status_code=400)):
+            print("❌ TEST 1 FAILED: wrong retryable classification")
+            return False
+
+        print(f"✅ TEST 1 PASSED: delays within [3, 8]s with retry-after: 3")
+        return True
+
+    def test_random_failures(self) -> bool:
+        server = FakeAnthropicServer(fail_rate=0.4, status=429, latency=0.01).start()
+        try:
+            screener, df = self.screen(server)
+        finally:
+            server.shutdown()
+
+        errors = (df['decision'] == 'error').sum()
+        if errors or screener.usage['retries'] == 0:
+            print(f"❌ TEST 2 FAILED: {errors} errors, {screener.usage['retries']} retries")
+            return False
+        print(f"✅ TEST 2 PASSED: {len(df)} papers, {screener.usage['retries']} retries, 0 errors "
+              f"(server: {dict(server.responses)})")
+        return True
+
+    def test_circuit_breaker(self) -> bool:
+        server = FakeAnthropicServer(burst=12, status=529, latency=0.05).start()
+        try:
+            screener, df = self.screen(server, concurrency=4)
+        finally:
+            server.shutdown()
+
+        errors = (df['decision'] == 'error').sum()
+        if errors or screener.breaker.trips == 0:
+            print(f"❌ TEST 3 FAILED: {errors} errors, circuit opened {screener.breaker.trips} times")
+            return False
+        print(f"✅ TEST 3 PASSED: circuit opened {screener.breaker.trips} times, 0 errors")
+        return True
+
+    def test_adaptive_concurrency(self) -> bool:
+        server = FakeAnthropicServer(max_concurrent=2, latency=0.2).start()
+        try:
+            screener, df = self.screen(server, copies=4, concurrency=8)
+        finally:
+            server.shutdown()
+
+        errors = (df['decision'] == 'error').sum()
+        if errors or server.responses[429] == 0:
+            print(f"❌ TEST 4 FAILED: {errors} errors, {server.responses[429]} server 429s")
+            return False
+        print(f"✅ TEST 4 PASSED: {len(df)} papers, 0 errors, "
+              f"{server.responses[429]} 429s from an 8-way start against a 2-request limit")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("RETRY / CIRCUIT BREAKER TEST (fake server)")
+        print("="*70)
+
+        self.setup()
+        return all([
+            self.test_backoff(),
+            self.test_random_failures(),
+            self.test_circuit_breaker(),
+            self.test_adaptive_concurrency(),
+        ])
+
+
+def main():
+    tester = RetryPolicyTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
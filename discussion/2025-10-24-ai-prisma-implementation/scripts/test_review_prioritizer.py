@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Review Prioritizer Test (no API key required)
+
+Simulates a reviewer who includes papers scoring 7 or more, working through
+a synthetic human review queue in ReviewPrioritizer order.
+
+Usage:
+    python scripts/test_review_prioritizer.py
+
+Tests:
+    1. Before any decision the boundary sits at the configured thresholds
+    2. record() refits the boundary: the ranking and the learned thresholds move
+    3. Disagreement with the local classifier raises a paper's priority
+    4. Iteration serves every pending paper once; remove() drops papers
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from review_prioritizer import ReviewPrioritizer
+
+
+REVIEWER_THRESHOLD = 7  # The simulated reviewer includes total_score >= 7
+
+
+def make_queue() -> pd.DataFrame:
+    """Borderline papers: same AI confidence, total_score 0..30"""
+    scores = list(range(0, 31, 2))
+    return pd.DataFrame({'paper_id': [f"p{s:02d}" for s in scores], 'confidence': 50,
+                         'total_score': scores}, index=np.arange(100, 100 + len(scores)))
+
+
+def reviewer(row: pd.Series) -> str:
+    return 'include' if row['total_score'] >= REVIEWER_THRESHOLD else 'exclude'
+
+
+class ReviewPrioritizerTester:
+    """Test ranking, refitting and iteration of the review queue"""
+
+    def test_prior(self) -> bool:
+        queue = pd.DataFrame({'paper_id': ['low', 'mid', 'high'], 'confidence': [10, 50, 90],
+                              'total_score': [0, 15, 30]})
+        prioritizer = ReviewPrioritizer(queue)
+        p = prioritizer.probability()
+        if not np.allclose(p, [0.1, 0.5, 0.9]) \
+                or prioritizer.next_paper() != 'mid' \
+                or prioritizer.thresholds() != {'confidence': 50.0, 'total_score': 15.0}:
+            print(f"❌ TEST 1 FAILED: P(include) {p.round(3)}, thresholds {prioritizer.thresholds()}")
+            return False
+        print("✅ TEST 1 PASSED: prior boundary at the thresholds' midpoints, most uncertain paper first")
+        return True
+
+    def test_record(self) -> bool:
+        prioritizer = ReviewPrioritizer(make_queue())
+        static = prioritizer.priorities().index.tolist()
+        params = prioritizer.model.params.copy()
+        prioritizer.record('not-in-queue', 'include')
+        if not np.array_equal(params, prioritizer.model.params):
+            print("❌ TEST 2 FAILED: a paper outside the queue changed the model")
+            return False
+
+        order = []
+        for _, row in prioritizer:
+            order.append(row['paper_id'])
+            prioritizer.record(row['paper_id'], reviewer(row))
+            if len(order) == 5:
+                break
+
+        learned = prioritizer.thresholds()['total_score']
+        # Unchanged ranking would serve p14, p16, p12, p18, p10
+        if order[:5] == static[:5] or not 5 <= learned <= 10:
+            print(f"❌ TEST 2 FAILED: served {order} (static {static[:5]}), learned threshold {learned}")
+            return False
+        print(f"✅ TEST 2 PASSED: served {order} instead of {static[:5]}, "
+              f"score threshold 15.0 -> {learned} (reviewer: {REVIEWER_THRESHOLD})")
+        return True
+
+    def test_disagreement(self) -> bool:
+        queue = make_queue()
+        # The local model is sure p22 is off-topic, although its AI scores look fine
+        local = lambda df: np.where(df['paper_id'] == 'p22', 0.0, 0.5)
+        plain = ReviewPrioritizer(queue).priorities()
+        weighted = ReviewPrioritizer(queue, classifier=local).priorities()
+        if weighted.index.get_loc('p22') >= plain.index.get_loc('p22') or weighted.index[0] != 'p22':
+            print(f"❌ TEST 3 FAILED: p22 ranked {weighted.index.get_loc('p22')} "
+                  f"(without classifier {plain.index.get_loc('p22')})")
+            return False
+        print(f"✅ TEST 3 PASSED: disagreement moved p22 from rank {plain.index.get_loc('p22')} to 0")
+        return True
+
+    def test_iteration(self) -> bool:
+        queue = make_queue()
+        prioritizer = ReviewPrioritizer(queue)
+        prioritizer.remove(['p30', 'p00', 'not-in-queue'])  # Reviewed in an earlier session
+
+        served = []
+        for index, row in prioritizer:
+            if queue.loc[index, 'paper_id'] != row['paper_id']:
+                print(f"❌ TEST 4 FAILED: index {index} does not match {row['paper_id']}")
+                return False
+            served.append(row['paper_id'])
+            prioritizer.record(row['paper_id'], reviewer(row))
+
+        expected = set(queue['paper_id']) - {'p30', 'p00'}
+        if len(served) != len(expected) or set(served) != expected or prioritizer.next_paper() is not None \
+                or len(prioritizer.priorities()) != 0:
+            print(f"❌ TEST 4 FAILED: served {served}")
+            return False
+        print(f"✅ TEST 4 PASSED: {len(served)} papers served once each, removed papers skipped")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("REVIEW PRIORITIZER TEST")
+        print("="*70)
+
+        return all([
+            self.test_prior(),
+            self.test_record(),
+            self.test_disagreement(),
+            self.test_iteration(),
+        ])
+
+
+def main():
+    tester = ReviewPrioritizerTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
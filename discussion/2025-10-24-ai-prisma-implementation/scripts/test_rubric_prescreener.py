@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Rubric Pre-screener Test (no API key required)
+
+Checks the local keyword scoring of RubricPrescreener and which papers it
+decides without an API call.
+
+Usage:
+    python scripts/test_rubric_prescreener.py
+
+Tests:
+    1. Dimensions, phrase keywords and the title bonus are scored like the rubric
+    2. Only -20 exclusion penalties are decided locally; soft negatives go to Claude
+    3. Local decisions are auto-exclude results in screen_paper's format
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from rubric_prescreener import RubricPrescreener
+
+
+RUBRIC = {
+    'domain_keywords': [{'keyword': 'language learning', 'weight': 10}, {'keyword': 'EFL', 'weight': 8}],
+    'intervention_keywords': [{'keyword': 'chatbot', 'weight': 10}],
+    'method_keywords': [{'keyword': 'pre-post test', 'weight': 3}],
+    'outcome_keywords': [{'keyword': 'fluency', 'weight': 7}],
+    'exclusion_keywords': [
+        {'keyword': 'animal study', 'penalty': -20},
+        {'keyword': 'K-12', 'penalty': -15},
+        {'keyword': 'medical', 'penalty': -10},
+    ],
+}
+
+PAPERS = pd.DataFrame([
+    {'title': 'Chatbots for EFL speaking', 'abstract': 'A pre-post test of chatbot practice on fluency.'},
+    {'title': 'Rat maze learning', 'abstract': 'An animal study of spatial memory.'},
+    {'title': 'A chatbot for EFL fluency', 'abstract': 'An animal study replication with a chatbot.'},
+    {'title': 'Clinical notes', 'abstract': 'We analyse medical records.'},
+    {'title': 'Tablets in class', 'abstract': 'A K-12 medical education survey.'},
+    {'title': 'Weather forecasting', 'abstract': 'Gradient boosting for rainfall.'},
+])
+
+
+class RubricPrescreenerTester:
+    """Test vectorized rubric scoring and the clear-exclusion boundary"""
+
+    def __init__(self):
+        self.prescreener = RubricPrescreener(RUBRIC)
+        self.scores = self.prescreener.score(PAPERS)
+
+    def test_scoring(self) -> bool:
+        first = self.scores.iloc[0]
+        expected = {'domain': 8, 'intervention': 10, 'method': 3, 'outcomes': 7,
+                    'exclusion': 0, 'title_bonus': 10, 'total_score': 38}
+        actual = {k: int(first[k]) for k in expected}
+        if actual != expected:
+            print(f"❌ TEST 1 FAILED: {actual} != {expected}")
+            return False
+        if self.scores.loc[4, 'exclusion'] != -15 or self.scores.loc[4, 'matched_exclusions'] != 'k-12, medical':
+            print(f"❌ TEST 1 FAILED: K-12 paper scored {self.scores.loc[4].to_dict()}")
+            return False
+        print("✅ TEST 1 PASSED: dimensions, phrases and title bonus scored")
+        return True
+
+    def test_clear_exclusions(self) -> bool:
+        excluded = self.prescreener.clear_exclusions(self.scores)
+        # -20 penalty: decided locally, whatever else matched; softer negatives: sent to Claude
+        expected = [False, True, True, False, False, False]
+        if excluded.tolist() != expected:
+            print(f"❌ TEST 2 FAILED: {excluded.tolist()} != {expected} "
+                  f"(totals {self.scores['total_score'].tolist()})")
+            return False
+        print(f"✅ TEST 2 PASSED: only -20 penalties excluded locally "
+              f"(totals {self.scores['total_score'].tolist()})")
+        return True
+
+    def test_result(self) -> bool:
+        result = self.prescreener.to_result(self.scores.loc[1])
+        if (result['decision'] != 'auto-exclude' or result['scores']['exclusion'] != -20
+                or 'animal study' not in result['reasoning']):
+            print(f"❌ TEST 3 FAILED: {result}")
+            return False
+        print("✅ TEST 3 PASSED: local decision has screen_paper's result format")
+        return True
+
+    def run(self) -> bool:
+        print("\n" + "="*70)
+        print("RUBRIC PRE-SCREENER TEST")
+        print("="*70)
+
+        return all([
+            self.test_scoring(),
+            self.test_clear_exclusions(),
+            self.test_result(),
+        ])
+
+
+def main():
+    tester = RubricPrescreenerTester()
+    success = tester.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
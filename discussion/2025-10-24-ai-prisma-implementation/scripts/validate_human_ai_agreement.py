@@ -24,6 +24,8 @@ from typing import Tuple, Dict
 from sklearn.metrics import cohen_kappa_score, confusion_matrix
 import sys
 
+from project_store import read_frame
+
 
 class KappaValidator:
     """Calculate Cohen's Kappa for AI-Human agreement"""
@@ -54,8 +56,8 @@ class KappaValidator:
             print(f"❌ Error: Human validation file not found: {self.human_file}")
             sys.exit(1)
 
-        ai_df = pd.read_csv(self.ai_file)
-        human_df = pd.read_csv(self.human_file)
+        ai_df = read_frame(self.ai_file)
+        human_df = read_frame(self.human_file)
 
         # Validate required columns
         required_ai_cols = ['paper_id', 'ai_decision']
@@ -469,6 +471,7 @@ File Format Requirements:
     - Optional: human_reasoning
 
   Both files must have matching paper_id values for comparison.
+  Project store tables (.parquet) are read as well as CSV.
         """
     )
 
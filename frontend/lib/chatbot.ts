@@ -23,6 +23,7 @@ export interface RAGContext {
     path: string
     filename: string
     chunk_index: number
+    section?: string
   }
   similarity: number
 }
@@ -62,22 +63,47 @@ Available documentation topics:
 - Quick start guide
 `
 
+// Retrieval server (chatbot/rag/retriever.py): holds the embedding model and ChromaDB in memory
+const RAG_SERVER_URL = process.env.RAG_SERVER_URL || 'http://127.0.0.1:8100'
+const RAG_TIMEOUT_MS = 2000
+// Token budget for retrieved context per chat turn (approximate tokens)
+const RAG_CONTEXT_TOKENS = 1200
+
 /**
- * Search ChromaDB for relevant documents (stub - will be replaced with actual implementation)
+ * Search ChromaDB for relevant documents via the Python retrieval server
+ *
+ * The server fuses vector and BM25 rankings, so exact identifiers (config
+ * keys, script names) rank high. It then packs the top-k chunks: neighbours
+ * from the same file are merged with their overlap removed, duplicates are
+ * dropped, and passages are cut to maxTokens by relevance.
  *
- * In production, this would call a Python API or use a Node.js ChromaDB client.
- * For now, we'll implement a simple fallback that returns empty results.
+ * If the server is not running or does not answer within RAG_TIMEOUT_MS,
+ * returns no results (chatbot falls back to general knowledge).
  */
-async function searchVectorDB(query: string, topK: number = 5): Promise<RAGContext[]> {
-  // TODO: Implement actual ChromaDB search
-  // Options:
-  // 1. Call Python API (FastAPI endpoint)
-  // 2. Use chromadb-client (Node.js package)
-  // 3. Use HTTP API directly
-
-  // For now, return empty (chatbot will work without RAG, using general knowledge)
-  console.warn('Vector DB search not implemented - using general knowledge only')
-  return []
+async function searchVectorDB(
+  query: string,
+  topK: number = 8,
+  maxTokens: number = RAG_CONTEXT_TOKENS
+): Promise<RAGContext[]> {
+  try {
+    const response = await fetch(`${RAG_SERVER_URL}/search`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ query, top_k: topK, max_tokens: maxTokens }),
+      signal: AbortSignal.timeout(RAG_TIMEOUT_MS),
+    })
+
+    if (!response.ok) {
+      console.warn(`Vector DB search failed (${response.status}) - using general knowledge only`)
+      return []
+    }
+
+    const data: { results: RAGContext[] } = await response.json()
+    return data.results
+  } catch (error) {
+    console.warn('Retrieval server unreachable - using general knowledge only:', error)
+    return []
+  }
 }
 
 /**
@@ -102,7 +128,8 @@ export async function generateChatResponse(
         if (ragResults.length > 0) {
           context = '\n\n**Retrieved Context:**\n\n'
           ragResults.forEach((result, i) => {
-            context += `[${i + 1}] From ${result.metadata.filename}:\n${result.content}\n\n`
+            const section = result.metadata.section ? ` (${result.metadata.section})` : ''
+            context += `[${i + 1}] From ${result.metadata.filename}${section}:\n${result.content}\n\n`
           })
         }
       }
@@ -168,7 +195,8 @@ export async function streamChatResponse(
         if (ragResults.length > 0) {
           context = '\n\n**Retrieved Context:**\n\n'
           ragResults.forEach((result, i) => {
-            context += `[${i + 1}] From ${result.metadata.filename}:\n${result.content}\n\n`
+            const section = result.metadata.section ? ` (${result.metadata.section})` : ''
+            context += `[${i + 1}] From ${result.metadata.filename}${section}:\n${result.content}\n\n`
           })
         }
       }